@@ -0,0 +1,214 @@
+"""
+Memory of answers the human gave to application questions, reused on later applications.
+
+Questions are keyed by their normalized text and, for dropdowns, by their set of options. A new
+question is matched against every stored one: a close enough match (AUTO_FILL_CONFIDENCE) is
+answered without asking, a plausible one (SUGGEST_CONFIDENCE) is put to the human with the stored
+answer as the default, and anything else is asked as before. Every human answer is stored.
+
+    python -m auto_job_application.answer_store list
+    python -m auto_job_application.answer_store forget 12
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from difflib import SequenceMatcher
+from typing import List, Optional, Sequence
+
+from utils.database import Database, get_database
+
+logger = logging.getLogger(__name__)
+
+ANSWERS_DB = os.path.expanduser("~/.cache/linkedin_jobs/answers.db")
+AUTO_FILL_CONFIDENCE = 0.92  # Answer without asking at or above this
+SUGGEST_CONFIDENCE = 0.75    # Ask, offering the stored answer as the default, at or above this
+OPTION_MATCH = 0.9           # How close a stored dropdown answer must be to one of the new options
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS answers (
+    id INTEGER PRIMARY KEY, question_key TEXT NOT NULL, options_key TEXT NOT NULL, question TEXT NOT NULL,
+    options TEXT, answer TEXT NOT NULL, uses INTEGER NOT NULL DEFAULT 0, created_at TEXT, last_used TEXT,
+    UNIQUE (question_key, options_key)
+);
+"""
+
+# Words that decorate a question without changing what it asks
+_FILLER = re.compile(r"\b(?:please|kindly|required|optional|select|choose|enter|provide|one|an? option)\b")
+# Words two questions may differ in and still be answered automatically; any other differing
+# word ("Python" vs "Java") means the stored answer is only offered as a suggestion
+STOPWORDS = {"a", "an", "the", "you", "your", "are", "is", "do", "does", "have", "has", "be", "will", "would", "of",
+             "in", "on", "to", "for", "with", "at", "by", "or", "and", "currently", "now", "this", "that", "any", "i"}
+
+
+def normalize(text: str) -> str:
+    text = text.lower().replace("*", " ")
+    text = _FILLER.sub(" ", text)
+    text = re.sub(r"[^\w\s+#]", " ", text)  # Keep c++ / c# intact
+    return " ".join(text.split())
+
+
+def options_key(options: Optional[Sequence[str]]) -> str:
+    """Key of a dropdown's option set, order-insensitive; empty for free-text fields."""
+    if not options:
+        return ""
+    normalized = sorted({normalize(option) for option in options if normalize(option)})
+    return hashlib.blake2b("|".join(normalized).encode("utf-8"), digest_size=8).hexdigest()
+
+
+def similarity(a: str, b: str) -> float:
+    """Blend of character-level and word-set similarity of two normalized questions, 0..1."""
+    if a == b:
+        return 1.0
+    words_a, words_b = set(a.split()), set(b.split())
+    jaccard = len(words_a & words_b) / len(words_a | words_b) if words_a | words_b else 0.0
+    return 0.5 * SequenceMatcher(None, a, b).ratio() + 0.5 * jaccard
+
+
+def content_differs(a: str, b: str) -> bool:
+    return bool((set(a.split()) ^ set(b.split())) - STOPWORDS)
+
+
+def option_similarity(answer: str, option: str) -> float:
+    """Like similarity, but an answer of two or more words contained in the option (or vice versa) counts as a match."""
+    words_a, words_b = set(answer.split()), set(option.split())
+    shorter, longer = sorted((words_a, words_b), key=len)
+    if len(shorter) >= 2 and shorter <= longer:
+        return max(similarity(answer, option), 0.95)
+    return similarity(answer, option)
+
+
+def match_option(answer: str, options: Sequence[str]) -> Optional[str]:
+    """The option a stored answer refers to, if one is close enough."""
+    target = normalize(answer)
+    scored = [(option_similarity(target, normalize(option)), option) for option in options]
+    best_score, best = max(scored, default=(0.0, None))
+    return best if best_score >= OPTION_MATCH else None
+
+
+@dataclass
+class AnswerMatch:
+    answer: str          # For dropdowns, the option text to select among the new options
+    confidence: float
+    question: str        # The stored question it came from
+    answer_id: int
+
+    @property
+    def auto_fill(self) -> bool:
+        return self.confidence >= AUTO_FILL_CONFIDENCE
+
+    @property
+    def suggest(self) -> bool:
+        return self.confidence >= SUGGEST_CONFIDENCE
+
+
+class AnswerStore:
+    """Stored human answers with fuzzy lookup; all answers are kept in memory for matching."""
+
+    def __init__(self, db_file: str = ANSWERS_DB):
+        os.makedirs(os.path.dirname(os.path.abspath(db_file)), exist_ok=True)
+        self.db: Database = get_database(db_file, on_create=lambda conn: conn.executescript(SCHEMA_SQL))
+        self._lock = threading.Lock()
+        self._rows: Optional[List[tuple]] = None
+        self.auto_filled = self.suggested = self.asked = 0  # This process
+
+    def _load(self) -> List[tuple]:
+        with self._lock:
+            if self._rows is None:
+                with self.db.reader() as conn:
+                    self._rows = conn.execute(
+                        "SELECT id, question_key, options_key, question, options, answer FROM answers;").fetchall()
+            return self._rows
+
+    def match(self, question: str, options: Optional[Sequence[str]] = None) -> Optional[AnswerMatch]:
+        """
+        The best stored answer for a question, or None. For a dropdown, answers given for a different
+        option set count only if they name one of the new options, and at a slightly lower confidence.
+        """
+        key, opts_key = normalize(question), options_key(options)
+        best: Optional[AnswerMatch] = None
+        for answer_id, stored_key, stored_opts_key, stored_question, _, answer in self._load():
+            if bool(stored_opts_key) != bool(opts_key):
+                continue  # Free-text answers do not apply to dropdowns and vice versa
+            confidence = similarity(key, stored_key)
+            if confidence >= AUTO_FILL_CONFIDENCE and content_differs(key, stored_key):
+                confidence = SUGGEST_CONFIDENCE + (confidence - SUGGEST_CONFIDENCE) / 2  # Only ever a suggestion
+            if options:
+                answer = match_option(answer, options)
+                if answer is None:
+                    continue
+                if stored_opts_key != opts_key:
+                    confidence *= 0.95
+            if best is None or confidence > best.confidence:
+                best = AnswerMatch(answer=answer, confidence=confidence, question=stored_question, answer_id=answer_id)
+        return best if best and best.suggest else None
+
+    def record(self, question: str, answer: str, options: Optional[Sequence[str]] = None):
+        """Store the human's answer, replacing an earlier answer to the same question."""
+        answer = answer.strip()
+        if not answer:
+            return
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with self.db.writer() as conn, conn:
+            conn.execute("""
+                INSERT INTO answers (question_key, options_key, question, options, answer, created_at, last_used)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(question_key, options_key) DO UPDATE SET answer = excluded.answer, last_used = excluded.last_used;
+            """, (normalize(question), options_key(options), question, json.dumps(list(options)) if options else None,
+                  answer, now, now))
+        with self._lock:
+            self._rows = None
+
+    def used(self, match: AnswerMatch):
+        with self.db.writer() as conn, conn:
+            conn.execute("UPDATE answers SET uses = uses + 1, last_used = ? WHERE id = ?;",
+                         (datetime.now().strftime("%Y-%m-%d %H:%M:%S"), match.answer_id))
+        self.auto_filled += 1
+
+    def forget(self, answer_id: int) -> bool:
+        with self.db.writer() as conn, conn:
+            deleted = conn.execute("DELETE FROM answers WHERE id = ?;", (answer_id,)).rowcount
+        with self._lock:
+            self._rows = None
+        return bool(deleted)
+
+    def answers(self) -> List[str]:
+        """Every stored answer text."""
+        return [row[5] for row in self._load()]
+
+    def all(self) -> List[tuple]:
+        with self.db.reader() as conn:
+            return conn.execute("SELECT id, question, options, answer, uses, last_used FROM answers ORDER BY uses DESC;").fetchall()
+
+    def summary(self) -> str:
+        return (f"Answer memory: {self.auto_filled} questions answered automatically, "
+                f"{self.suggested} with a suggested answer, {self.asked} asked")
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Inspect the stored answers to application questions.")
+    commands = parser.add_subparsers(dest="action")
+    commands.add_parser("list", help="show stored answers, most used first")
+    forget = commands.add_parser("forget", help="delete a stored answer so it is asked again")
+    forget.add_argument("id", type=int)
+    parser.add_argument("--db", default=ANSWERS_DB, help=f"answers database (default: {ANSWERS_DB})")
+    args = parser.parse_args()
+
+    store = AnswerStore(args.db)
+    if args.action == "list":
+        for answer_id, question, options, answer, uses, last_used in store.all():
+            choices = f" (of {len(json.loads(options))} options)" if options else ""
+            print(f"- {answer_id}: {question!r} -> {answer!r}{choices}, used {uses} times, last {last_used}")
+    elif args.action == "forget":
+        print("Forgotten." if store.forget(args.id) else f"No stored answer with id {args.id}.")
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,32 @@
+import argparse
 import asyncio
 import logging
 import os
+import time
+from collections import deque
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Literal, List
+from typing import Deque, Dict, Literal, List, Optional, Set, Union, get_args
+from urllib.parse import urlparse
 
 from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
-from PyPDF2 import PdfReader
 from pydantic import BaseModel
 import random
+import sys
 
 from browser_use import ActionResult, Agent, Controller
 from browser_use.browser import BrowserProfile, BrowserSession
 
+# Add the parent directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.browser_utils import DaemonUnavailable, free_port, launch_instead_of_daemon, wait_for_daemon
+from auto_job_application.answer_store import AnswerMatch, AnswerStore
+from auto_job_application.form_cache import FormCache, FormRecorder, normalize_value, steps_from_history_item
+from auto_job_application.human_input import NO_ANSWER, current_job, human_input
+from auto_job_application.registration_detector import detect_registration
+from auto_job_application.resume_cache import SECTIONS as RESUME_SECTIONS, load_resume
+
 # --- Configuration & Setup ---
 load_dotenv()
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -26,20 +40,36 @@ if not RESUME_PATH.exists():
     raise FileNotFoundError(f'Resume file not found at {RESUME_PATH}')
 
 # --- Pydantic Models for Output ---
+ApplicationStatus = Literal["SUBMITTED", "REQUIRES_ACCOUNT_REGISTRATION", "NEEDS_HUMAN_INTERVENTION", "FAILED"]
+
 class JobApplicationResult(BaseModel):
-    status: Literal["SUBMITTED", "REQUIRES_ACCOUNT_REGISTRATION", "NEEDS_HUMAN_INTERVENTION", "FAILED"]
+    status: ApplicationStatus
     notes: str
 
 # --- Agent Controller with Custom Actions ---
 controller = Controller()
+answer_store = AnswerStore()  # Human answers to form questions, reused in later applications
+
 
-@controller.action('Read my resume for context to fill forms')
+def known_form_values() -> Set[str]:
+    """Normalized values a cached form plan may replay: resume contact details and stored human answers."""
+    contact = load_resume(RESUME_PATH).contact
+    values = list(contact.values()) + contact.get("name", "").split() + answer_store.answers()
+    return {normalize_value(value) for value in values if value}
+
+@controller.action('Read an overview of my resume (contact info, current role, education, skills) for context to fill forms')
 def read_resume():
-    """Extract text from resume PDF for context when filling forms"""
-    pdf = PdfReader(RESUME_PATH)
-    text = ''.join(page.extract_text() or '' for page in pdf.pages)
-    logger.info(f'Read resume with {len(text)} characters')
-    return ActionResult(extracted_content=text, include_in_memory=True)
+    """Compact resume overview, kept in memory; details come from read_resume_section"""
+    overview = load_resume(RESUME_PATH).overview()
+    logger.info(f'Read resume overview with {len(overview)} characters')
+    return ActionResult(extracted_content=overview, include_in_memory=True)
+
+@controller.action(f'Read one section of my resume when a form field needs details. Sections: {", ".join(RESUME_SECTIONS)}')
+def read_resume_section(section: str):
+    """One section of the cached, pre-parsed resume; shown for the next step only, not kept in memory"""
+    text = load_resume(RESUME_PATH).section(section)
+    logger.info(f'Read resume section {section} with {len(text)} characters')
+    return ActionResult(extracted_content=f'Resume {section}:\n{text}', include_in_memory=False)
 
 @controller.action('Upload resume to file input element')
 async def upload_resume(index: int, browser_session: BrowserSession):
@@ -61,65 +91,115 @@ async def upload_resume(index: int, browser_session: BrowserSession):
         logger.error(f'Error uploading resume: {e}')
         return ActionResult(error='Failed to upload resume file.')
 
-@controller.action('Check if page requires account registration')
+@controller.action('Check if page requires account registration (sign-up or sign-in form) before applying')
 async def check_registration_required(browser_session: BrowserSession):
-    """Check if the current page is asking for account registration"""
+    """Check if the current page is asking for account registration, from its visible forms, headings and buttons"""
     try:
         page = await browser_session.get_current_page()
-        page_content = await page.content()
-          
-        # Common registration indicators
-        registration_keywords = [
-            'create account', 'sign up', 'register', 'new account',
-            'workday', 'indeed account', 'facebook jobs login',
-            'create profile', 'join now'
-        ]
-          
-        content_lower = page_content.lower()
-        for keyword in registration_keywords:
-            if keyword in content_lower:
-                return ActionResult(
-                    extracted_content=f'Registration required - detected: {keyword}',
-                    include_in_memory=True
-                )
-          
-        return ActionResult(extracted_content='No registration requirement detected')
-          
+        verdict = await detect_registration(page)
+        return ActionResult(extracted_content=verdict.describe(), include_in_memory=True)
+
     except Exception as e:
         return ActionResult(error=f'Failed to check registration requirement: {str(e)}')
 
 @controller.action('Ask human for help when unsure about form fields or next steps')
-def ask_human_for_help(question: str) -> ActionResult:
-    """Ask human for input when the agent is unsure how to proceed"""
-    print(f"\n🤖 AGENT NEEDS HELP: {question}")
-    print("=" * 50)
-    answer = input("👤 Your response: ")
+async def ask_human_for_help(question: str) -> ActionResult:
+    """Ask human for input when the agent is unsure how to proceed; other agents keep running meanwhile"""
+    answer = await human_input.ask("AGENT NEEDS HELP", question)
     return ActionResult(
         extracted_content=f'Human provided guidance: {answer}',
         include_in_memory=True
     )
 
 @controller.action('Ask human for specific form field value')
-def ask_human_for_field_value(field_name: str, field_description: str = "") -> ActionResult:
-    """Ask human to provide a specific value for a form field"""
-    prompt = f"\n🤖 NEED FORM DATA: Please provide value for '{field_name}'"
+async def ask_human_for_field_value(field_name: str, field_description: str = "") -> ActionResult:
+    """Ask human to provide a specific value for a form field, unless it was answered before"""
+    known = answer_store.match(field_name)
+    if known and known.auto_fill:
+        answer_store.used(known)
+        return ActionResult(
+            extracted_content=f'Stored answer for {field_name} (given earlier for "{known.question}", '
+                              f'confidence {known.confidence:.2f}): {known.answer}',
+            include_in_memory=True
+        )
+
+    prompt = f"Please provide value for '{field_name}'"
     if field_description:
         prompt += f"\nField description: {field_description}"
-    print(prompt)
-    print("=" * 50)
-    value = input("👤 Enter value: ")
+    if known:
+        prompt += f"\nEarlier answer to \"{known.question}\": {known.answer}  (press Enter to use it)"
+        answer_store.suggested += 1
+    else:
+        answer_store.asked += 1
+    value = (await human_input.ask("NEED FORM DATA", prompt, prompt="👤 Enter value: ")).strip()
+    if known and not value:
+        value = known.answer
+    if value and value != NO_ANSWER:
+        answer_store.record(field_name, value)
     return ActionResult(
         extracted_content=f'Human provided value for {field_name}: {value}',
         include_in_memory=True
     )
 
+async def _ask_dropdown_choice(all_options: List[dict], dropdown_info: dict,
+                               known: Optional[AnswerMatch]) -> Union[dict, str, None]:
+    """The option the human picks, None to skip, or their unmatched reply; a suggested answer is the default."""
+    # Format options for human display  
+    options_text = "\n".join([f"{i}: {opt['text']}" for i, opt in enumerate(all_options)])  
+      
+    # Ask human to select which option  
+    question = f"""  
+Found dropdown with {len(all_options)} options:  
+{options_text}  
+  
+Current selection: {dropdown_info.get('currentValue', 'None')}  
+Dropdown ID: {dropdown_info.get('id', 'N/A')}  
+Dropdown Name: {dropdown_info.get('name', 'N/A')}  
+Label: {dropdown_info.get('label') or 'N/A'}  
+  
+Which option should I select? Please provide either:  
+- The option number (0, 1, 2, etc.)  
+- The exact text of the option  
+- 'skip' to leave unchanged  
+"""  
+    if known:
+        question += f'Earlier answer to "{known.question}": {known.answer}  (press Enter to use it)\n'
+        answer_store.suggested += 1
+    else:
+        answer_store.asked += 1
+      
+    human_choice = (await human_input.ask("DROPDOWN SELECTION NEEDED", question, prompt="👤 Your choice: ")).strip()  
+      
+    if known and not human_choice:
+        human_choice = known.answer.strip()
+
+    # Process human input  
+    if human_choice.lower() == 'skip':  
+        return None
+      
+    # Try to parse as option index first  
+    selected_option = None  
+    try:  
+        option_index = int(human_choice)  
+        if 0 <= option_index < len(all_options):  
+            selected_option = all_options[option_index]  
+    except ValueError:  
+        # Not a number, try to match by text  
+        for opt in all_options:  
+            if opt['text'].strip().lower() == human_choice.lower():  
+                selected_option = opt  
+                break  
+      
+    return selected_option or human_choice
+
+
 @controller.action('Smart dropdown handler - detects dropdown and selects option with human help if needed')  
 async def handle_dropdown_smart(index: int, browser_session: BrowserSession) -> ActionResult:  
     """  
     Intelligently handle dropdown selection:  
     1. Detect if element is a dropdown  
     2. Get available options  
-    3. Try to select based on context, or ask human for help  
+    3. Answer from memory if this question was answered before, or ask human for help  
     """  
     try:  
         # First, get the element and verify it's a dropdown  
@@ -158,6 +238,8 @@ async def handle_dropdown_smart(index: int, browser_session: BrowserSession) ->
                             })),  
                             id: select.id,  
                             name: select.name,  
+                            label: (select.labels && select.labels[0] ? select.labels[0].textContent
+                                    : select.getAttribute('aria-label')) || '',  
                             currentValue: select.value  
                         };  
                     }  
@@ -170,6 +252,7 @@ async def handle_dropdown_smart(index: int, browser_session: BrowserSession) ->
                     dropdown_info = {  
                         'id': options['id'],  
                         'name': options['name'],  
+                        'label': ' '.join((options['label'] or '').split()),  
                         'currentValue': options['currentValue']  
                     }  
                     break  
@@ -181,56 +264,32 @@ async def handle_dropdown_smart(index: int, browser_session: BrowserSession) ->
         if not all_options:  
             return ActionResult(error=f'Could not retrieve options for dropdown at index {index}')  
           
-        # Format options for human display  
-        options_text = "\n".join([f"{i}: {opt['text']}" for i, opt in enumerate(all_options)])  
-          
-        # Ask human to select which option  
-        question = f"""  
-Found dropdown with {len(all_options)} options:  
-{options_text}  
-  
-Current selection: {dropdown_info.get('currentValue', 'None')}  
-Dropdown ID: {dropdown_info.get('id', 'N/A')}  
-Dropdown Name: {dropdown_info.get('name', 'N/A')}  
-  
-Which option should I select? Please provide either:  
-- The option number (0, 1, 2, etc.)  
-- The exact text of the option  
-- 'skip' to leave unchanged  
-"""  
-          
-        print(f"\n🤖 DROPDOWN SELECTION NEEDED:")  
-        print("=" * 60)  
-        print(question)  
-        print("=" * 60)  
-        human_choice = input("👤 Your choice: ").strip()  
-          
-        # Process human input  
-        if human_choice.lower() == 'skip':  
-            return ActionResult(  
-                extracted_content=f'Skipped dropdown selection at index {index} as requested',  
-                include_in_memory=True  
-            )  
-          
-        # Try to parse as option index first  
-        selected_option = None  
-        try:  
-            option_index = int(human_choice)  
-            if 0 <= option_index < len(all_options):  
-                selected_option = all_options[option_index]  
-        except ValueError:  
-            # Not a number, try to match by text  
-            for opt in all_options:  
-                if opt['text'].strip().lower() == human_choice.lower():  
-                    selected_option = opt  
-                    break  
-          
-        if not selected_option:  
-            return ActionResult(  
-                error=f'Could not find option matching "{human_choice}". Please try again.',  
-                include_in_memory=True  
-            )  
-          
+        # Answer from memory when the same question (with these options) was answered before
+        field_question = dropdown_info['label'] or dropdown_info['name'] or dropdown_info['id']
+        option_texts = [opt['text'] for opt in all_options]
+        known = answer_store.match(field_question, option_texts) if field_question else None
+        selected_option = None
+        if known and known.auto_fill:
+            selected_option = next(opt for opt in all_options if opt['text'] == known.answer)
+            answer_store.used(known)
+            logger.info(f'Answered dropdown "{field_question}" from memory: {known.answer} '
+                        f'(confidence {known.confidence:.2f})')
+
+        if selected_option is None:
+            selected_option = await _ask_dropdown_choice(all_options, dropdown_info, known)
+            if selected_option is None:
+                return ActionResult(
+                    extracted_content=f'Skipped dropdown selection at index {index} as requested',
+                    include_in_memory=True
+                )
+            if isinstance(selected_option, str):
+                return ActionResult(
+                    error=f'Could not find option matching "{selected_option}". Please try again.',
+                    include_in_memory=True
+                )
+            if field_question:
+                answer_store.record(field_question, selected_option['text'], option_texts)
+
         # Now select the option using similar logic to select_dropdown_option  
         selected_text = selected_option['text']  
           
@@ -290,20 +349,71 @@ async def check_if_dropdown(index: int, browser_session: BrowserSession) -> Acti
         return ActionResult(error=f'Failed to check element: {str(e)}')
 
 # --- Main Application Class ---
+@dataclass
+class ApplicationOutcome:
+    """What happened to one job URL"""
+    job_url: str
+    status: str = "PENDING"
+    result: str = ""
+    steps: int = 0
+    seconds: float = 0.0
+    worker: int = 0
+
+
+class LLMBudget:
+    """
+    LLM requests shared by every concurrent agent: a cap on the total (one request per agent step)
+    and on steps in flight at once, so K agents do not trip the API's rate limits together.
+    """
+
+    def __init__(self, max_requests: Optional[int] = None, max_concurrent: int = 4):
+        self.max_requests = max_requests
+        self.used = 0
+        self._in_flight = asyncio.Semaphore(max_concurrent)
+        self._holders: Set[int] = set()  # id() of agents currently inside a step
+
+    @property
+    def exhausted(self) -> bool:
+        return self.max_requests is not None and self.used >= self.max_requests
+
+    async def on_step_start(self, agent: Agent):
+        if self.exhausted:
+            logger.warning(f"LLM budget of {self.max_requests} requests used up; stopping the agent.")
+            agent.stop()
+            return
+        await self._in_flight.acquire()
+        self._holders.add(id(agent))
+        self.used += 1
+
+    async def on_step_end(self, agent: Agent):
+        self.release(agent)
+
+    def release(self, agent: Agent):
+        """Give back an agent's in-flight slot; also called after a failed run, whose step never ended."""
+        if id(agent) in self._holders:
+            self._holders.discard(id(agent))
+            self._in_flight.release()
+
+
 class JobApplicationAgent:
-    def __init__(self, job_urls: List[str], profile_name: str = "default"):
+    def __init__(self, job_urls: List[str], profile_name: str = "default", use_daemon: bool = False,
+                 concurrency: int = 1, per_domain: int = 2, llm_budget: Optional[LLMBudget] = None,
+                 use_form_cache: bool = True):
         self.job_urls = job_urls
         self.profile_name = profile_name
-        user_data_dir = os.path.expanduser(f"~/.config/browseruse/profiles/{self.profile_name}")
-        self.browser_session = BrowserSession(
-            browser_profile=BrowserProfile(
-                user_data_dir=user_data_dir,
-                window_size={'width': 1920, 'height': 1080}, 
-                headless=False,
-            ),
-            # viewport={'width': 1920, 'height': 1080},
-        )
-    
+        self.concurrency = max(1, concurrency)  # Agents applying at once, each with its own browser session and tab
+        self.per_domain = per_domain            # Applications open at once on the same (non-LinkedIn) site
+        self.llm_budget = llm_budget or LLMBudget()
+        self.outcomes: List[ApplicationOutcome] = []
+        # Replays forms solved in earlier applications, typing only profile values and stored answers
+        self.form_cache = FormCache(known_values=known_form_values) if use_form_cache else None
+        self.use_daemon = use_daemon
+        self.from_daemon = False
+        self.cdp_url: Optional[str] = None
+        self.browser_session: Optional[BrowserSession] = None  # Created in run(), once the daemon has been checked
+
+        load_resume(RESUME_PATH)  # Parse (or load the cached parse) once, before the first agent step
+        from langchain_openai import ChatOpenAI  # Heavy; only needed once an agent is built
         self.llm = ChatOpenAI(model="gpt-4o", temperature=0.0)
         
         task_prompt_path = Path(__file__).parent / 'job_application_prompt.txt'
@@ -313,66 +423,232 @@ class JobApplicationAgent:
         self.base_prompt = task_prompt_path.read_text()
         self.extended_system_prompt = extended_system_prompt_path.read_text();
 
+    async def _create_browser_session(self) -> BrowserSession:
+        """
+        A session on browser_daemon.py's warm context when it serves the profile, waiting out a
+        recycle; otherwise a browser of our own. A daemon that is alive but never gets ready is an
+        error: it holds the profile's user data dir, so launching on it would fail or corrupt it.
+        """
+        if self.use_daemon:
+            try:
+                daemon = await wait_for_daemon(self.profile_name)
+            except DaemonUnavailable as e:
+                launch_instead_of_daemon(self.profile_name, e)
+            else:
+                # Attach to the warm, logged-in context; keep_alive leaves it running on stop()
+                logger.info(f"Using the warm browser for profile {self.profile_name} at {daemon['cdp_url']}")
+                self.from_daemon = True
+                self.cdp_url = daemon["cdp_url"]
+                return BrowserSession(cdp_url=self.cdp_url, keep_alive=True)
+
+        # With several workers, the others attach to this browser over CDP: a profile can only be opened once
+        port = free_port() if self.concurrency > 1 else None
+        self.cdp_url = f"http://127.0.0.1:{port}" if port else None
+        return BrowserSession(
+            browser_profile=BrowserProfile(
+                user_data_dir=os.path.expanduser(f"~/.config/browseruse/profiles/{self.profile_name}"),
+                window_size={'width': 1920, 'height': 1080},
+                headless=False,
+                args=[f"--remote-debugging-port={port}"] if port else [],
+            ),
+            # viewport={'width': 1920, 'height': 1080},
+        )
+
     async def run(self):
-        """Starts the browser session and processes all job applications."""
+        """Starts the browser session and processes all job applications, `concurrency` at a time."""
         logger.info(f"Starting browser session with profile: {self.profile_name}")
        
-        await self.browser_session.start()
-
-        ##sometimes the very first window (the one Playwright or browser-use opens by default) 
-        # does not always respect the window_size parameter, especially on macOS or with 
-        # certain Playwright versions. This is a known quirk with Chromium/Playwright.
-        # When you later create a new tab or page (e.g., with create_new_tab(job_url)), 
-        # the new page is opened in the same browser window, which by then may have been 
-        # resized, or the new page itself is created with the correct viewport.
-        initial_page = await self.browser_session.get_current_page()
-        await initial_page.close()
-        
-        for job_url in self.job_urls:
-            await self.apply_to_job(job_url)
-            await asyncio.sleep(random.randint(10, 25)) # Longer, randomized delay
+        self.browser_session = await self._create_browser_session()
+        sessions = [self.browser_session]
+        started = time.monotonic()
+        try:
+            await self.browser_session.start()
+
+            ##sometimes the very first window (the one Playwright or browser-use opens by default) 
+            # does not always respect the window_size parameter, especially on macOS or with 
+            # certain Playwright versions. This is a known quirk with Chromium/Playwright.
+            # When you later create a new tab or page (e.g., with create_new_tab(job_url)), 
+            # the new page is opened in the same browser window, which by then may have been 
+            # resized, or the new page itself is created with the correct viewport.
+            if not self.from_daemon:  # The daemon's pages belong to it
+                initial_page = await self.browser_session.get_current_page()
+                await initial_page.close()
+
+            # One session per worker, all on the same logged-in context: each tracks its own current tab
+            for _ in range(1, min(self.concurrency, len(self.job_urls))):
+                session = BrowserSession(cdp_url=self.cdp_url, keep_alive=True)
+                sessions.append(session)
+                await session.start()
 
-        await self.browser_session.stop()
-        logger.info("All job applications processed.")
+            queue: Deque[str] = deque(self.job_urls)
+            domains: Dict[str, asyncio.Semaphore] = {}
+            await asyncio.gather(*(self._worker(worker, session, queue, domains)
+                                   for worker, session in enumerate(sessions)))
+        finally:
+            await human_input.close()
+            # Worker sessions first: the first session owns the browser (unless it is the daemon's)
+            for session in reversed(sessions):
+                try:
+                    await session.stop()
+                except Exception as e:
+                    logger.warning(f"Error stopping a browser session: {e}")
+        logger.info(f"All job applications processed in {time.monotonic() - started:.0f}s "
+                    f"({self.llm_budget.used} LLM requests).")
+        if self.form_cache:
+            logger.info(self.form_cache.summary())
+        logger.info(answer_store.summary())
+        self.report()
 
-    async def apply_to_job(self, job_url: str):
+    @staticmethod
+    def _site(job_url: str) -> str:
+        """
+        Key of the per-site limit: the URL's host. LinkedIn job pages share one unlimited key, since the
+        site an application ends up on is only known once the agent follows Apply.
+        """
+        host = urlparse(job_url).netloc.lower()
+        return "" if host == "linkedin.com" or host.endswith(".linkedin.com") else host
+
+    def _next_url(self, queue: Deque[str], domains: Dict[str, asyncio.Semaphore]) -> Optional[str]:
+        """Pop the first URL whose site is below its concurrency limit, keeping the others in order."""
+        for _ in range(len(queue)):
+            job_url = queue.popleft()
+            site = self._site(job_url)
+            limit = self.per_domain if site else self.concurrency
+            if not domains.setdefault(site, asyncio.Semaphore(limit)).locked():
+                return job_url
+            queue.append(job_url)
+        return None
+
+    async def _worker(self, worker: int, session: BrowserSession, queue: Deque[str],
+                      domains: Dict[str, asyncio.Semaphore]):
+        while queue:
+            if self.llm_budget.exhausted:
+                self.outcomes.extend(ApplicationOutcome(job_url, status="SKIPPED", result="LLM budget used up")
+                                     for job_url in queue)
+                queue.clear()
+                return
+            job_url = self._next_url(queue, domains)
+            if not job_url:
+                await asyncio.sleep(1)  # Every remaining URL is on a site already at its limit
+                continue
+            async with domains[self._site(job_url)]:
+                await self.apply_to_job(job_url, session, worker)
+            if queue:
+                await asyncio.sleep(random.randint(10, 25)) # Longer, randomized delay
+
+    async def apply_to_job(self, job_url: str, browser_session: Optional[BrowserSession] = None, worker: int = 0):
         """Applies to a single job URL using a new agent instance."""
         logger.info(f"--- Starting application for: {job_url} ---")
+        browser_session = browser_session or self.browser_session
+        current_job.set(job_url)  # Labels this worker's questions in the human input queue
+        outcome = ApplicationOutcome(job_url, worker=worker)
+        self.outcomes.append(outcome)
+        started = time.monotonic()
 
         task = f"Apply for the job, following the provided instructions.\n\n{self.base_prompt}"
-        
-        job_page = await self.browser_session.create_new_tab(job_url)
-
-        agent = Agent(
-            task=task,
-            llm=self.llm,
-            controller=controller,
-            browser_session=self.browser_session,
-            use_vision=True,
-            max_failures=3,
-            page = job_page,
-            # max_actions_per_step=2
-            max_actions_per_step=1,  # Reduce to 1 for more careful step-by-step execution  
-            extend_system_message=self.extended_system_prompt
-        )
+        job_page = agent = None
+        recorder = FormRecorder()
+
+        async def on_step_start(running: Agent):
+            if self.form_cache:
+                # Known form pages are filled here, without an LLM call; the agent picks up at the first new one
+                page = await browser_session.get_current_page()
+                done = await self.form_cache.replay_known_forms(page, recorder, self.base_prompt,
+                                                                str(RESUME_PATH.absolute()))
+                if done:
+                    running.state.last_result = [ActionResult(
+                        extracted_content='Already done from the form cache, do not repeat: ' + '; '.join(done),
+                        include_in_memory=True)]
+            await self.llm_budget.on_step_start(running)
+
+        async def on_step_end(running: Agent):
+            if self.form_cache and running.state.history.history:
+                recorder.record(steps_from_history_item(running.state.history.history[-1], known_form_values()))
+            await self.llm_budget.on_step_end(running)
         
         try:
-            history = await agent.run(max_steps=50)  ## max run of the agent
+            job_page = await browser_session.create_new_tab(job_url)
+
+            agent = Agent(
+                task=task,
+                llm=self.llm,
+                controller=controller,
+                browser_session=browser_session,
+                use_vision=True,
+                max_failures=3,
+                page = job_page,
+                # max_actions_per_step=2
+                max_actions_per_step=1,  # Reduce to 1 for more careful step-by-step execution  
+                extend_system_message=self.extended_system_prompt
+            )
+
+            history = await agent.run(max_steps=50, on_step_start=on_step_start, on_step_end=on_step_end)  ## max run of the agent
             final_result = history.final_result() or "No final result specified by agent."
+            outcome.steps = len(history.history)
+            outcome.result = final_result
+            reported = [status for status in get_args(ApplicationStatus) if status in final_result]
+            outcome.status = (min(reported, key=final_result.index) if reported
+                              else "BUDGET_EXHAUSTED" if self.llm_budget.exhausted else "UNKNOWN")
+            if self.form_cache and outcome.status == "SUBMITTED":
+                self.form_cache.save_recording(recorder)  # Only forms that led to a submission are worth replaying
             logger.info(f"Application for {job_url} completed with result: {final_result}")
         except Exception as e:
+            outcome.status, outcome.result = "FAILED", str(e)
             logger.error(f"An error occurred while applying to {job_url}: {e}")
+        finally:
+            if agent:
+                self.llm_budget.release(agent)
+            outcome.seconds = time.monotonic() - started
+            if job_page and (self.from_daemon or self.concurrency > 1):
+                await job_page.close()  # Open tabs pile up across workers and keep the daemon from recycling
+
+    def report(self):
+        """Print one line per job: status, agent steps and time taken."""
+        from tabulate import tabulate
+        rows = [(o.job_url, o.status, o.steps, f"{o.seconds:.0f}", o.worker, o.result[:60]) for o in self.outcomes]
+        print(tabulate(rows, headers=["job_url", "status", "steps", "seconds", "worker", "result"], tablefmt="fancy_grid"))
 
 # --- Entry Point ---
 async def main():
-    job_urls_to_apply = [
+    parser = argparse.ArgumentParser(description="Apply to LinkedIn jobs with a browser-use agent.")
+    parser.add_argument("job_urls", nargs="*", help="job URLs to apply to")
+    parser.add_argument("--profile", default="yahoo_email_account", help="browser-use profile name")
+    parser.add_argument("--concurrency", type=int, default=1, help="applications running at once, one tab each")
+    parser.add_argument("--per-domain", type=int, default=2, help="applications running at once on the same site (LinkedIn job URLs are not limited)")
+    parser.add_argument("--max-llm-requests", type=int, help="LLM requests (agent steps) for the whole batch")
+    parser.add_argument("--max-llm-concurrency", type=int, default=4, help="agent steps waiting on the LLM at once")
+    parser.add_argument("--human-timeout", type=float, help="seconds an agent waits for a human answer")
+    parser.add_argument("--daemon", action="store_true", help="use browser_daemon.py's warm browser for the profile")
+    parser.add_argument("--no-form-cache", action="store_true", help="always ask the LLM, even on known forms")
+    parser.add_argument("--from-queue", type=int, metavar="N",
+                        help="apply to the N best-scoring jobs not applied to yet (see `query_client.py score`)")
+    parser.add_argument("--db", help="jobs database for --from-queue (default: $LINKEDIN_JOBS_DB or linkedin_jobs.db)")
+    args = parser.parse_args()
+
+    jobs_db = None
+    if args.from_queue:
+        from utils import db_utils, ranking
+        jobs_db = db_utils.get_database(args.db)
+        args.job_urls += [row[1] for row in ranking.application_queue(jobs_db, limit=args.from_queue)]
+        logger.info(f"Applying to {len(args.job_urls)} jobs, best-scoring first.")
+
+    job_urls_to_apply = args.job_urls or [
         "https://www.linkedin.com/jobs/view/4254612043/", 
         # "https://www.linkedin.com/jobs/view/ANOTHER_JOB_ID_HERE/",  # Replace with actual job URLs
     ]
+    human_input.timeout = args.human_timeout
     
-    application_agent = JobApplicationAgent(job_urls=job_urls_to_apply, profile_name="yahoo_email_account")
+    application_agent = JobApplicationAgent(
+        job_urls=job_urls_to_apply, profile_name=args.profile, use_daemon=args.daemon,
+        concurrency=args.concurrency, per_domain=args.per_domain,
+        llm_budget=LLMBudget(args.max_llm_requests, args.max_llm_concurrency), use_form_cache=not args.no_form_cache,
+    )
     await application_agent.run()
+    if jobs_db:
+        # Attempted jobs leave the queue; failed and skipped ones stay for the next run
+        ranking.record_applications(jobs_db, [(o.job_url, o.status) for o in application_agent.outcomes
+                                              if o.status not in ("PENDING", "SKIPPED", "FAILED")])
 
 
 if __name__ == '__main__':
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(main())
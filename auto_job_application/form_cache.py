@@ -0,0 +1,407 @@
+"""
+Cache of resolved form-filling steps, so application forms the agent has completed before are
+replayed directly with Playwright instead of asking the LLM again.
+
+A form page is identified by its ATS (Greenhouse, Lever, Workday, LinkedIn Easy Apply, ...), the
+normalized structure of its visible fields (labels, types, names) and the task prompt. The actions
+the agent took on such a page (typing, selecting, clicking, uploading) are recorded with the element
+they hit, and saved once the application is submitted. When a later application lands on a page
+with the same signature, the steps are replayed; a step that fails invalidates the plan and the page
+goes back to the LLM. Only values from the resume profile or the answer store are replayed; any
+other typed or selected value (cover notes, "why this company") and every submit-like click stop
+the replay there, leaving the rest of the page to the agent.
+
+    python -m auto_job_application.form_cache stats
+    python -m auto_job_application.form_cache clear
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import TYPE_CHECKING, AbstractSet, Any, Callable, Dict, List, Optional, Set
+from urllib.parse import urlparse
+
+from utils.database import Database, get_database
+
+if TYPE_CHECKING:
+    from playwright.async_api import Locator, Page
+
+logger = logging.getLogger(__name__)
+
+CACHE_DB = os.path.expanduser("~/.cache/linkedin_jobs/form_cache.db")
+MAX_REPLAYED_PAGES = 10  # Per agent step; guards against a replayed click that leads back to the same form
+MAX_REPLAY_TEXT = 200    # Longer typed values are job-specific prose, left to the LLM
+
+# Host suffix -> ATS name; forms on any employer's Workday tenant share one layout, and so on
+ATS_HOSTS = {
+    "greenhouse.io": "greenhouse", "lever.co": "lever", "myworkdayjobs.com": "workday", "workday.com": "workday",
+    "linkedin.com": "linkedin", "ashbyhq.com": "ashby", "smartrecruiters.com": "smartrecruiters",
+    "icims.com": "icims", "jobvite.com": "jobvite", "bamboohr.com": "bamboohr", "workable.com": "workable",
+    "taleo.net": "taleo", "successfactors.com": "successfactors",
+}
+
+# Browser-use actions that are replayed; anything else the agent did on a page (scrolling,
+# reading the resume, asking the human) only mattered for deciding what to type or click
+REPLAYABLE_ACTIONS = ("input_text", "select_dropdown_option", "click_element_by_index", "upload_resume")
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS form_plans (
+    signature TEXT PRIMARY KEY, ats TEXT NOT NULL, task_key TEXT NOT NULL, fields TEXT NOT NULL,
+    steps TEXT NOT NULL, hits INTEGER NOT NULL DEFAULT 0, created_at TEXT, last_used TEXT
+);
+CREATE TABLE IF NOT EXISTS form_cache_stats (name TEXT PRIMARY KEY, value INTEGER NOT NULL DEFAULT 0);
+"""
+
+# Visible form controls of the active form, in DOM order, in one round-trip. Easy Apply and many
+# ATSs show the form in a dialog over the job page: the topmost open dialog wins.
+FORM_FIELDS_SCRIPT = """
+() => {
+    const norm = (s) => (s || '').replace(/\\s+/g, ' ').trim().toLowerCase().replace(/\\d+/g, '#').slice(0, 80);
+    const visible = (el) => !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+    const dialogs = Array.from(document.querySelectorAll("[role='dialog'], dialog[open]")).filter(visible);
+    const root = dialogs.length ? dialogs[dialogs.length - 1] : document;
+    const labelOf = (el) => {
+        if (el.id) {
+            const label = root.querySelector(`label[for="${CSS.escape(el.id)}"]`);
+            if (label) return label.textContent;
+        }
+        const wrapping = el.closest('label, fieldset');
+        return el.getAttribute('aria-label') || (wrapping && (wrapping.querySelector('legend') || wrapping).textContent)
+            || el.getAttribute('placeholder') || '';
+    };
+    return Array.from(root.querySelectorAll('input, select, textarea'))
+        .filter(el => el.type !== 'hidden' && (visible(el) || el.type === 'file'))
+        .slice(0, 200)
+        .map(el => [el.tagName.toLowerCase(), (el.type || '').toLowerCase(), norm(el.name), norm(labelOf(el)),
+                    el.required ? 1 : 0]);
+}
+"""
+
+# Attributes used to find an element again on replay, most stable first
+LOCATOR_ATTRIBUTES = ("id", "name", "aria-label", "data-automation-id", "data-qa", "placeholder")
+# Attributes that describe what a button does; recorded so submit-like clicks can be left out of plans
+LABEL_ATTRIBUTES = ("aria-label", "value", "title", "id", "name", "data-automation-id", "data-qa")
+
+# Clicks that send the application (or its final review step); never replayed, the agent does them
+SUBMIT_LIKE = re.compile(r"submit|send|apply|finish|complete|confirm|review", re.I)
+
+
+def ats_key(url: str) -> str:
+    host = (urlparse(url).hostname or "").lower()
+    for suffix, ats in ATS_HOSTS.items():
+        if host == suffix or host.endswith("." + suffix):
+            return ats
+    return host[4:] if host.startswith("www.") else host
+
+
+def task_key(task: str) -> str:
+    return hashlib.blake2b(task.encode("utf-8"), digest_size=8).hexdigest()
+
+
+@dataclass
+class FormSignature:
+    ats: str
+    fields: List[list]
+    task_key: str
+
+    @property
+    def key(self) -> str:
+        payload = json.dumps([self.ats, self.fields, self.task_key], separators=(",", ":"))
+        return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+async def form_signature(page: "Page", task: str) -> Optional[FormSignature]:
+    """The signature of the form on the page, or None when the page has no form fields to cache."""
+    try:
+        fields = await page.evaluate(FORM_FIELDS_SCRIPT)
+    except Exception as e:  # Navigating, or a closed page
+        logger.debug(f"Could not read form fields: {e}")
+        return None
+    if not fields:
+        return None
+    return FormSignature(ats=ats_key(page.url), fields=fields, task_key=task_key(task))
+
+
+def normalize_value(value: str) -> str:
+    return " ".join(str(value).split()).lower()
+
+
+def _element_record(element: Any) -> Dict[str, Any]:
+    """The parts of browser-use's DOMHistoryElement needed to find the element again."""
+    attributes = getattr(element, "attributes", None) or {}
+    return {
+        "tag": getattr(element, "tag_name", ""),
+        "xpath": getattr(element, "xpath", ""),
+        "attributes": {name: attributes[name] for name in LOCATOR_ATTRIBUTES if attributes.get(name)},
+        "type": (attributes.get("type") or "").lower(),
+        "label": " ".join(attributes[name] for name in LABEL_ATTRIBUTES if attributes.get(name)),
+    }
+
+
+def is_submit_like(element: Dict[str, Any], text: str = "") -> bool:
+    """Whether clicking the element may send the application, judged by its type, attributes or text."""
+    if element.get("type") == "submit" and not text and not element.get("label"):
+        return True  # A bare submit button: nothing says it only moves to the next step
+    return bool(SUBMIT_LIKE.search(f"{element.get('label', '')} {text}"))
+
+
+def steps_from_history_item(item: Any, known_values: AbstractSet[str] = frozenset()) -> List[Dict[str, Any]]:
+    """
+    Replayable steps from one browser-use AgentHistory item: its successful form actions, each
+    with the element it was performed on. Values not in known_values (normalized resume profile
+    and answer store values), long or textarea answers, and submit-like clicks are recorded as
+    `llm` steps, where a replay stops.
+    """
+    if not item.model_output:
+        return []
+    steps = []
+    actions = item.model_output.action
+    elements = item.state.interacted_element or [None] * len(actions)
+    for action, element, result in zip(actions, elements, item.result):
+        if getattr(result, "error", None) or element is None:
+            continue
+        for name, params in action.model_dump(exclude_unset=True).items():
+            if name not in REPLAYABLE_ACTIONS or params is None:
+                continue
+            params = {key: value for key, value in params.items() if key != "index"}  # Indexes change per page load
+            record = _element_record(element)
+            if name in ("input_text", "select_dropdown_option"):
+                text = params.get("text", "")
+                if (record["tag"] == "textarea" or len(text) > MAX_REPLAY_TEXT
+                        or normalize_value(text) not in known_values):
+                    name, params = "llm", {}
+            elif name == "click_element_by_index" and is_submit_like(record):
+                name, params = "llm", {}
+            steps.append({"action": name, "params": params, "element": record})
+    return steps
+
+
+class ReplayError(Exception):
+    pass
+
+
+@dataclass
+class FormRecorder:
+    """Steps taken on each form page during one application, saved only if it ends up submitted."""
+    pages: Dict[str, tuple] = field(default_factory=dict)  # signature key -> (FormSignature, steps)
+    current: Optional[FormSignature] = None                # Form on the page when the running step started
+    replayed: List[str] = field(default_factory=list)      # Signature keys replayed from the cache
+
+    def record(self, steps: List[Dict[str, Any]]):
+        if self.current is None or not steps:
+            return
+        _, recorded = self.pages.setdefault(self.current.key, (self.current, []))
+        recorded.extend(steps)
+
+
+class FormCache:
+    """Persistent form plans with hit, miss and failure counts."""
+
+    def __init__(self, db_file: str = CACHE_DB, known_values: Optional[Callable[[], AbstractSet[str]]] = None):
+        os.makedirs(os.path.dirname(os.path.abspath(db_file)), exist_ok=True)
+        self.db: Database = get_database(db_file, on_create=lambda conn: conn.executescript(SCHEMA_SQL))
+        # Normalized values that may be replayed: checked again on replay, as stored answers can be forgotten
+        self.known_values = known_values or frozenset
+        self.hits = self.misses = self.failures = self.saved = 0  # This process
+        self._missed: Set[str] = set()  # Signatures already counted as a miss, so each form is counted once
+
+    def lookup(self, signature: FormSignature) -> Optional[List[Dict[str, Any]]]:
+        with self.db.reader() as conn:
+            row = conn.execute("SELECT steps FROM form_plans WHERE signature = ?;", (signature.key,)).fetchone()
+        if row is None:
+            # The agent looks up the same unsolved form on every step it spends on it; count it once
+            if signature.key not in self._missed:
+                self._missed.add(signature.key)
+                with self.db.writer() as conn, conn:
+                    self._count(conn, "misses")
+                self.misses += 1
+            return None
+        return json.loads(row[0])
+
+    def save(self, signature: FormSignature, steps: List[Dict[str, Any]]):
+        """Store (or replace) the plan for a form; plans without a replayable step are not worth keeping."""
+        if not any(step["action"] != "llm" for step in steps):
+            return
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with self.db.writer() as conn, conn:
+            conn.execute("""
+                INSERT INTO form_plans (signature, ats, task_key, fields, steps, created_at, last_used)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(signature) DO UPDATE SET steps = excluded.steps, last_used = excluded.last_used;
+            """, (signature.key, signature.ats, signature.task_key, json.dumps(signature.fields), json.dumps(steps), now, now))
+        self.saved += 1
+
+    def save_recording(self, recorder: FormRecorder):
+        """Keep the forms the agent filled itself; replayed forms are already cached."""
+        pages = list(recorder.pages.items())
+        if pages:
+            # The last click of a submitted application is what submitted it, whatever its label says
+            _, (_, last_steps) = pages[-1]
+            if last_steps and last_steps[-1]["action"] == "click_element_by_index":
+                last_steps[-1] = {**last_steps[-1], "action": "llm", "params": {}}
+        for key, (signature, steps) in pages:
+            if key not in recorder.replayed:
+                self.save(signature, steps)
+
+    def invalidate(self, signature: FormSignature, reason: str):
+        logger.warning(f"Dropping cached {signature.ats} form plan {signature.key[:8]}: {reason}")
+        with self.db.writer() as conn, conn:
+            conn.execute("DELETE FROM form_plans WHERE signature = ?;", (signature.key,))
+            self._count(conn, "failures")
+        self.failures += 1
+
+    def _hit(self, signature: FormSignature):
+        with self.db.writer() as conn, conn:
+            conn.execute("UPDATE form_plans SET hits = hits + 1, last_used = ? WHERE signature = ?;",
+                         (datetime.now().strftime("%Y-%m-%d %H:%M:%S"), signature.key))
+            self._count(conn, "hits")
+        self.hits += 1
+
+    @staticmethod
+    def _count(conn: sqlite3.Connection, name: str):
+        conn.execute("INSERT INTO form_cache_stats (name, value) VALUES (?, 1) "
+                     "ON CONFLICT(name) DO UPDATE SET value = value + 1;", (name,))
+
+    async def replay(self, page: "Page", signature: FormSignature, steps: List[Dict[str, Any]],
+                     upload_file: Optional[str] = None) -> List[str]:
+        """
+        Perform a cached plan on the page and return a description of each step done. Stops at the
+        first free-text step, leaving the rest of the page to the agent. Counts a hit only when a
+        step was done. A failing step invalidates the plan and raises ReplayError.
+        """
+        done = []
+        known_values = self.known_values()
+        try:
+            for step in steps:
+                if step["action"] == "llm":
+                    break
+                if "text" in step["params"] and normalize_value(step["params"]["text"]) not in known_values:
+                    break  # No longer a profile or stored answer; the agent fills it
+                result = await self._replay_step(page, step, upload_file)
+                if result is None:
+                    break  # A submit-like button; the agent checks the form and clicks it
+                done.append(result)
+        except Exception as e:
+            self.invalidate(signature, f"step {len(done) + 1} failed ({e})")
+            raise ReplayError(str(e)) from e
+        if done:
+            self._hit(signature)
+        return done
+
+    async def _replay_step(self, page: "Page", step: Dict[str, Any], upload_file: Optional[str]) -> Optional[str]:
+        """Perform one step; None, without acting, for a click that may submit the application."""
+        locator = await self._locate(page, step["element"])
+        action, params = step["action"], step["params"]
+        if action == "input_text":
+            await locator.fill(params["text"])
+        elif action == "select_dropdown_option":
+            await locator.select_option(label=params["text"])
+        elif action == "upload_resume":
+            if not upload_file:
+                raise ReplayError("no file to upload")
+            await locator.set_input_files(upload_file)
+        elif action == "click_element_by_index":
+            text = await locator.evaluate("(el) => (el.innerText || el.value || '').trim().slice(0, 80)")
+            if is_submit_like(step["element"], text):
+                return None
+            await locator.click()
+            try:
+                await page.wait_for_load_state("domcontentloaded", timeout=10000)
+            except Exception:
+                pass  # Client-side form steps do not navigate
+            await asyncio.sleep(0.5)  # Let the next form step render
+        else:
+            raise ReplayError(f"unknown action {action}")
+        target = step["element"]["attributes"].get("aria-label") or step["element"]["attributes"].get("name") or step["element"]["tag"]
+        return f"{action} on {target}" + (f": {params['text']}" if "text" in params else "")
+
+    @staticmethod
+    async def _locate(page: "Page", element: Dict[str, Any]) -> "Locator":
+        """The element by its most stable attribute that matches exactly one element, else by XPath."""
+        tag = element.get("tag") or "*"
+        for name, value in element["attributes"].items():
+            escaped = value.replace("\\", "\\\\").replace('"', '\\"')
+            locator = page.locator(f'{tag}[{name}="{escaped}"]')
+            if await locator.count() == 1:
+                return locator
+        if element.get("xpath"):
+            locator = page.locator(f"xpath=//{element['xpath'].lstrip('/')}")
+            if await locator.count() == 1:
+                return locator
+        raise ReplayError(f"element not found: {element['attributes'] or element.get('xpath')}")
+
+    async def replay_known_forms(self, page: "Page", recorder: FormRecorder, task: str,
+                                 upload_file: Optional[str] = None) -> List[str]:
+        """
+        Replay every consecutive cached form page, starting with the current one, so the agent's
+        next LLM call only sees a page it has not solved before. Returns what was done.
+        """
+        done: List[str] = []
+        for _ in range(MAX_REPLAYED_PAGES):
+            signature = await form_signature(page, task)
+            recorder.current = signature
+            if signature is None or signature.key in recorder.replayed:
+                break
+            steps = self.lookup(signature)
+            if steps is None:
+                break
+            try:
+                replayed = await self.replay(page, signature, steps, upload_file)
+            except ReplayError:
+                break
+            if not replayed:
+                break  # Nothing applied: the agent fills the page, and its steps are recorded as usual
+            done.extend(replayed)
+            recorder.replayed.append(signature.key)
+            if any(step["action"] == "llm" for step in steps):
+                recorder.current = await form_signature(page, task)
+                break  # The page still needs a free-text answer from the agent
+        return done
+
+    def stats(self) -> Dict[str, Any]:
+        with self.db.reader() as conn:
+            totals = dict(conn.execute("SELECT name, value FROM form_cache_stats;").fetchall())
+            plans = conn.execute("SELECT ats, COUNT(*), SUM(hits) FROM form_plans GROUP BY ats ORDER BY 2 DESC;").fetchall()
+        lookups = totals.get("hits", 0) + totals.get("misses", 0)
+        return {
+            "hits": totals.get("hits", 0), "misses": totals.get("misses", 0), "failures": totals.get("failures", 0),
+            "hit_rate": totals.get("hits", 0) / lookups if lookups else 0.0,
+            "plans": {ats: {"plans": count, "hits": hits or 0} for ats, count, hits in plans},
+        }
+
+    def summary(self) -> str:
+        return (f"Form cache: {self.hits} pages replayed, {self.misses} misses, {self.failures} invalidated, "
+                f"{self.saved} plans saved")
+
+    def clear(self) -> int:
+        with self.db.writer() as conn, conn:
+            deleted = conn.execute("DELETE FROM form_plans;").rowcount
+            conn.execute("DELETE FROM form_cache_stats;")
+        return deleted
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Inspect or clear the application form cache.")
+    parser.add_argument("action", choices=["stats", "clear"])
+    parser.add_argument("--db", default=CACHE_DB, help=f"cache database (default: {CACHE_DB})")
+    args = parser.parse_args()
+
+    cache = FormCache(args.db)
+    if args.action == "clear":
+        print(f"Deleted {cache.clear()} cached form plans.")
+        return
+    stats = cache.stats()
+    print(f"{stats['hits']} hits, {stats['misses']} misses ({stats['hit_rate']:.0%} hit rate), "
+          f"{stats['failures']} plans invalidated by failed replays")
+    for ats, counts in stats["plans"].items():
+        print(f"- {ats}: {counts['plans']} plans, {counts['hits']} replays")
+
+
+if __name__ == "__main__":
+    main()
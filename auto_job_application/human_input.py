@@ -0,0 +1,114 @@
+"""
+Console questions from agents to the human, answered one at a time without blocking the event loop.
+
+With several applications running concurrently, a plain `input()` inside an action would freeze
+every other agent until the human answers. Actions instead `await human_input.ask(...)`: the
+question is queued, shown with the job it belongs to, and read on a worker thread while the
+other agents keep working.
+"""
+import asyncio
+import contextvars
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# The job the current task is applying to; set by each application worker, read when asking
+current_job: contextvars.ContextVar[str] = contextvars.ContextVar("current_job", default="")
+
+NO_ANSWER = "No answer from the human in time. Use your best judgement, or report NEEDS_HUMAN_INTERVENTION."
+
+
+@dataclass
+class Question:
+    title: str
+    text: str
+    job: str
+    prompt: str
+    answer: "asyncio.Future[str]" = field(repr=False, default=None)
+
+
+class HumanInputQueue:
+    """Serializes questions to the console; each asker waits only for its own answer."""
+
+    def __init__(self, timeout: Optional[float] = None):
+        self.timeout = timeout  # Seconds an agent waits for its answer before carrying on without one
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self.asked = 0
+        self.waiting = 0
+
+    def _ensure_started(self):
+        # Created lazily so the queue binds to the running event loop
+        if self._task is None or self._task.done():
+            self._queue = asyncio.Queue()
+            self._task = asyncio.create_task(self._serve())
+
+    async def ask(self, title: str, text: str, prompt: str = "👤 Your response: ") -> str:
+        """Queue a question and wait for the human's answer (or NO_ANSWER after `timeout` seconds)."""
+        self._ensure_started()
+        question = Question(title=title, text=text, job=current_job.get(), prompt=prompt,
+                            answer=asyncio.get_running_loop().create_future())
+        self.asked += 1
+        self.waiting += 1
+        await self._queue.put(question)
+        try:
+            return await asyncio.wait_for(asyncio.shield(question.answer), self.timeout)
+        except asyncio.TimeoutError:
+            if not question.answer.done():
+                question.answer.set_result(NO_ANSWER)  # So _serve drops it instead of prompting for it
+            logger.warning(f"No human answer within {self.timeout:g}s for {question.job or 'an agent'}: {title}")
+            return NO_ANSWER
+        finally:
+            self.waiting -= 1
+
+    @staticmethod
+    def _read_line(prompt: str) -> "asyncio.Future[str]":
+        """input() on a daemon thread, so a prompt nobody answers never holds up interpreter exit."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def read():
+            try:
+                line = input(prompt)
+            except EOFError:
+                line = ""
+            loop.call_soon_threadsafe(lambda: future.done() or future.set_result(line))
+
+        threading.Thread(target=read, name="human-input", daemon=True).start()
+        return future
+
+    async def _serve(self):
+        line = None  # A read in progress; input() cannot be interrupted, so it outlives a question that timed out
+        while True:
+            question = await self._queue.get()
+            if question.answer.done():  # The asker gave up waiting
+                continue
+            others = self._queue.qsize()
+            print(f"\n🤖 {question.title}" + (f"  [{question.job}]" if question.job else ""))
+            print(question.text)
+            print("=" * 50 + (f"  ({others} more question{'s' if others != 1 else ''} queued)" if others else ""))
+            if line is None:
+                line = self._read_line(question.prompt)
+            else:  # The next line typed goes to the read already waiting, so it answers this question
+                print(question.prompt, end="", flush=True)
+            await asyncio.wait({line, question.answer}, return_when=asyncio.FIRST_COMPLETED)
+            if question.answer.done():  # Timed out while shown: move on, keeping any pending read
+                late = line.done()
+                if late:
+                    line = None  # Typed too late; the agent already carried on without it
+                print(f"\n⏱️  That question timed out and the agent carried on without an answer"
+                      f"{'; yours was discarded' if late else ''}.")
+                continue
+            answer, line = line.result(), None
+            question.answer.set_result(answer)
+
+    async def close(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+
+human_input = HumanInputQueue()
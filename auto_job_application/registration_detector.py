@@ -0,0 +1,156 @@
+"""
+Detects account walls (registration or sign-in forms) on application pages.
+
+One in-page evaluate collects only what a visitor sees that matters here: the visible headings,
+buttons, and form labels of the active page or dialog, skipping site headers, navigation and
+footers, plus the number of visible password fields. All patterns are then matched in one pass of a
+single compiled regex, and the verdict comes back with the evidence it is based on, so a "sign up"
+link in a footer no longer classifies an application form as a registration wall.
+"""
+import logging
+import re
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, List
+
+from auto_job_application.form_cache import ats_key
+
+if TYPE_CHECKING:
+    from playwright.async_api import Page
+
+logger = logging.getLogger(__name__)
+
+MAX_SNIPPETS = 300  # Elements read per check; account walls put their cues near the top
+MAX_TEXT = 120      # Characters kept per element
+
+# Visible headings, buttons and form text of the topmost open dialog (or the page), without site
+# chrome, and the number of visible password fields, in one round-trip
+SCAN_SCRIPT = """
+([maxSnippets, maxText]) => {
+    const visible = (el) => !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+    const dialogs = Array.from(document.querySelectorAll("[role='dialog'], dialog[open]")).filter(visible);
+    const root = dialogs.length ? dialogs[dialogs.length - 1] : document;
+    const chrome = "header, nav, footer, [role='banner'], [role='navigation'], [role='contentinfo']";
+    const text = (s) => (s || '').replace(/\\s+/g, ' ').trim().slice(0, maxText);
+    const regions = [
+        ['heading', "h1, h2, h3, [role='heading'], legend"],
+        ['button', "button, [role='button'], input[type='submit'], input[type='button'], form a"],
+        ['form', "form label, input:not([type='hidden']), [aria-label][role='textbox']"],
+    ];
+    const snippets = [];
+    for (const [region, selector] of regions) {
+        for (const el of root.querySelectorAll(selector)) {
+            if (snippets.length >= maxSnippets) break;
+            if (!visible(el) || (root === document && el.closest(chrome))) continue;
+            const value = el.tagName === 'INPUT'
+                ? (el.type === 'submit' || el.type === 'button' ? el.value
+                   : el.getAttribute('aria-label') || el.getAttribute('placeholder'))
+                : el.innerText || el.getAttribute('aria-label');
+            const t = text(value);
+            if (t) snippets.push([region, t]);
+        }
+    }
+    const passwords = Array.from(root.querySelectorAll("input[type='password']")).filter(visible).length;
+    return {title: text(document.title), snippets, passwords};
+}
+"""
+
+# Signal -> pattern; combined into one alternation, so each snippet is scanned once for all of them
+PATTERNS = (
+    ("guest", r"(?:apply|continue) (?:as (?:a )?guest|without (?:an? )?(?:account|signing in|registering))"
+              r"|guest (?:apply|application|checkout)"),
+    ("confirm_password", r"(?:confirm|verify|re-?enter|repeat|retype) (?:your |new )?password"),
+    ("create_account", r"create (?:an? |your )?(?:new )?(?:account|profile)|\bsign ?up\b|\bregister\b"
+                       r"|\bnew (?:user|account)\b|\bjoin now\b|don'?t have an account"),
+    ("sign_in", r"\bsign ?in\b|\blog ?in\b|forgot (?:your )?password|already have an account"
+                r"|indeed account|facebook jobs login"),
+)
+REGISTRATION_PATTERN = re.compile("|".join(f"(?P<{name}>{pattern})" for name, pattern in PATTERNS), re.I)
+
+STRONG_REGIONS = ("heading", "form")  # Where a cue describes the page itself rather than a way off it
+
+
+@dataclass
+class Evidence:
+    signal: str
+    region: str  # title, heading, button or form
+    text: str
+
+    def __str__(self) -> str:
+        return f'{self.region} "{self.text}"'
+
+
+@dataclass
+class RegistrationVerdict:
+    kind: str  # registration, sign_in, guest, uncertain or none
+    evidence: List[Evidence] = field(default_factory=list)
+    password_fields: int = 0
+    ats: str = ""
+    elapsed_ms: float = 0.0
+
+    @property
+    def required(self) -> bool:
+        return self.kind in ("registration", "sign_in")
+
+    def describe(self) -> str:
+        """The action result shown to the agent."""
+        cues = "; ".join(str(e) for e in self.evidence[:4])
+        if self.password_fields:
+            cues = f"{cues}; {self.password_fields} password field{'s' if self.password_fields > 1 else ''}".lstrip("; ")
+        if self.kind == "registration":
+            return f"Registration required - an account creation form is shown ({cues}). Report REQUIRES_ACCOUNT_REGISTRATION."
+        if self.kind == "sign_in":
+            return f"Registration required - a sign-in form is shown ({cues}). Report REQUIRES_ACCOUNT_REGISTRATION."
+        if self.kind == "guest":
+            return f"No registration required - the site offers to apply without an account ({cues}). Use that option."
+        if self.kind == "uncertain":
+            return (f"Unclear whether an account is needed: only buttons or the page title mention accounts ({cues}). "
+                    f"Ask the human before reporting REQUIRES_ACCOUNT_REGISTRATION.")
+        return "No registration requirement detected - no account form, heading or password field is visible."
+
+
+def classify(scan: Dict[str, Any], url: str = "") -> RegistrationVerdict:
+    """Turn the scan script's output into a verdict."""
+    snippets = [("title", scan.get("title") or "")] + [tuple(s) for s in scan.get("snippets", [])]
+    evidence: List[Evidence] = []
+    for region, text in snippets:
+        for match in REGISTRATION_PATTERN.finditer(text):
+            evidence.append(Evidence(signal=match.lastgroup, region=region, text=text))
+            break  # One signal per element is enough
+    signals = {e.signal for e in evidence}
+    strong = {e.signal for e in evidence if e.region in STRONG_REGIONS}
+    passwords = int(scan.get("passwords") or 0)
+    ats = ats_key(url) if url else ""
+
+    if "guest" in signals:
+        kind = "guest"
+    elif "confirm_password" in signals or passwords >= 2:
+        kind = "registration"
+    elif passwords == 1:
+        kind = "registration" if "create_account" in strong else "sign_in"
+    elif "create_account" in strong:
+        kind = "registration"
+    elif "sign_in" in strong:
+        kind = "sign_in"
+    elif signals & {"create_account", "sign_in"}:
+        kind = "uncertain"
+    else:
+        kind = "none"
+
+    # Most relevant cues first: those that decided the verdict, from the page itself before buttons
+    order = {"guest": 0, "confirm_password": 1, "create_account": 2, "sign_in": 3}
+    evidence.sort(key=lambda e: (e.region not in STRONG_REGIONS, order[e.signal]))
+    if kind == "guest":
+        evidence = [e for e in evidence if e.signal == "guest"] + [e for e in evidence if e.signal != "guest"]
+    return RegistrationVerdict(kind=kind, evidence=evidence, password_fields=passwords, ats=ats)
+
+
+async def detect_registration(page: "Page") -> RegistrationVerdict:
+    """Scan the page in one evaluate and classify it."""
+    started = time.perf_counter()
+    scan = await page.evaluate(SCAN_SCRIPT, [MAX_SNIPPETS, MAX_TEXT])
+    verdict = classify(scan, page.url)
+    verdict.elapsed_ms = (time.perf_counter() - started) * 1000
+    logger.info(f"Registration check on {verdict.ats or page.url}: {verdict.kind} in {verdict.elapsed_ms:.1f} ms "
+                f"({len(scan.get('snippets', []))} elements, {verdict.password_fields} password fields)")
+    return verdict
@@ -0,0 +1,219 @@
+"""
+Parsed resume context for the application agent, cached on disk and in memory.
+
+The PDF is parsed once per content hash into its text and a structured profile (contact details,
+summary, work history, education, skills and any other sections), so agent actions can hand the
+LLM just the section a form field needs instead of the whole resume on every step.
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = os.path.expanduser("~/.cache/linkedin_jobs/resumes")
+PARSER_VERSION = 1  # Bump when parsing changes so cached profiles are rebuilt
+
+# Canonical section -> headings that start it (compared case-insensitively, without a trailing colon)
+SECTION_HEADINGS = {
+    "summary": ("summary", "professional summary", "profile", "about", "about me", "objective", "career objective"),
+    "experience": ("experience", "work experience", "professional experience", "employment", "employment history",
+                   "work history", "relevant experience"),
+    "education": ("education", "education and training", "academic background"),
+    "skills": ("skills", "technical skills", "core competencies", "skills and tools", "skills & tools",
+               "technologies", "skills & interests", "skills and interests"),
+    "projects": ("projects", "selected projects", "personal projects"),
+    "certifications": ("certifications", "certificates", "licenses and certifications", "licenses & certifications"),
+    "publications": ("publications", "patents", "publications and patents"),
+    "awards": ("awards", "honors", "honors and awards", "honors & awards", "achievements"),
+    "languages": ("languages",),
+    "volunteering": ("volunteering", "volunteer experience", "leadership", "leadership and activities"),
+}
+_HEADING_TO_SECTION = {heading: section for section, headings in SECTION_HEADINGS.items() for heading in headings}
+SECTIONS = ("overview", "contact", *SECTION_HEADINGS, "full")
+
+EMAIL = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+PHONE = re.compile(r"(?:\+?\d{1,3}[\s.-]?)?\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}")
+LINKEDIN = re.compile(r"(?:https?://)?(?:[\w-]+\.)?linkedin\.com/in/[\w%-]+/?", re.I)
+URL = re.compile(r"(?:https?://|www\.)[^\s|,]+|github\.com/[\w-]+", re.I)
+# A work-history entry starts at a line carrying a date range, e.g. "Jan 2021 - Present" or "2019 – 2022"
+DATE_RANGE = re.compile(r"(?:\b[A-Z][a-z]{2,8}\.?\s+)?\b(?:19|20)\d{2}\s*(?:-|–|—|to)\s*"
+                        r"(?:(?:[A-Z][a-z]{2,8}\.?\s+)?(?:19|20)\d{2}|present|current|now)\b", re.I)
+
+
+@dataclass
+class ResumeProfile:
+    """The resume's text and its sections, as cached"""
+    path: str
+    sha256: str
+    text: str
+    contact: Dict[str, str] = field(default_factory=dict)
+    sections: Dict[str, str] = field(default_factory=dict)  # Canonical section name -> its text
+    experience: List[str] = field(default_factory=list)     # One entry per role, most recent first as written
+    skills: List[str] = field(default_factory=list)
+    parser_version: int = PARSER_VERSION
+
+    def section(self, name: str) -> str:
+        """Text of one section; 'overview' is the compact summary kept in agent memory."""
+        name = name.lower().strip()
+        if name == "full":
+            return self.text
+        if name == "overview":
+            return self.overview()
+        if name == "contact":
+            return "\n".join(f"{key}: {value}" for key, value in self.contact.items())
+        if name == "skills" and self.skills:
+            return ", ".join(self.skills)
+        if name not in self.sections:
+            available = ", ".join(s for s in SECTIONS if s in ("overview", "contact", "full") or s in self.sections)
+            return f"The resume has no '{name}' section. Available: {available}."
+        return self.sections[name]
+
+    def overview(self) -> str:
+        parts = [self.section("contact")]
+        if "summary" in self.sections:
+            parts.append("Summary: " + _truncate(self.sections["summary"], 400))
+        if self.experience:
+            parts.append(f"Current/most recent role: {_truncate(self.experience[0], 300)}")
+            parts.append(f"Roles listed: {len(self.experience)}")
+        if "education" in self.sections:
+            parts.append("Education: " + _truncate(self.sections["education"], 250))
+        if self.skills:
+            parts.append("Skills: " + ", ".join(self.skills[:25]))
+        sections = [s for s in SECTIONS if s in self.sections]
+        parts.append(f"More detail with read_resume_section: {', '.join(sections + ['full'])}")
+        return "\n".join(parts)
+
+
+def _truncate(text: str, limit: int) -> str:
+    text = " ".join(text.split())
+    return text if len(text) <= limit else text[:limit].rsplit(" ", 1)[0] + "..."
+
+
+def extract_text(path: str) -> str:
+    from PyPDF2 import PdfReader  # Only needed when a resume is not cached yet
+    return "\n".join(page.extract_text() or "" for page in PdfReader(path).pages)
+
+
+def _heading(line: str) -> Optional[str]:
+    key = line.strip().rstrip(":").strip().lower()
+    if len(key) > 40:
+        return None
+    return _HEADING_TO_SECTION.get(key)
+
+
+def parse_resume(path: str, text: str, sha256: str) -> ResumeProfile:
+    """Split resume text into contact details and known sections; text before the first heading is the header."""
+    lines = [line.rstrip() for line in text.splitlines()]
+    header: List[str] = []
+    sections: Dict[str, List[str]] = {}
+    current: Optional[str] = None
+    for line in lines:
+        section = _heading(line)
+        if section:
+            current = section
+            sections.setdefault(section, [])
+        elif current:
+            sections[current].append(line)
+        else:
+            header.append(line)
+    section_text = {name: "\n".join(body).strip() for name, body in sections.items() if "\n".join(body).strip()}
+
+    header_text = "\n".join(header)
+    contact: Dict[str, str] = {}
+    name = next((line.strip() for line in header if line.strip()), "")
+    if name and not EMAIL.search(name) and len(name) <= 60:
+        contact["name"] = name
+    for key, pattern in (("email", EMAIL), ("phone", PHONE), ("linkedin", LINKEDIN)):
+        match = pattern.search(header_text) or pattern.search(text)
+        if match:
+            contact[key] = match.group(0).strip()
+    website = next((m.group(0) for m in URL.finditer(header_text) if "linkedin" not in m.group(0).lower()), None)
+    if website:
+        contact["website"] = website
+
+    experience = _split_roles(section_text.get("experience", ""))
+    skills = _split_skills(section_text.get("skills", ""))
+    return ResumeProfile(path=path, sha256=sha256, text=text, contact=contact, sections=section_text,
+                         experience=experience, skills=skills)
+
+
+def _split_roles(experience: str) -> List[str]:
+    """Group the experience section into one entry per role, splitting at the lines that carry date ranges."""
+    lines = [line for line in experience.splitlines() if line.strip()]
+    starts = [i for i, line in enumerate(lines) if DATE_RANGE.search(line)]
+    if not starts:
+        return [experience] if experience else []
+    # A role's title/company line usually sits just above its dates
+    starts = [i - 1 if i > 0 and not DATE_RANGE.search(lines[i - 1]) and len(lines[i - 1]) < 80
+              and (i - 1) not in starts else i for i in starts]
+    if starts[0] > 0:
+        starts[0] = 0
+    bounds = list(zip(starts, starts[1:] + [len(lines)]))
+    return ["\n".join(lines[start:end]) for start, end in bounds]
+
+
+def _split_skills(skills: str) -> List[str]:
+    items = []
+    for line in skills.splitlines():
+        line = line.split(":", 1)[1] if ":" in line and len(line.split(":", 1)[0]) < 30 else line  # "Languages: ..."
+        items.extend(item.strip(" •·-–\t") for item in re.split(r"[,;|•·]", line))
+    seen = set()
+    return [item for item in items if item and len(item) <= 50 and not (item.lower() in seen or seen.add(item.lower()))]
+
+
+def _file_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+_memory: Dict[Tuple[str, int, int], ResumeProfile] = {}  # (path, mtime_ns, size) -> profile, for this process
+
+
+def load_resume(path, cache_dir: str = CACHE_DIR) -> ResumeProfile:
+    """
+    The parsed resume at `path`. Unchanged files (same mtime and size) come from memory without
+    being read; otherwise the file is hashed and the profile loaded from cache_dir, and the PDF is
+    parsed only when its content has not been seen before.
+    """
+    path = os.path.abspath(str(path))
+    stat = os.stat(path)
+    key = (path, stat.st_mtime_ns, stat.st_size)
+    if key in _memory:
+        return _memory[key]
+
+    sha256 = _file_hash(path)
+    cache_file = os.path.join(cache_dir, f"{sha256}.json")
+    profile = None
+    try:
+        with open(cache_file) as f:
+            cached = json.load(f)
+        if cached.get("parser_version") == PARSER_VERSION:
+            profile = ResumeProfile(**{**cached, "path": path})
+    except (OSError, ValueError, TypeError):
+        pass
+
+    if profile is None:
+        profile = parse_resume(path, extract_text(path), sha256)
+        logger.info(f"Parsed resume {os.path.basename(path)}: {len(profile.text)} characters, "
+                    f"sections: {', '.join(profile.sections) or 'none found'}")
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp_file = cache_file + ".tmp"
+            with open(tmp_file, "w") as f:
+                json.dump(asdict(profile), f)
+            os.replace(tmp_file, cache_file)
+        except OSError as e:
+            logger.warning(f"Could not cache the parsed resume: {e}")
+
+    for stale in [k for k in _memory if k[0] == path]:
+        del _memory[stale]
+    _memory[key] = profile
+    return profile
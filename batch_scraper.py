@@ -0,0 +1,257 @@
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import random
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, List, Optional
+
+
+from scraper import LinkedInJobScraper, SearchConfig
+from utils import browser_utils
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BrowserSlot:
+    """One authenticated browser (profile or cookie file) shared by every search scheduled on it"""
+    name: str
+    profile_name: Optional[str] = None
+    cookie_file: Optional[str] = None
+    max_concurrent: int = 1      # Searches running at once on this browser, each on its own page
+    min_interval: float = 60.0   # Seconds between search starts on this browser
+    use_daemon: bool = False     # Use browser_daemon.py's warm context for the profile when it is running
+    _page: Any = field(default=None, repr=False)     # Initial page; search pages are opened in its context
+    _session: Any = field(default=None, repr=False)
+    _browser: Any = field(default=None, repr=False)
+    _playwright: Any = field(default=None, repr=False)  # Driver started for the daemon connection
+    _from_daemon: bool = field(default=False, repr=False)
+    _last_start: float = field(default=0.0, repr=False)
+    _lock: asyncio.Lock = field(default_factory=asyncio.Lock, repr=False)
+
+    async def ensure_started(self, headless: bool):
+        async with self._lock:
+            if self._page:
+                return
+            if self.profile_name and self.use_daemon:
+                try:
+                    self._playwright, self._browser, _, self._page = await browser_utils.connect_to_daemon(
+                        self.profile_name)
+                    self._from_daemon = True
+                    logger.info(f"Browser '{self.name}' connected to the warm daemon context.")
+                    return
+                except browser_utils.DaemonUnavailable as e:
+                    browser_utils.launch_instead_of_daemon(self.profile_name, e)
+            if self.profile_name:
+                self._session, self._page = await browser_utils.initialize_browser_with_profile(
+                    profile_name=self.profile_name, headless=headless)
+            else:
+                self._browser, _, self._page = await browser_utils.initialize_browser(
+                    cookie_file=self.cookie_file, headless=headless)
+            logger.info(f"Browser '{self.name}' started.")
+
+    def ready_in(self) -> float:
+        """Seconds until this browser's rate limit allows another search to start."""
+        return max(0.0, self._last_start + self.min_interval - time.monotonic())
+
+    def take_turn(self) -> bool:
+        """Claim the next search start on this browser, if its rate limit allows one now."""
+        if self.ready_in() > 0:
+            return False
+        self._last_start = time.monotonic()
+        return True
+
+    async def new_page(self):
+        return await self._page.context.new_page()
+
+    async def stop(self):
+        if self._from_daemon:
+            await self._page.close()
+            await self._browser.close()  # Disconnects; the daemon's context stays warm
+            await self._playwright.stop()
+        elif self._session:
+            await self._session.stop()
+        elif self._browser:
+            await self._browser.close()
+
+
+@dataclass
+class SearchJob:
+    """A search waiting in (or finished by) the scheduler, with its retry state and stats"""
+    config: SearchConfig
+    attempts: int = 0
+    ready_at: float = 0.0
+    status: str = "PENDING"
+    browser: str = ""
+    jobs_scraped: int = 0
+    jobs_skipped: int = 0
+    elapsed: float = 0.0
+    error: str = ""
+
+
+class BatchScheduler:
+    """
+    Runs many SearchConfigs over a fixed pool of browsers.
+
+    Each browser gets `max_concurrent` workers. Workers take searches from one shared
+    FIFO queue, so searches are served round-robin. A global semaphore caps the number of
+    searches running at once. Failed searches go to the back of the queue with
+    exponential backoff until `max_attempts` is reached.
+    """
+
+    def __init__(self, configs: List[SearchConfig], slots: List[BrowserSlot], max_concurrency: int = 2,
+                 max_attempts: int = 3, backoff_base: float = 60.0, headless: bool = False,
+                 db_file: Optional[str] = None, **scraper_kwargs):
+        self.jobs: List[SearchJob] = [SearchJob(config) for config in configs]
+        self.slots = slots
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.headless = headless
+        self.db_file = db_file  # None: $LINKEDIN_JOBS_DB or linkedin_jobs.db; all searches share its writer
+        self.scraper_kwargs = scraper_kwargs  # Passed on to every LinkedInJobScraper, e.g. concurrency or resume
+        self._queue: Deque[SearchJob] = deque(self.jobs)
+        self._running = 0
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    def _next_job(self) -> Optional[SearchJob]:
+        """Pop the first search whose backoff has expired, keeping the others in order."""
+        now = time.monotonic()
+        for _ in range(len(self._queue)):
+            job = self._queue.popleft()
+            if job.ready_at <= now:
+                return job
+            self._queue.append(job)
+        return None
+
+    async def _run_search(self, slot: BrowserSlot, job: SearchJob):
+        job.attempts += 1
+        job.browser = slot.name
+        job.status = "RUNNING"
+        started = time.monotonic()
+        page = scraper = None
+        try:
+            await slot.ensure_started(self.headless)  # A failed launch is retried like a failed search
+            page = await slot.new_page()
+            scraper = LinkedInJobScraper(search_config=job.config, page=page, headless=self.headless,
+                                         db_file=self.db_file, **self.scraper_kwargs)
+            async with scraper:
+                await scraper.scrape()
+            job.status = "DONE"
+            job.error = ""
+        except Exception as e:
+            job.error = str(e)
+            if job.attempts >= self.max_attempts:
+                job.status = "FAILED"
+                logger.error(f"Search '{job.config.title}' in '{job.config.location}' failed for good: {e}")
+            else:
+                job.status = "RETRYING"
+                delay = self.backoff_base * 2 ** (job.attempts - 1) * random.uniform(0.8, 1.2)
+                job.ready_at = time.monotonic() + delay
+                self._queue.append(job)
+                logger.warning(f"Search '{job.config.title}' in '{job.config.location}' failed ({e}); retrying in {delay:.0f}s")
+        finally:
+            job.elapsed += time.monotonic() - started
+            if scraper:
+                job.jobs_scraped = scraper.jobs_scraped
+                job.jobs_skipped = scraper.jobs_skipped
+            if page:
+                await page.close()
+
+    async def _worker(self, slot: BrowserSlot):
+        while self._queue or self._running:
+            # Wait out this browser's rate limit before asking for a permit, so a permit is never
+            # held idle while other browsers could start their searches
+            delay = slot.ready_in()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+
+            async with self._semaphore:
+                job = self._next_job()
+                # The turn is taken only once a permit is held: one taken while queued for a permit
+                # would be spent by the time the permit frees, and searches would start back-to-back
+                if job and not slot.take_turn():
+                    self._queue.appendleft(job)  # Another worker on this browser started a search meanwhile
+                    continue
+                if job:
+                    self._running += 1
+                    try:
+                        await self._run_search(slot, job)
+                    finally:
+                        self._running -= 1
+            if not job:
+                await asyncio.sleep(1)  # Everything left is backing off or still running elsewhere
+
+    async def run(self) -> List[SearchJob]:
+        workers = [self._worker(slot) for slot in self.slots for _ in range(slot.max_concurrent)]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for slot in self.slots:
+                await slot.stop()
+        self.report()
+        return self.jobs
+
+    def report(self):
+        """Print per-search throughput."""
+        from tabulate import tabulate
+        rows = [
+            (job.config.title, job.config.location, job.status, job.browser, job.attempts, job.jobs_scraped,
+             job.jobs_skipped, f"{job.elapsed:.0f}", f"{job.jobs_scraped / job.elapsed * 60:.1f}" if job.elapsed else "-")
+            for job in self.jobs
+        ]
+        print(tabulate(rows, headers=["title", "location", "status", "browser", "attempts", "scraped",
+                                      "skipped", "seconds", "jobs/min"], tablefmt="fancy_grid"))
+
+
+def load_search_configs(path: str) -> List[SearchConfig]:
+    """
+    Read searches from a JSON file: either a list of SearchConfig dicts, or
+    {"titles": [...], "locations": [...], "num_jobs": N, "time_filter": ...} for every title x location.
+    """
+    with open(path, "r") as f:
+        data = json.load(f)
+    if isinstance(data, list):
+        return [SearchConfig(**item) for item in data]
+
+    extra = {key: value for key, value in data.items() if key not in ("titles", "locations")}
+    return [SearchConfig(title=title, location=location, **extra)
+            for title, location in itertools.product(data["titles"], data["locations"])]
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Run a batch of LinkedIn job searches over a shared browser pool.")
+    parser.add_argument("searches", help="JSON file with the searches to run")
+    parser.add_argument("--profile", action="append", default=[], help="browser-use profile name (repeatable)")
+    parser.add_argument("--cookie-file", action="append", default=[], help="cookie file (repeatable)")
+    parser.add_argument("--per-browser", type=int, default=1, help="concurrent searches per browser")
+    parser.add_argument("--max-concurrency", type=int, default=2, help="concurrent searches overall")
+    parser.add_argument("--min-interval", type=float, default=60.0, help="seconds between search starts per browser")
+    parser.add_argument("--max-attempts", type=int, default=3)
+    parser.add_argument("--backoff", type=float, default=60.0, help="base retry delay in seconds")
+    parser.add_argument("--headless", action="store_true")
+    parser.add_argument("--fast-mode", action="store_true", help="block images, media, fonts and third-party hosts")
+    parser.add_argument("--db", help="database file (default: $LINKEDIN_JOBS_DB or linkedin_jobs.db)")
+    parser.add_argument("--daemon", action="store_true", help="use browser_daemon.py's warm browsers for --profile")
+    args = parser.parse_args()
+
+    slots = [BrowserSlot(name=name, profile_name=name, max_concurrent=args.per_browser, min_interval=args.min_interval,
+                         use_daemon=args.daemon)
+             for name in args.profile]
+    slots += [BrowserSlot(name=path, cookie_file=path, max_concurrent=args.per_browser, min_interval=args.min_interval)
+              for path in args.cookie_file]
+    if not slots:
+        parser.error("Pass at least one --profile or --cookie-file.")
+
+    scheduler = BatchScheduler(load_search_configs(args.searches), slots, max_concurrency=args.max_concurrency,
+                               max_attempts=args.max_attempts, backoff_base=args.backoff, headless=args.headless,
+                               db_file=args.db, fast_mode=args.fast_mode)
+    await scheduler.run()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
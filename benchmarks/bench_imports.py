@@ -0,0 +1,119 @@
+"""
+Startup benchmark for the command-line entry points: times fresh interpreters running the
+query CLI and importing the scraper modules, and checks that none of them loads the browser
+stack, the LLM client, the PDF reader or pyarrow before a code path actually needs it.
+Exits non-zero when a check fails, so it can hold the line in CI.
+
+    python -m benchmarks.bench_imports
+    python -m benchmarks.bench_imports --runs 20 --budget-ms 150
+    python -m benchmarks.bench_imports --profile "query_client.py list"   # python -X importtime breakdown
+"""
+import argparse
+import os
+import shlex
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+from utils.database import DB_PATH_ENV
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET_MS = 200  # Target for the query CLI, from process start to exit
+
+# Modules that must only load on the code paths that use them
+HEAVY_MODULES = ("browser_use", "playwright", "langchain_openai", "PyPDF2", "pyarrow", "tabulate", "numpy", "scipy")
+
+# Entry points timed end to end, each against a scratch database (via $LINKEDIN_JOBS_DB)
+COMMANDS = {
+    "query_client --help": ["query_client.py", "--help"],
+    "query_client list": ["query_client.py", "list"],
+    "query_client query --format tsv": ["query_client.py", "query", "all", "--format", "tsv"],
+}
+# Modules whose import must stay free of heavy dependencies
+IMPORTS = ("query_client", "scraper", "batch_scraper", "browser_daemon", "utils.db_utils", "utils.browser_utils")
+
+
+def run(argv: List[str], db: str, **kwargs) -> subprocess.CompletedProcess:
+    """Run a fresh interpreter in the repo, pointed at the scratch database so the real one is never touched."""
+    env = dict(os.environ, **{DB_PATH_ENV: db})
+    return subprocess.run([sys.executable, *argv], cwd=REPO_DIR, env=env, **kwargs)
+
+
+def time_command(argv: List[str], db: str, runs: int) -> Dict:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        run(argv, db, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append((time.perf_counter() - started) * 1000)
+    return {"median_ms": statistics.median(timings), "min_ms": min(timings)}
+
+
+def heavy_modules_loaded(module: str, db: str) -> List[str]:
+    """Heavy modules present in sys.modules after importing `module` in a fresh interpreter."""
+    script = (f"import sys; import {module}; "
+              f"print(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))")
+    output = run(["-c", script], db, check=True, capture_output=True, text=True).stdout
+    return output.split()
+
+
+def profile(command: str, db: str):
+    """Print the 15 slowest imports (cumulative) of a command, from python -X importtime."""
+    argv = shlex.split(command)
+    if argv[0].endswith(".py"):
+        argv = ["-X", "importtime", *argv]
+    else:
+        argv = ["-X", "importtime", "-c", f"import {argv[0]}"]
+    stderr = run(argv, db, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if line.startswith("import time:") and "|" in line and "cumulative" not in line:
+            _, cumulative, name = line[len("import time:"):].split("|")
+            rows.append((int(cumulative), name.rstrip()))
+    for cumulative, name in sorted(rows, reverse=True)[:15]:
+        print(f"{cumulative / 1000:8.1f} ms  {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CLI startup time and check for eager heavy imports.")
+    parser.add_argument("--runs", type=int, default=10, help="interpreter launches per command")
+    parser.add_argument("--budget-ms", type=float, default=BUDGET_MS, help="median startup budget for each command")
+    parser.add_argument("--profile", help="show the slowest imports of a command, e.g. 'query_client.py list' or 'scraper'")
+    args = parser.parse_args()
+
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp:
+        db = os.path.join(tmp, "bench.db")
+        # Schema setup happens once per database and is not part of startup
+        run(["query_client.py", "list"], db, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        if args.profile:
+            profile(args.profile, db)
+            return
+
+        print(f"{'command':<34}{'median':>10}{'min':>10}")
+        for name, argv in COMMANDS.items():
+            result = time_command(argv, db, args.runs)
+            over = result["median_ms"] > args.budget_ms
+            print(f"{name:<34}{result['median_ms']:>8.0f}ms{result['min_ms']:>8.0f}ms{'  OVER BUDGET' if over else ''}")
+            if over:
+                failures.append(f"{name} took {result['median_ms']:.0f} ms (budget {args.budget_ms:.0f} ms)")
+
+        baseline = time_command(["-c", "pass"], db, args.runs)["median_ms"]
+        print(f"{'(bare interpreter)':<34}{baseline:>8.0f}ms")
+
+        for module in IMPORTS:
+            loaded = heavy_modules_loaded(module, db)
+            print(f"import {module}: {'loads ' + ', '.join(loaded) if loaded else 'ok'}")
+            if loaded:
+                failures.append(f"import {module} loads {', '.join(loaded)}")
+
+    if failures:
+        print("\nFAILED:\n  " + "\n  ".join(failures))
+        sys.exit(1)
+    print("\nAll entry points within budget.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Offline scraper benchmark: runs LinkedInJobScraper against the local LinkedIn stand-in
+with pacing turned down and reports throughput, per-job latency, memory and DB write time.
+
+    python -m benchmarks.bench_scraper --jobs 200 --concurrency 4
+    python -m benchmarks.bench_scraper --compare benchmarks/results/<older commit>.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import resource
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+from typing import Dict
+
+from benchmarks.linkedin_stub import LinkedInStub
+from scraper import LinkedInJobScraper, SearchConfig
+from utils.pacing import PacingPolicy
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+# No human-like pauses: the benchmark measures the scraper's own work
+BENCH_PACING = PacingPolicy(default_ms=(0, 0), before_click_ms=(0, 0), after_ready_ms=(0, 0), scroll_steps=(1, 1),
+                            scroll_pause_ms=(0, 0), results_page_ms=(0, 0), block_cooldown_ms=(0, 0),
+                            ready_timeout_ms=5000)
+
+
+def current_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+async def run_benchmark(num_jobs: int, concurrency: int, use_api: bool, latency_ms: int, fast_mode: bool) -> Dict:
+    with tempfile.TemporaryDirectory() as tmp, LinkedInStub(num_jobs=num_jobs, latency_ms=latency_ms, use_api=use_api) as stub:
+        cookie_file = os.path.join(tmp, "cookies.json")
+        with open(cookie_file, "w") as f:
+            json.dump([], f)
+
+        scraper = LinkedInJobScraper(
+            search_config=SearchConfig(title="product manager", location="United States", num_jobs=num_jobs),
+            cookie_file=cookie_file, headless=True, db_file=os.path.join(tmp, "bench.db"), output_dir=tmp,
+            concurrency=concurrency, skip_seen=False, pacing=BENCH_PACING, base_url=stub.url,
+            fast_mode=fast_mode, allowed_hosts=["127.0.0.1"],
+        )
+        started = time.perf_counter()
+        async with scraper:
+            await scraper.scrape()
+            writer = scraper._writer
+        elapsed = time.perf_counter() - started
+
+    metrics = scraper.metrics
+    job_seconds = [job.seconds for job in metrics.jobs]
+    return {
+        "commit": current_commit(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "config": {"jobs": num_jobs, "concurrency": concurrency, "use_api": use_api,
+                   "latency_ms": latency_ms, "fast_mode": fast_mode},
+        "jobs_scraped": scraper.jobs_scraped,
+        "seconds": round(elapsed, 3),
+        "jobs_per_sec": round(scraper.jobs_scraped / elapsed, 2) if elapsed else 0.0,
+        "latency_p50_ms": round(metrics.job_seconds(50) * 1000, 1),
+        "latency_p95_ms": round(metrics.job_seconds(95) * 1000, 1),
+        "latency_mean_ms": round(sum(job_seconds) / len(job_seconds) * 1000, 1) if job_seconds else 0.0,
+        # ru_maxrss is KiB on Linux; it covers this Python process, not the Chromium children
+        "python_max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "db_write_seconds": round(writer.write_seconds, 4),
+        "db_batches": writer.batches,
+        "stub_requests": stub.requests,
+        "phases": {name: round(stats.total_seconds, 4) for name, stats in sorted(metrics.spans.items())},
+        "counters": dict(metrics.counters),
+    }
+
+
+def compare(current: Dict, baseline: Dict):
+    """Print each metric next to the baseline's, with the relative change."""
+    print(f"\nCompared with {baseline.get('commit')} ({baseline.get('timestamp')}):")
+    for key in ("jobs_per_sec", "latency_p50_ms", "latency_p95_ms", "python_max_rss_mb", "db_write_seconds"):
+        old, new = baseline.get(key), current.get(key)
+        change = f"{(new - old) / old:+.1%}" if old else "n/a"
+        print(f"  {key:<20} {old!s:>10} -> {new!s:>10}  ({change})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the scraper against a local LinkedIn stand-in.")
+    parser.add_argument("--jobs", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--dom-only", action="store_true", help="serve no Voyager API payloads (DOM fallback path)")
+    parser.add_argument("--latency-ms", type=int, default=0, help="server-side delay per request")
+    parser.add_argument("--fast-mode", action="store_true")
+    parser.add_argument("--output", help="where to write the JSON result (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", help="earlier result JSON to compare against")
+    args = parser.parse_args()
+
+    result = asyncio.run(run_benchmark(args.jobs, args.concurrency, not args.dom_only, args.latency_ms, args.fast_mode))
+    print(json.dumps(result, indent=2))
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{result['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(result, f, indent=2)
+    print(f"Saved to {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(result, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
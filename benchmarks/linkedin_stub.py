@@ -0,0 +1,228 @@
+"""
+A local stand-in for the parts of LinkedIn the scraper touches: the jobs search page
+(search boxes, "Date posted" filter, results list, pagination), the /jobs/view/ page and
+the Voyager job posting API. Jobs are synthetic and deterministic for a given seed.
+"""
+import html
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+PAGE_SIZE = 25
+
+TITLES = ["Product Manager", "Senior Product Manager", "Data Scientist", "Software Engineer",
+          "Technical Program Manager", "Machine Learning Engineer", "Growth Product Manager"]
+COMPANIES = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries", "Wayne Enterprises", "Pied Piper"]
+LOCATIONS = ["San Francisco, CA", "New York, NY", "Seattle, WA", "Austin, TX", "Remote"]
+PARAGRAPHS = [
+    "We are looking for a {title} to join our team and own the roadmap for a core product area.",
+    "You will work with engineering, design and data science to ship features used by millions of people.",
+    "Experience with Kubernetes, SQL, Python and experimentation frameworks is a plus.",
+    "This role is open to remote candidates within the United States.",
+    "Benefits include medical, dental and vision coverage, a 401(k) match and flexible time off.",
+    "{company} is an equal opportunity employer. All qualified applicants will receive consideration "
+    "for employment without regard to race, color, religion, sex, sexual orientation, gender identity, "
+    "national origin, disability or protected veteran status.",
+]
+
+# Shared by the search and view pages: fetch the posting from the API and render the top card + description,
+# the same way LinkedIn renders from its Voyager responses.
+RENDER_SCRIPT = """
+async function renderJob(jobId, useApi) {
+    const pane = document.getElementById('details');
+    let job;
+    if (useApi) {
+        const response = await fetch('/voyager/api/jobs/jobPostings/' + jobId);
+        const payload = await response.json();
+        const company = payload.included.find(e => e.entityUrn === payload.data.companyDetails['*companyResolutionResult']);
+        job = {title: payload.data.title, company: company.name, location: payload.data.formattedLocation,
+               paragraphs: payload.data.description.text.split('\\n')};
+    } else {
+        job = await (await fetch('/stub/jobs/' + jobId)).json();
+    }
+    pane.innerHTML = '';
+    const top = document.createElement('div');
+    top.className = 'job-details-jobs-unified-top-card__job-title';
+    const h1 = document.createElement('h1');
+    const a = document.createElement('a');
+    a.textContent = job.title;
+    h1.appendChild(a);
+    top.appendChild(h1);
+    const companyDiv = document.createElement('div');
+    companyDiv.className = 'job-details-jobs-unified-top-card__company-name';
+    const companyLink = document.createElement('a');
+    companyLink.textContent = job.company;
+    companyDiv.appendChild(companyLink);
+    const meta = document.createElement('div');
+    meta.className = 'job-details-jobs-unified-top-card__primary-description-container';
+    meta.textContent = job.location + ' · 2 hours ago · 37 applicants';
+    const heading = document.createElement('h2');
+    heading.textContent = 'About the job';
+    const body = document.createElement('div');
+    job.paragraphs.forEach(text => {
+        const p = document.createElement('p');
+        p.textContent = text;
+        body.appendChild(p);
+    });
+    pane.append(top, companyDiv, meta, heading, body);
+}
+"""
+
+
+def make_jobs(count: int, seed: int = 0) -> List[Dict]:
+    rng = random.Random(seed)
+    jobs = []
+    for i in range(count):
+        title = rng.choice(TITLES)
+        company = rng.choice(COMPANIES)
+        paragraphs = [p.format(title=title, company=company) for p in PARAGRAPHS if rng.random() < 0.8]
+        jobs.append({
+            "job_id": str(4000000000 + i),
+            "company_id": COMPANIES.index(company) + 1,
+            "title": title,
+            "company": company,
+            "location": rng.choice(LOCATIONS),
+            "paragraphs": paragraphs or [PARAGRAPHS[0].format(title=title)],
+            "listed_at": 1750000000000 + i * 60000,
+        })
+    return jobs
+
+
+class LinkedInStub:
+    """Serves the synthetic pages from a background thread; use as a context manager."""
+
+    def __init__(self, num_jobs: int = 500, seed: int = 0, latency_ms: int = 0, use_api: bool = True):
+        self.jobs = make_jobs(num_jobs, seed)
+        self.jobs_by_id = {job["job_id"]: job for job in self.jobs}
+        self.latency_ms = latency_ms
+        self.use_api = use_api
+        self.requests = 0
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.requests += 1
+                if stub.latency_ms:
+                    time.sleep(stub.latency_ms / 1000)
+                status, content_type, body = stub.route(self.path)
+                data = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def route(self, path: str):
+        parsed = urlparse(path)
+        query = {key: values[0] for key, values in parse_qs(parsed.query).items()}
+        parts = [part for part in parsed.path.split("/") if part]
+
+        if parts[:2] == ["jobs", "search"]:
+            return 200, "text/html; charset=utf-8", self.search_page(query)
+        if parts[:2] == ["jobs", "view"] and len(parts) >= 3 and parts[2] in self.jobs_by_id:
+            return 200, "text/html; charset=utf-8", self.view_page(parts[2])
+        if parts[:4] == ["voyager", "api", "jobs", "jobPostings"] and len(parts) == 5 and parts[4] in self.jobs_by_id:
+            return 200, "application/json", json.dumps(self.posting_payload(self.jobs_by_id[parts[4]]))
+        if parts[:2] == ["stub", "jobs"] and len(parts) == 3 and parts[2] in self.jobs_by_id:
+            job = self.jobs_by_id[parts[2]]
+            return 200, "text/plain", json.dumps({key: job[key] for key in ("title", "company", "location", "paragraphs")})
+        return 404, "text/plain", "not found"
+
+    def posting_payload(self, job: Dict) -> Dict:
+        """Mimics Voyager's normalized JSON: the posting in `data`, the company in `included`."""
+        company_urn = f"urn:li:fsd_company:{job['company_id']}"
+        return {
+            "data": {
+                "entityUrn": f"urn:li:fsd_jobPosting:{job['job_id']}",
+                "title": job["title"],
+                "description": {"text": "\n".join(job["paragraphs"])},
+                "companyDetails": {"*companyResolutionResult": company_urn},
+                "formattedLocation": job["location"],
+                "listedAt": job["listed_at"],
+            },
+            "included": [{"entityUrn": company_urn, "name": job["company"]}],
+        }
+
+    def _page(self, body: str, script: str) -> str:
+        return (f"<!DOCTYPE html><html><head><title>Jobs</title></head><body>{body}"
+                f"<script>const USE_API = {json.dumps(self.use_api)};{RENDER_SCRIPT}{script}</script></body></html>")
+
+    def search_page(self, query: Dict[str, str]) -> str:
+        search_box = (
+            '<input role="combobox" aria-label="Search by title, skill, or company" id="keywords">'
+            '<input role="combobox" aria-label="City, state, or zip code" id="location">'
+            '<button id="search">Search</button>'
+        )
+        if "keywords" not in query:
+            return self._page(search_box, """
+                document.getElementById('search').onclick = () => {
+                    const params = new URLSearchParams({keywords: document.getElementById('keywords').value,
+                                                        location: document.getElementById('location').value});
+                    window.location.href = '/jobs/search/?' + params.toString();
+                };
+            """)
+
+        start = int(query.get("start", 0))
+        cards = "".join(
+            f'<li class="scaffold-layout__list-item" data-occludable-job-id="{job["job_id"]}">'
+            f'<a class="job-card-container__link" href="#"><strong>{html.escape(job["title"])}</strong></a>'
+            f'<div class="artdeco-entity-lockup__subtitle">{html.escape(job["company"])}</div></li>'
+            for job in self.jobs[start:start + PAGE_SIZE]
+        )
+        has_next = start + PAGE_SIZE < len(self.jobs)
+        body = (
+            search_box
+            + '<button aria-label="Date posted filter. Clicking this button displays all Date posted filter options." id="date">Date posted</button>'
+            + '<div id="filters" hidden>'
+            + ''.join(f'<label><input type="radio" name="tpr">{label} Filter by {label}</label>'
+                      for label in ("Any time", "Past month", "Past week", "Past 24 hours"))
+            + '<button aria-label="Apply current filter to show results" id="apply">Show results</button></div>'
+            + f'<ul id="results">{cards}</ul>'
+            + f'<button aria-label="View next page" id="next" {"" if has_next else "disabled"}>Next</button>'
+            + '<div id="details"></div>'
+        )
+        return self._page(body, f"""
+            document.getElementById('date').onclick = () => {{ document.getElementById('filters').hidden = false; }};
+            document.getElementById('apply').onclick = () => {{ document.getElementById('filters').hidden = true; }};
+            document.getElementById('next').onclick = () => {{
+                const params = new URLSearchParams(window.location.search);
+                params.set('start', {start + PAGE_SIZE});
+                params.delete('currentJobId');
+                window.location.href = '/jobs/search/?' + params.toString();
+            }};
+            document.querySelectorAll('li.scaffold-layout__list-item').forEach(card => {{
+                card.onclick = () => {{
+                    const jobId = card.getAttribute('data-occludable-job-id');
+                    const params = new URLSearchParams(window.location.search);
+                    params.set('currentJobId', jobId);
+                    history.pushState(null, '', '/jobs/search/?' + params.toString());
+                    renderJob(jobId, USE_API);
+                }};
+            }});
+        """)
+
+    def view_page(self, job_id: str) -> str:
+        return self._page('<div id="details"></div>', f"renderJob({json.dumps(job_id)}, USE_API);")
@@ -0,0 +1,271 @@
+"""
+Long-lived local browser that keeps browser-use profiles logged in and warm, for scraper and
+agent processes to connect to over CDP instead of launching Chromium for every run.
+
+    python browser_daemon.py start --profile yahoo_email_account --headless
+    python scraper.py ...   # LinkedInJobScraper(profile_name=..., use_daemon=True) opens a page in ~100 ms
+    python browser_daemon.py status
+    python browser_daemon.py stop
+
+Each profile runs as one persistent context on its own user data dir, so cookies, local storage
+and the HTTP cache carry over between runs. The daemon health-checks every context and relaunches
+it after `max_pages` pages have been opened in it, or when the browser's memory passes
+`max_memory_mb` (needs psutil), waiting for open client pages to close first.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import signal
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TYPE_CHECKING, List, Optional
+
+from utils import browser_utils
+
+if TYPE_CHECKING:
+    from playwright.async_api import BrowserContext, Page, Playwright
+
+try:
+    import psutil
+except ImportError:  # Memory-based recycling is skipped without it
+    psutil = None
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class DaemonConfig:
+    """How one profile's warm context is served and when it is recycled"""
+    profile_name: str
+    headless: bool = False
+    max_pages: int = 200                   # Pages opened in a context before it is relaunched
+    max_memory_mb: Optional[float] = 2048  # Browser RSS, all processes, before it is relaunched
+    check_interval: float = 15.0           # Seconds between health checks
+    drain_timeout: float = 600.0           # Seconds to wait for client pages to close before recycling anyway
+
+
+class WarmBrowser:
+    """One profile's persistent context, published over CDP and relaunched when unhealthy or worn."""
+
+    def __init__(self, playwright: "Playwright", config: DaemonConfig):
+        self.playwright = playwright
+        self.config = config
+        self.user_data_dir = os.path.expanduser(f"~/.config/browseruse/profiles/{config.profile_name}")
+        self.context: Optional["BrowserContext"] = None
+        self._keepalive: Optional["Page"] = None  # Our own blank page; keeps the context open between clients
+        self.port = 0
+        self.started_at = ""
+        self.pages_served = 0
+        self.recycles = 0
+        self._browser_process = None
+        self._draining_since: Optional[float] = None
+
+    @property
+    def cdp_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    async def launch(self):
+        self.port = browser_utils.free_port()
+        self.context = await self.playwright.chromium.launch_persistent_context(
+            self.user_data_dir,
+            headless=self.config.headless,
+            args=["--no-sandbox", f"--remote-debugging-port={self.port}"],
+        )
+        self._keepalive = self.context.pages[0] if self.context.pages else await self.context.new_page()
+        self.context.on("page", self._on_page)
+        self.started_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.pages_served = 0
+        self._browser_process = None
+        self._draining_since = None
+        self.publish("ready")
+        logger.info(f"Profile '{self.config.profile_name}' is warm at {self.cdp_url}.")
+
+    async def close(self):
+        if self.context:
+            try:
+                await self.context.close()
+            except Exception as e:
+                logger.warning(f"Error closing the browser for '{self.config.profile_name}': {e}")
+            self.context = None
+
+    def _on_page(self, page: "Page"):
+        self.pages_served += 1
+
+    def client_pages(self) -> int:
+        """Pages opened by scraper or agent processes that are still open."""
+        return sum(1 for page in self.context.pages if page is not self._keepalive)
+
+    def memory_mb(self) -> Optional[float]:
+        """RSS of the browser and its renderer processes, or None without psutil."""
+        if psutil is None:
+            return None
+        try:
+            if self._browser_process is None:
+                flag = f"--remote-debugging-port={self.port}"
+                self._browser_process = next(
+                    process for process in psutil.Process().children(recursive=True)
+                    if flag in process.cmdline())
+            processes = [self._browser_process, *self._browser_process.children(recursive=True)]
+            return sum(process.memory_info().rss for process in processes) / 2 ** 20
+        except (StopIteration, psutil.Error):
+            self._browser_process = None
+            return None
+
+    async def healthy(self) -> bool:
+        try:
+            if self._keepalive.is_closed():  # A client closed it (e.g. browser-use's "current page")
+                self._keepalive = await self.context.new_page()
+                self.pages_served -= 1
+            await asyncio.wait_for(self._keepalive.evaluate("1 + 1"), timeout=5)
+            return True
+        except Exception as e:
+            logger.warning(f"Health check failed for '{self.config.profile_name}': {e}")
+            return False
+
+    def recycle_reason(self, memory_mb: Optional[float]) -> Optional[str]:
+        if self.pages_served >= self.config.max_pages:
+            return f"{self.pages_served} pages served"
+        if memory_mb is not None and self.config.max_memory_mb and memory_mb >= self.config.max_memory_mb:
+            return f"{memory_mb:.0f} MiB in use"
+        return None
+
+    async def recycle(self, reason: str):
+        logger.info(f"Recycling the browser for '{self.config.profile_name}': {reason}.")
+        self.publish("recycling")
+        await self.close()
+        await self.launch()
+        self.recycles += 1
+        self.publish("ready")
+
+    async def check(self):
+        """One supervision step: relaunch if unhealthy, recycle once worn and idle (or drained too long)."""
+        if not await self.healthy():
+            await self.recycle("health check failed")
+            return
+        memory_mb = self.memory_mb()
+        reason = self.recycle_reason(memory_mb)
+        if not reason:
+            self.publish("ready", memory_mb)
+            return
+
+        open_pages = self.client_pages()
+        if open_pages:
+            # Stop handing out pages and let running clients finish
+            self._draining_since = self._draining_since or time.monotonic()
+            if time.monotonic() - self._draining_since < self.config.drain_timeout:
+                self.publish("draining", memory_mb)
+                return
+            logger.warning(f"{open_pages} client pages of '{self.config.profile_name}' still open after "
+                           f"{self.config.drain_timeout:.0f}s; recycling anyway.")
+        await self.recycle(reason)
+
+    def publish(self, status: str, memory_mb: Optional[float] = None):
+        """Write this profile's state file, which clients read to find the CDP endpoint."""
+        state = {
+            "profile_name": self.config.profile_name, "pid": os.getpid(), "cdp_url": self.cdp_url, "status": status,
+            "started_at": self.started_at, "pages_served": self.pages_served, "recycles": self.recycles,
+            "memory_mb": round(memory_mb, 1) if memory_mb is not None else None,
+        }
+        path = browser_utils.daemon_state_path(self.config.profile_name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, path)
+
+    def unpublish(self):
+        try:
+            os.remove(browser_utils.daemon_state_path(self.config.profile_name))
+        except FileNotFoundError:
+            pass
+
+    async def supervise(self, stop: asyncio.Event):
+        while not stop.is_set():
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=self.config.check_interval)
+            except asyncio.TimeoutError:
+                try:
+                    await self.check()
+                except Exception as e:
+                    logger.error(f"Error supervising '{self.config.profile_name}': {e}")
+
+
+async def serve(configs: List[DaemonConfig]):
+    """Keep every configured profile warm until SIGINT or SIGTERM."""
+    from playwright.async_api import async_playwright
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    if psutil is None and any(config.max_memory_mb for config in configs):
+        logger.warning("psutil is not installed; contexts are recycled by page count only.")
+
+    async with async_playwright() as playwright:
+        browsers = [WarmBrowser(playwright, config) for config in configs]
+        try:
+            for browser in browsers:
+                await browser.launch()
+            await asyncio.gather(*(browser.supervise(stop) for browser in browsers))
+        finally:
+            for browser in browsers:
+                browser.unpublish()
+                await browser.close()
+    logger.info("Browser daemon stopped.")
+
+
+def served_profiles() -> List[dict]:
+    if not os.path.isdir(browser_utils.DAEMON_DIR):
+        return []
+    names = sorted(name[:-len(".json")] for name in os.listdir(browser_utils.DAEMON_DIR) if name.endswith(".json"))
+    return [state for state in map(browser_utils.read_daemon_state, names) if state]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Keep browser-use profiles warm for scraper and agent runs.")
+    commands = parser.add_subparsers(dest="action")
+
+    start = commands.add_parser("start", help="serve profiles in the foreground until interrupted")
+    start.add_argument("--profile", action="append", required=True, help="browser-use profile name (repeatable)")
+    start.add_argument("--headless", action="store_true")
+    start.add_argument("--max-pages", type=int, default=DaemonConfig.max_pages,
+                       help="relaunch a context after this many pages")
+    start.add_argument("--max-memory-mb", type=float, default=DaemonConfig.max_memory_mb,
+                       help="relaunch a browser above this RSS (needs psutil; 0 to disable)")
+    start.add_argument("--check-interval", type=float, default=DaemonConfig.check_interval)
+
+    commands.add_parser("status", help="show the profiles being served")
+    commands.add_parser("stop", help="stop every running daemon")
+    args = parser.parse_args()
+
+    if args.action == "start":
+        configs = [DaemonConfig(profile_name=name, headless=args.headless, max_pages=args.max_pages,
+                                max_memory_mb=args.max_memory_mb or None, check_interval=args.check_interval)
+                   for name in args.profile]
+        asyncio.run(serve(configs))
+    elif args.action == "status":
+        states = served_profiles()
+        if not states:
+            print("No browser daemon is running.")
+        for state in states:
+            memory = f", {state['memory_mb']:.0f} MiB" if state.get("memory_mb") is not None else ""
+            print(f"- {state['profile_name']}: {state['status']} at {state['cdp_url']} (pid {state['pid']}), "
+                  f"up since {state['started_at']}, {state['pages_served']} pages, {state['recycles']} recycles{memory}")
+    elif args.action == "stop":
+        for pid in {state["pid"] for state in served_profiles()}:
+            os.kill(pid, signal.SIGTERM)
+            print(f"Sent SIGTERM to browser daemon {pid}.")
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
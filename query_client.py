@@ -1,3 +1,5 @@
+import argparse
+import json
 import logging
 import sys
 from utils import db_utils
@@ -9,31 +11,124 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Inspect and manage scraped LinkedIn jobs.")
+    parser.add_argument("--db", help="database file (default: $LINKEDIN_JOBS_DB or linkedin_jobs.db)")
+    commands = parser.add_subparsers(dest="action")
+
+    commands.add_parser("list", help="list scrape runs")
+
+    query = commands.add_parser("query", help="show the jobs seen by a run")
+    query.add_argument("run_id", nargs="?", default="all", help="run ID, or 'all' for the most recently scraped jobs")
+    query.add_argument("limit", nargs="?", type=int, default=None,
+                       help="rows to show (default: 5 as a table, all for tsv/ndjson; 0 for all)")
+    query.add_argument("--after", help="keyset pagination: continue after this job_id from the previous page")
+    query.add_argument("--columns", help="comma-separated columns to read, e.g. job_id,job_title,company_name")
+    query.add_argument("--format", choices=["table", "tsv", "ndjson"], default="table",
+                       help="table is buffered; tsv and ndjson stream one line per row")
+    query.add_argument("--truncate", type=int, default=80, help="truncate descriptions in table output (0: never)")
+
+    purge = commands.add_parser("purge", help="delete a run and the jobs only it has seen")
+    purge.add_argument("run_id", type=int)
+
+    migrate = commands.add_parser("migrate", help="import per-run jobs_* tables from older versions")
+    migrate.add_argument("--drop", action="store_true", help="drop the old tables after importing them")
+
+    search = commands.add_parser("search", help="full-text search over job titles, companies and descriptions")
+    search.add_argument("query", nargs="+", help='FTS5 query, e.g. kubernetes remote or "product manager" NOT senior')
+    search.add_argument("--company", help="only companies whose name contains this")
+    search.add_argument("--since", help="only jobs scraped on or after this date (YYYY-MM-DD)")
+    search.add_argument("--until", help="only jobs scraped on or before this date (YYYY-MM-DD)")
+    search.add_argument("--run", type=int, dest="run_id", help="only jobs seen by this run")
+    search.add_argument("--limit", type=int, default=20)
+
+    commands.add_parser("reindex", help="rebuild the full-text search index from the jobs table")
+    commands.add_parser("compact", help="drop unused description paragraphs and vacuum the database file")
+
+    export = commands.add_parser("export", help="export jobs seen since the last export to Parquet or Arrow files")
+    export.add_argument("out_dir", help="target directory; files are partitioned by scrape date and search")
+    export.add_argument("--format", choices=["parquet", "arrow"], default="parquet")
+
+    score = commands.add_parser("score", help="score jobs scraped since the last scoring against a resume (BM25)")
+    score.add_argument("resume", help="resume PDF")
+    score.add_argument("--rescore", action="store_true", help="rescore every job, not just new and re-scraped ones")
+
+    queue = commands.add_parser("queue", help="best-scoring jobs not applied to yet, best first")
+    queue.add_argument("--limit", type=int, default=20)
+    queue.add_argument("--min-score", type=float, default=0.0)
+    queue.add_argument("--company", help="only companies whose name contains this")
+    queue.add_argument("--since", help="only jobs scraped on or after this date (YYYY-MM-DD)")
+    queue.add_argument("--format", choices=["table", "urls"], default="table",
+                       help="urls prints one job URL per line, for the application agent")
+    return parser
+
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python query_client.py [list|query|purge] [table_name] [limit]")
-        return
-    action = sys.argv[1]
-    if action == "list":
-        tables = db_utils.list_tables()
-        print("\nTables in the database:")
-        for t in tables:
-            print(f"- {t}")
-    elif action == "query":
-        if len(sys.argv) < 3:
-            print("Usage: python query_client.py query [table_name] [limit]")
-            return
-        table = sys.argv[2]
-        limit = int(sys.argv[3]) if len(sys.argv) > 3 else 5
-        db_utils.query_table(table, limit)
-    elif action == "purge":
-        if len(sys.argv) < 3:
-            print("Usage: python query_client.py purge [table_name]")
-            return
-        table = sys.argv[2]
-        db_utils.purge_table(table)
+    parser = build_parser()
+    args = parser.parse_args()
+    if args.action == "list":
+        runs = db_utils.list_runs(args.db)
+        print("\nScrape runs in the database:")
+        for run_id, title, location, time_filter, started_at, num_jobs in runs:
+            print(f"- {run_id}: '{title}' in '{location}' ({time_filter or 'n/a'}) started {started_at}, {num_jobs} jobs")
+    elif args.action == "query":
+        run_id = int(args.run_id) if args.run_id != "all" else None
+        limit = args.limit if args.limit is not None else (5 if args.format == "table" else 0)
+        columns = args.columns.split(",") if args.columns else None
+        try:
+            db_utils.query_run(run_id, limit, args.truncate, db_file=args.db, columns=columns,
+                               after=args.after, fmt=args.format)
+        except ValueError as e:
+            parser.error(str(e))
+    elif args.action == "purge":
+        db_utils.purge_run(args.run_id, db_file=args.db)
+    elif args.action == "migrate":
+        imported = db_utils.migrate(drop=args.drop, db_file=args.db)
+        print(f"Migrated {imported} legacy per-run tables into the unified schema.")
+    elif args.action == "search":
+        # Bold matches on a terminal, brackets when piped
+        highlight = ("\033[1m", "\033[0m") if sys.stdout.isatty() else ("[", "]")
+        db_utils.search(" ".join(args.query), limit=args.limit, company=args.company, since=args.since,
+                        until=args.until, run_id=args.run_id, highlight=highlight, db_file=args.db)
+    elif args.action == "reindex":
+        with db_utils.get_database(args.db).writer() as conn:
+            db_utils.rebuild_search_index(conn)
+        print("Search index rebuilt.")
+    elif args.action == "compact":
+        with db_utils.get_database(args.db).writer() as conn:
+            db_utils.compact(conn)
+        print("Database compacted.")
+    elif args.action == "export":
+        from utils import export_utils  # Only this command needs pyarrow
+        try:
+            result = export_utils.export_jobs(db_utils.get_database(args.db), args.out_dir, args.format)
+        except (RuntimeError, ValueError) as e:
+            parser.error(str(e))
+        print(f"Exported {result['rows']} rows to {len(result['files'])} files under {args.out_dir}.")
+    elif args.action == "score":
+        from utils import ranking  # Only this command needs numpy and scipy
+        try:
+            result = ranking.score_jobs(db_utils.get_database(args.db), args.resume, rescore=args.rescore)
+        except (RuntimeError, OSError) as e:
+            parser.error(str(e))
+        print(f"Scored {result['scored']} jobs{' (full pass)' if result['full'] else ''}; "
+              f"{result['docs']} jobs and {result['terms']} terms in the model.")
+    elif args.action == "queue":
+        from utils import ranking
+        rows = ranking.application_queue(db_utils.get_database(args.db), limit=args.limit, min_score=args.min_score,
+                                         company=args.company, since=args.since)
+        if args.format == "urls":
+            for row in rows:
+                print(row[1])
+        else:
+            db_utils.write_rows(((job_id, title, company, location, f"{score:.2f}", ", ".join(json.loads(terms or "[]")))
+                                 for job_id, url, title, company, location, score, terms in rows),
+                                ["job_id", "job_title", "company_name", "location", "score", "matched terms"])
     else:
-        print("Unknown action. Use list, query, or purge.")
+        parser.print_help()
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    except BrokenPipeError:
+        # Output piped into e.g. `head` that exited early; not an error
+        sys.stderr.close()
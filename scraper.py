@@ -1,14 +1,23 @@
 import asyncio
-from playwright.async_api import async_playwright, Page, Browser, BrowserContext
+import os
 from datetime import datetime
-from typing import List, Optional
+from urllib.parse import urlencode
+from typing import TYPE_CHECKING, List, Optional, Sequence, Set, Tuple, Union
 import logging
-from dataclasses import dataclass
-from utils import browser_utils
+from dataclasses import asdict, dataclass
+from utils import browser_utils, db_utils, dom_utils
+from utils.database import Database
+from utils.db_writer import JobWriter
+from utils.metrics import RunMetrics
+from utils.network_utils import JobPayloadCapture
+from utils.pacing import PacingController, PacingPolicy
 import sqlite3
-from browser_use import BrowserSession
 import random
 
+if TYPE_CHECKING:  # The browser stack loads with the browser, in utils.browser_utils
+    from browser_use import BrowserSession
+    from playwright.async_api import Browser, BrowserContext, Page, Playwright
+
 
 # Configure logging
 logging.basicConfig(
@@ -17,8 +26,21 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Define database file
-DB_FILE = "linkedin_jobs.db"
+# Default database file (overridden by $LINKEDIN_JOBS_DB or db_file=...)
+DB_FILE = db_utils.DB_FILE
+
+LINKEDIN_URL = "https://www.linkedin.com"
+JOB_VIEW_PATH = "/jobs/view/{job_id}/"
+JOBS_SEARCH_PATH = "/jobs/search/"
+RESULTS_PAGE_SIZE = 25  # Cards per results page, i.e. the step of LinkedIn's `start` parameter
+
+# `f_TPR` values behind the "Date posted" filter labels
+TIME_FILTER_CODES = {
+    "Any time": "",
+    "Past month": "r2592000",
+    "Past week": "r604800",
+    "Past 24 hours": "r86400",
+}
 
 @dataclass
 class SearchConfig:
@@ -36,67 +58,174 @@ class ScrapingResult:
     job_title: str
     company_name: str
     job_description: str
+    location: str = ""
+    posted_at: str = ""
+
+@dataclass
+class RunCheckpoint:
+    """Progress marker queued behind the results it covers, so it is never saved ahead of them"""
+    results_offset: int
+    jobs_scraped: int
 
 class LinkedInJobScraper:
     """A class to scrape LinkedIn job listings with anti-detection features."""
     
     def __init__(self, search_config: SearchConfig, 
-                 cookie_file: str = None, headless: bool = False, output_dir: str = "results", profile_name: str = None):
+                 cookie_file: str = None, headless: bool = False, output_dir: str = "results", profile_name: str = None,
+                 concurrency: int = 1, page_delay_ms: Tuple[int, int] = (1500, 3000), db_file: Optional[str] = None,
+                 skip_seen: bool = True, refetch_after_days: Optional[float] = None, resume: bool = False,
+                 page: Optional["Page"] = None, fast_mode: bool = False, allowed_hosts: Optional[Sequence[str]] = None,
+                 pacing: Optional[PacingPolicy] = None, base_url: str = LINKEDIN_URL, use_daemon: bool = False):
         self.cookie_file = cookie_file
         self.search_config = search_config
         self.headless = headless
         self.output_dir = output_dir
-        self.job_data: List[ScrapingResult] = []
-        self._browser: Optional[Browser] = None
-        self._context: Optional[BrowserContext] = None
-        self._page: Optional[Page] = None
+        self.jobs_scraped = 0  # Results handed to the writer; the results themselves are not kept in memory
+        self._browser: Optional["Browser"] = None
+        self._context: Optional["BrowserContext"] = None
+        self._page: Optional["Page"] = page
+        self._owns_browser = page is None  # A page handed in (e.g. by the batch scheduler) belongs to its caller
         self.profile_name = profile_name
-        self._browser_session: Optional[BrowserSession] = None  # browser_user session
-        self._db_conn: Optional[sqlite3.Connection] = None  # Database connection
-        self._db_cursor: Optional[sqlite3.Cursor] = None    # Database cursor
-        self.table_name: str = "" # To store the dynamically generated table name
+        self._browser_session: Optional["BrowserSession"] = None  # browser_user session
+        self.use_daemon = use_daemon  # Open pages in browser_daemon.py's warm context for profile_name, if it runs
+        self._from_daemon = False     # The browser is the daemon's: close only our pages, then disconnect
+        self._playwright: Optional["Playwright"] = None  # Driver started for the daemon connection
+        self.db: Optional[Database] = None  # Shared WAL database: one writer connection, pooled readers
+        self.run_id: Optional[int] = None  # Row in the runs table for this scrape
+        self.db_file = db_file
+        self._writer: Optional[JobWriter] = None  # Background task persisting results as they arrive
+        self.concurrency = max(1, concurrency)  # Number of worker pages used for /jobs/view/ scraping
+        self.page_delay_ms = page_delay_ms      # Pacing budget between navigations, per worker page
+        self.pacing = PacingController(pacing)  # Jittered, adaptively scaled pauses
+        self.base_url = base_url.rstrip("/")    # Overridable so benchmarks can point at a local stand-in server
+        self._capture = JobPayloadCapture()     # Job records parsed from Voyager API responses
+        self.skip_seen = skip_seen                    # Skip jobs already in the DB from earlier runs
+        self.refetch_after_days = refetch_after_days  # Re-scrape known jobs last scraped longer ago than this
+        self._known_job_ids: Set[str] = set()         # Job IDs scraped before this run that need no scraping
+        self._processed_job_ids: Set[str] = set()     # Job IDs this run already scraped or linked; passed over silently
+        self.jobs_skipped = 0
+        self.resume = resume          # Continue the last unfinished run of the same search, if there is one
+        self.resumed = False          # Whether a checkpoint was actually found and restored
+        self._results_offset = 0      # `start` offset of the results page currently being processed
+        # Fast mode: block images/media/fonts and third-party hosts outside allowed_hosts
+        self._resource_blocker = browser_utils.ResourceBlocker(allowed_hosts) if fast_mode else None
+        self.metrics = RunMetrics()   # Phase spans, event counters and per-job timings, exported to output_dir
 
     async def __aenter__(self):
         """Async context manager entry"""
-        await self.initialize()
+        with self.metrics.span("browser_start"):
+            await self.initialize()
         self.connect_db() # Connect to DB on entry
-        await self.create_jobs_table() # Create table for this run
+        self.start_run() # Record this run in the runs table
+        self.load_known_jobs()
+        self._writer = JobWriter(self.db, self.save_results, is_result=lambda item: not isinstance(item, RunCheckpoint))
+        await self._writer.start()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit"""
-        await self.cleanup()
-        self.close_db() # Close DB on exit
+        try:
+            if self._writer:
+                await self._writer.close() # Flush whatever is still queued, even after an error; raises if the writer died
+                if exc_type is None:
+                    self.finish_run() # Failed runs stay unfinished so they can be resumed
+        finally:
+            await self.cleanup()
+            self.close_db() # Close DB on exit
+            self.export_metrics()
+
+    def export_metrics(self):
+        """Write the run's metrics as a JSON summary and a Prometheus text file into output_dir."""
+        self.metrics.finish(sleep_seconds=self.pacing.slept_seconds)
+        self.metrics.labels = {"run_id": str(self.run_id or ""), "title": self.search_config.title,
+                               "location": self.search_config.location}
+        self.metrics.counters["jobs_scraped"] = self.jobs_scraped
+        self.metrics.counters["jobs_skipped"] = self.jobs_skipped
+        if not self.output_dir:
+            return
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            # Without a run (the database was unavailable), name the file after the time instead
+            run_name = self.run_id or datetime.now().strftime("%Y%m%d_%H%M%S")
+            base = os.path.join(self.output_dir, f"run_{run_name}_metrics")
+            self.metrics.write_json(base + ".json")
+            self.metrics.write_prometheus(base + ".prom")
+            logger.info(f"Run metrics written to {base}.json / .prom "
+                        f"({self.metrics.wall_seconds:.1f}s wall, {self.metrics.sleep_seconds:.1f}s pacing pauses).")
+        except OSError as e:
+            logger.error(f"Error writing run metrics: {e}")
 
     async def initialize(self):
         """Initialize the browser and context"""
-        if self.profile_name:
+        if not self._owns_browser:
+            logger.info("Using the page provided by the caller.")
+            if self._resource_blocker:
+                await self._resource_blocker.attach(self._page)
+        elif self.profile_name and self.use_daemon and await self._connect_to_daemon():
+            self._browser_session = None  # The page lives in the daemon's warm context
+        elif self.profile_name:
             self._browser_session, self._page = await browser_utils.initialize_browser_with_profile(
                 profile_name=self.profile_name,
-                headless=self.headless
+                headless=self.headless,
+                resource_blocker=self._resource_blocker
             )
             self._browser = None
             self._context = None
         elif self.cookie_file:
             self._browser, self._context, self._page = await browser_utils.initialize_browser(
                 cookie_file=self.cookie_file,
-                headless=self.headless
+                headless=self.headless,
+                resource_blocker=self._resource_blocker
             )
             self._browser_session = None
         else:
             raise ValueError("Either profile_name or cookie_file must be provided for authentication.")
+        self._capture.attach(self._page)
+
+    async def _connect_to_daemon(self) -> bool:
+        """
+        Use a page in the daemon's warm context; False (after a warning) when no daemon serves the
+        profile. Raises when a daemon holds the profile but cannot be used.
+        """
+        try:
+            self._playwright, self._browser, self._context, self._page = await browser_utils.connect_to_daemon(
+                self.profile_name, resource_blocker=self._resource_blocker)
+        except browser_utils.DaemonUnavailable as e:
+            browser_utils.launch_instead_of_daemon(self.profile_name, e)
+            return False
+        self._from_daemon = True
+        self.metrics.count("browser_from_daemon")
+        return True
 
     async def cleanup(self):
         """Clean up resources"""
-        if self._browser_session:
+        if self._resource_blocker:
+            logger.info(f"Fast mode totals: {self._resource_blocker.totals().summary()}")
+        if not self._owns_browser:
+            return
+        if self._from_daemon:
+            await self._page.close()
+            await self._browser.close()  # Only disconnects; the daemon keeps the context warm
+            await self._playwright.stop()
+        elif self._browser_session:
             await self._browser_session.stop()
         elif self._browser:
             await self._browser.close()
 
     async def navigate_to_jobs_page(self):
         """Navigate to LinkedIn jobs search page"""
-        await self._page.goto("https://www.linkedin.com/jobs/search/")
-        await self._page.wait_for_timeout(1000)
+        await self._page.goto(self.base_url + JOBS_SEARCH_PATH)
+        await self.pacing.wait(self._page, 1000)
+
+    async def navigate_to_search_results(self):
+        """Open the filtered results page at the checkpointed offset directly, skipping search and filter setup."""
+        params = {"keywords": self.search_config.title, "location": self.search_config.location}
+        if TIME_FILTER_CODES[self.search_config.time_filter]:
+            params["f_TPR"] = TIME_FILTER_CODES[self.search_config.time_filter]
+        if self._results_offset:
+            params["start"] = self._results_offset
+        await self._page.goto(f"{self.base_url}{JOBS_SEARCH_PATH}?{urlencode(params)}")
+        await self.pacing.sleep(self.pacing.policy.results_page_ms)
 
     async def perform_search(self):
         """Perform the job search with human-like typing."""
@@ -111,213 +240,419 @@ class LinkedInJobScraper:
         await self._random_sleep()
 
         await self._page.get_by_role("button", name="Search", exact=True).click()
-        await self._random_sleep(2000, 4000)
+        await self.pacing.sleep(self.pacing.policy.results_page_ms)
 
     async def apply_time_filter(self):
         """Apply the time filter to the search results"""
         await self._page.get_by_role("button", name="Date posted filter. Clicking").click()
-        await self._page.wait_for_timeout(1000)
+        await self.pacing.wait(self._page, 1000)
         await self._page.locator("label").filter(
             has_text=f"{self.search_config.time_filter} Filter by {self.search_config.time_filter}"
         ).click()
-        await self._page.wait_for_timeout(1000)
+        await self.pacing.wait(self._page, 1000)
         await self._page.get_by_role("button", name="Apply current filter to show").click()
-        await self._page.wait_for_timeout(2000)
-
-    async def extract_text_content(self, selector: str, error_message: str, current_url: str) -> str:
-        """Common method to extract text content from a selector"""
-        element = self._page.locator(selector).first
-        if await element.count() > 0:
-            return (await element.text_content()).strip()
-        else:
-            logger.warning(f"{error_message} for URL: {current_url}")
-            return ""
-    
-    async def extract_job_title(self, current_url: str) -> str:
-        container = self._page.locator("div[class*='job-details-jobs-unified-top-card__job-title']").first
-        job_title = ""
-        if await container.count() > 0:
-            job_title_node = container.locator("a").first
-
-            if await job_title_node.count() > 0:
-                job_title = (await job_title_node.text_content()).strip()
-            else:
-                job_title = ""
-                logger.warning(f"Could not find <a> inside job title container for URL: {current_url}")
-        else:
-            logger.warning(f"Could not find job title container for URL: {current_url}")
-        return job_title
-
-    async def extract_job_description(self, current_url: str) -> str:
-        """Extract job description from the page"""
-        job_description = ""
-        # Step 1: Locate the "About the job" section heading
-        heading = self._page.locator("h2:text-is('About the job')").first
-        
-        if await heading.count() > 0:
-            # Step 2: Get the parent container
-            container = heading.locator("xpath=following-sibling::div").first
-            
-            if await container.count() > 0:
-                # Step 3: Extract all paragraphs inside the container
-                paragraphs = container.locator("p").all()
-                texts = []
-                for p in await paragraphs:
-                    text = await p.text_content()
-                    if text:
-                        texts.append(text)
-                job_description = "\n".join(texts).strip()
+        await self.pacing.wait(self._page, 2000)
+
+    async def extract_job_from_dom(self, page: Optional["Page"] = None) -> dict:
+        """Read title, company, description and top-card metadata in a single page.evaluate call."""
+        record = await dom_utils.extract_job_record(page or self._page)
+        record["job_description"] = "\n".join(record["paragraphs"]).strip()
+        record["location"] = record["metadata"][0] if record["metadata"] else ""
+        return record
+
+    def _log_missing_fields(self, record: dict, current_url: str):
+        """Warn about every field that neither the payload nor the DOM provided."""
+        found = record.get("found", {})
+        if not record.get("job_title"):
+            if not found.get("title_container"):
+                self.metrics.count("missing_title_container")
+                logger.warning(f"Could not find job title container for URL: {current_url}")
             else:
+                self.metrics.count("missing_job_title")
+                logger.warning(f"Could not find job title for URL: {current_url}")
+        if not record.get("company_name"):
+            self.metrics.count("missing_company_name")
+            logger.warning(f"Could not find company name for URL: {current_url}")
+        if not record.get("job_description"):
+            if not found.get("heading"):
+                self.metrics.count("missing_about_heading")
+                logger.warning(f"Could not find 'About the job' heading for URL: {current_url}")
+            elif not found.get("description_container"):
+                self.metrics.count("missing_description_container")
                 logger.warning(f"Could not find description container for URL: {current_url}")
-        else:
-            logger.warning(f"Could not find 'About the job' heading for URL: {current_url}")
-        return job_description
-
-    async def process_job_card(self, card) -> Optional[ScrapingResult]:
-        """Process a single job card with anti-detection measures."""
-        try:
-            await card.scroll_into_view_if_needed()
-            await self._random_sleep(500, 1200)
-            await card.click(timeout=5000, force=True)
-            await self._random_sleep(1500, 3000) # Wait longer for page content to load
-
-            await self._human_scroll() # Add human-like scroll
-
-            current_url = self._page.url
-            job_id = None
-            job_url = current_url
-            
-            if "currentJobId=" in current_url:
-                job_id = current_url.split("currentJobId=")[-1].split("&")[0]
-                job_url = f"https://www.linkedin.com/jobs/view/{job_id}/"
-            else:
-                logger.warning(f"Could not extract job ID from URL: {current_url}. Using original URL as fallback.")
 
-            job_title = await self.extract_text_content("div[class*='job-details-jobs-unified-top-card__job-title'] a", "Could not find job title", current_url)
-            company_name = await self.extract_text_content("div[class*='p-card__company-name'] a", "Could not find company name", current_url)
-            job_description = await self.extract_job_description(current_url)
-
-            return ScrapingResult(job_id=job_id or "", url=job_url, job_title=job_title, company_name=company_name, job_description=job_description)
+    async def extract_job(self, job_id: str, job_url: str, current_url: str,
+                          page: Optional["Page"] = None) -> ScrapingResult:
+        """
+        Build a job record from the captured network payload, falling back to a single
+        DOM evaluate only when the payload did not provide every field.
+        """
+        with self.metrics.span("extract_payload_wait"):
+            record = await self._capture.wait_for(job_id, self.pacing.policy.payload_timeout_ms) if job_id else {}
+        if not all(record.get(field) for field in ("job_title", "company_name", "job_description")):
+            self.metrics.count("dom_fallback")
+            with self.metrics.span("extract_dom"):
+                dom_record = await self.extract_job_from_dom(page)
+            if job_id and dom_record.get("pane_job_id") not in ("", job_id):
+                # The pane still shows another job; its fields must not be saved under this job_id
+                self.metrics.count("dom_wrong_job")
+                logger.warning(f"Details pane shows job {dom_record['pane_job_id']} instead of {job_id}; ignoring it.")
+                dom_record = {"found": dom_record.get("found", {})}
+            record = {**dom_record, **{key: value for key, value in record.items() if value}}
+            self._log_missing_fields(record, current_url)
+        else:
+            self.metrics.count("payload_complete")
 
-        except Exception as e:
-            logger.error(f"Failed to process job card for URL: {self._page.url}: {e}")
-            return None
+        return ScrapingResult(job_id=job_id or "", url=job_url, job_title=record.get("job_title", ""),
+                              company_name=record.get("company_name", ""), job_description=record.get("job_description", ""),
+                              location=record.get("location", ""), posted_at=record.get("posted_at", ""))
 
-    async def scroll_job_list(self) -> List[ScrapingResult]:
-        """Scroll through the job list and collect job data"""
+    async def process_job_card(self, card, card_id: Optional[str] = None) -> Optional[ScrapingResult]:
+        """Process a single job card with anti-detection measures."""
+        with self.metrics.job(card_id, "card") as timing:
+            try:
+                with timing.step("scroll_into_view"):
+                    await card.scroll_into_view_if_needed()
+                with timing.step("pause_before_click"):
+                    await self.pacing.sleep(self.pacing.policy.before_click_ms)
+                with timing.step("click"):
+                    await dom_utils.mark_job_details_stale(self._page)  # The previous job's pane is still rendered
+                    await card.click(timeout=5000, force=True)
+                # Wait for this job's details to render, then only a short jitter
+                with timing.step("wait_ready"):
+                    ready = await dom_utils.wait_for_job_details(self._page, card_id, self.pacing.policy.ready_timeout_ms)
+                if not ready:
+                    self.metrics.count("details_not_ready")
+                    logger.warning(f"Job details did not render in time for URL: {self._page.url}")
+                with timing.step("pause_after_ready"):
+                    await self.pacing.sleep(self.pacing.policy.after_ready_ms)
+
+                with timing.step("human_scroll"):
+                    await self._human_scroll() # Add human-like scroll
+
+                current_url = self._page.url
+                job_id = None
+                job_url = current_url
+
+                if "currentJobId=" in current_url:
+                    job_id = current_url.split("currentJobId=")[-1].split("&")[0]
+                    job_url = self.base_url + JOB_VIEW_PATH.format(job_id=job_id)
+                    timing.job_id = job_id
+                else:
+                    self.metrics.count("missing_job_id")
+                    logger.warning(f"Could not extract job ID from URL: {current_url}. Using original URL as fallback.")
+
+                with timing.step("extract"):
+                    return await self.extract_job(job_id, job_url, current_url)
+
+            except Exception as e:
+                timing.ok = False
+                self.metrics.count("job_card_failed")
+                logger.error(f"Failed to process job card for URL: {self._page.url}: {e}")
+                return None
+
+    async def _record_outcome(self, result: Optional[ScrapingResult], page: "Page") -> bool:
+        """Feed the pacing controller; returns whether the result is usable."""
+        if self.pacing.is_blocked(page.url):
+            self.metrics.count("blocked")
+            with self.metrics.span("block_cooldown"):
+                await self.pacing.record_block(page.url)
+            return False
+        if result is None or not result.job_description:
+            self.metrics.count("job_incomplete" if result else "job_failed")
+            self.pacing.record_error()
+        else:
+            self.pacing.record_success()
+        return result is not None
+
+    async def _record_result(self, result: ScrapingResult, prefix: str = ""):
+        """Hand a result to the background writer and log progress."""
+        self.jobs_scraped += 1
+        if result.job_id:
+            self._processed_job_ids.add(result.job_id)
+        await self._writer.put(result)
+        await self._checkpoint()
+        logger.info(f"{prefix}Scraped job {self.jobs_scraped}/{self.search_config.num_jobs}: '{result.job_title}' at '{result.company_name}'")
+
+    async def _checkpoint(self):
+        await self._writer.put(RunCheckpoint(results_offset=self._results_offset, jobs_scraped=self.jobs_scraped))
+
+    def _is_known_job(self, job_id: Optional[str]) -> bool:
+        return bool(job_id) and job_id in self._known_job_ids
+
+    def _is_processed_job(self, job_id: Optional[str]) -> bool:
+        """Scraped or linked earlier in this run; later scroll passes re-walk every card."""
+        return bool(job_id) and job_id in self._processed_job_ids
+
+    async def _skip_known_job(self, job_id: str):
+        """Link an already-scraped job to this run without clicking or extracting it."""
+        self.jobs_skipped += 1
+        self._processed_job_ids.add(job_id)
+        self._capture.discard(job_id)
+        await self._writer.put(job_id)
+        logger.debug(f"Skipping known job {job_id}")
+
+    async def scroll_job_list(self) -> int:
+        """Scroll through the job list and collect job data. Returns the number of jobs scraped."""
         logger.info("Scrolling through job list container...")
         job_cards = []
         
-        while len(self.job_data) < self.search_config.num_jobs:
+        while self.jobs_scraped < self.search_config.num_jobs:
             current_cards = await self._page.locator("li.scaffold-layout__list-item").all()
 
             if not current_cards:
+                self.metrics.count("no_job_cards")
                 logger.warning("⚠️ No job cards found yet. Waiting...")
                 await self._random_sleep()
                 continue
 
-            for card in current_cards:
-                if len(self.job_data) >= self.search_config.num_jobs:
+            # Card IDs are read in one round-trip and line up with the locator order
+            with self.metrics.span("index_job_cards"):
+                card_ids = [card["job_id"] for card in await dom_utils.index_job_cards(self._page)]
+            if len(card_ids) != len(current_cards):
+                card_ids = [None] * len(current_cards)
+
+            for card, card_id in zip(current_cards, card_ids):
+                if self.jobs_scraped >= self.search_config.num_jobs:
                     break
+                if self._is_processed_job(card_id):
+                    continue
+                if self._is_known_job(card_id):
+                    await self._skip_known_job(card_id)
+                    continue
 
-                result = await self.process_job_card(card)
-                if result:
-                    self.job_data.append(result)
-                    logger.info(f"Scraped job {len(self.job_data)}/{self.search_config.num_jobs}: '{result.job_title}' at '{result.company_name}'")
+                result = await self.process_job_card(card, card_id)
+                if await self._record_outcome(result, self._page):
+                    await self._record_result(result)
 
-            # Break if no new cards were found after processing the current set
+            # Move on to the next results page once scrolling stops revealing new cards
             if len(current_cards) == len(job_cards):
-                break
+                if self.jobs_scraped >= self.search_config.num_jobs or not await self._go_to_next_results_page():
+                    break
+                job_cards = []
+                continue
 
             job_cards = current_cards
             await self._random_sleep() # Wait a bit before trying to scroll more
 
-        return self.job_data
+        return self.jobs_scraped
+
+    async def _go_to_next_results_page(self) -> bool:
+        """Click the pagination 'next' button. Returns False when there are no more pages."""
+        with self.metrics.span("next_results_page"):
+            next_button = self._page.locator("button[aria-label='View next page']").first
+            if await next_button.count() == 0 or not await next_button.is_enabled():
+                return False
+            await next_button.click()
+            await self.pacing.sleep(self.pacing.policy.results_page_ms)
+        self._results_offset += RESULTS_PAGE_SIZE
+        await self._checkpoint()
+        return True
+
+    # --- Concurrent /jobs/view/ Mode ---
+    async def collect_page_job_ids(self) -> List[str]:
+        """Collect the IDs of unknown jobs on the current results page."""
+        cards = await self._page.locator("li.scaffold-layout__list-item").all()
+        if not cards:
+            self.metrics.count("no_job_cards")
+            logger.warning("⚠️ No job cards found on results page.")
+            return []
+
+        # Cards are lazily rendered; scrolling the last one into view loads the rest of the page
+        await cards[-1].scroll_into_view_if_needed()
+        await self._random_sleep(500, 1200)
+
+        job_ids: List[str] = []
+        for card in await dom_utils.index_job_cards(self._page):
+            job_id = card["job_id"]
+            if not job_id or job_id in job_ids or self._is_processed_job(job_id):
+                continue
+            if self._is_known_job(job_id):
+                await self._skip_known_job(job_id)
+            else:
+                job_ids.append(job_id)
+
+        logger.info(f"Collected {len(job_ids)} new job IDs at offset {self._results_offset} ({self.jobs_skipped} known jobs skipped so far)")
+        return job_ids
+
+    async def scrape_concurrently(self) -> int:
+        """Page through results, scraping each page's new jobs across the worker pages before moving on."""
+        while self.jobs_scraped < self.search_config.num_jobs:
+            with self.metrics.span("collect_page_job_ids"):
+                job_ids = await self.collect_page_job_ids()
+            await self.scrape_job_views(job_ids[:self.search_config.num_jobs - self.jobs_scraped])
+            if self.jobs_scraped >= self.search_config.num_jobs or not await self._go_to_next_results_page():
+                break
+        return self.jobs_scraped
+
+    async def scrape_job_view(self, page: "Page", job_id: str) -> Optional[ScrapingResult]:
+        """Open a job's /jobs/view/ page on the given worker page and extract its details."""
+        job_url = self.base_url + JOB_VIEW_PATH.format(job_id=job_id)
+        with self.metrics.job(job_id, "view") as timing:
+            try:
+                with timing.step("goto"):
+                    await page.goto(job_url)
+                with timing.step("wait_ready"):
+                    ready = await dom_utils.wait_for_job_details(page, job_id, self.pacing.policy.ready_timeout_ms)
+                if not ready:
+                    self.metrics.count("details_not_ready")
+                    logger.warning(f"Job details did not render in time for URL: {job_url}")
+                with timing.step("human_scroll"):
+                    await self._human_scroll(page)
+
+                with timing.step("extract"):
+                    return await self.extract_job(job_id, job_url, job_url, page)
+
+            except Exception as e:
+                timing.ok = False
+                self.metrics.count("job_view_failed")
+                logger.error(f"Failed to process job view for URL: {job_url}: {e}")
+                return None
+
+    async def _job_view_worker(self, worker_id: int, queue: asyncio.Queue):
+        """Drain job IDs from the queue on a dedicated page with its own pacing."""
+        page = await self._page.context.new_page()
+        self._capture.attach(page)
+        if self._resource_blocker and (not self._owns_browser or self._from_daemon):
+            await self._resource_blocker.attach(page)  # Browsers we launched are routed for the whole context already
+        try:
+            while self.jobs_scraped < self.search_config.num_jobs:
+                try:
+                    job_id = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+
+                result = await self.scrape_job_view(page, job_id)
+                if await self._record_outcome(result, page) and self.jobs_scraped < self.search_config.num_jobs:
+                    await self._record_result(result, prefix=f"[page {worker_id}] ")
+
+                with self.metrics.span("page_delay"):
+                    await self._random_sleep(*self.page_delay_ms)
+        finally:
+            await page.close()
+
+    async def scrape_job_views(self, job_ids: List[str]) -> int:
+        """Scrape the given job IDs concurrently across up to `concurrency` worker pages."""
+        queue: asyncio.Queue = asyncio.Queue()
+        for job_id in job_ids:
+            queue.put_nowait(job_id)
+
+        num_workers = min(self.concurrency, len(job_ids))
+        logger.info(f"Scraping {len(job_ids)} jobs across {num_workers} worker pages...")
+        await asyncio.gather(*(self._job_view_worker(i, queue) for i in range(num_workers)))
+        return self.jobs_scraped
 
     def connect_db(self):
-        """Connect to the SQLite database."""
+        """Attach to the process-wide database for db_file; scrapers in one process share its writer."""
         try:
-            self._db_conn = sqlite3.connect(DB_FILE)
-            self._db_cursor = self._db_conn.cursor()
-            logger.info(f"Connected to database: {DB_FILE}")
+            self.db = db_utils.get_database(self.db_file)
+            logger.info(f"Connected to database: {self.db.path}")
         except sqlite3.Error as e:
             logger.error(f"Database connection error: {e}")
-            self._db_conn = None
-            self._db_cursor = None
+            raise
 
     def close_db(self):
-        """Close the database connection."""
-        if self._db_conn:
-            self._db_conn.close()
-            logger.info("Database connection closed.")
-
-    async def create_jobs_table(self):
-        """Create a new table for the scraped jobs, named with a timestamp."""
-        sanitized_title = self.search_config.title.replace(' ', '_').replace('/', '_').replace('\\', '_').replace('.', '')
-        sanitized_location = self.search_config.location.replace(' ', '_').replace('/', '_').replace('\\', '_').replace('.', '')
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        self.table_name = f"jobs_{sanitized_title}_{sanitized_location}_{timestamp}"
-        
-        create_table_sql = f"""
-        CREATE TABLE IF NOT EXISTS "{self.table_name}" (
-            job_id TEXT PRIMARY KEY, url TEXT, job_title TEXT, company_name TEXT,
-            job_description TEXT, scraped_date TEXT, scraped_timestamp TEXT
-        );"""
+        """Detach from the database. Its connections stay open for other scrapers and close at exit."""
+        self.db = None
+
+    def start_run(self):
+        """Record this scrape in the runs table (or pick up a checkpointed one); every job saved is linked to it."""
         try:
-            if self._db_cursor:
-                self._db_cursor.execute(create_table_sql)
-                self._db_conn.commit()
-                logger.info(f"Table '{self.table_name}' is ready.")
+            if self.resume:
+                with self.db.reader() as conn:
+                    checkpoint = db_utils.load_checkpoint(conn, self.search_config.title,
+                                                          self.search_config.location, self.search_config.time_filter)
+                if checkpoint:
+                    self.run_id = checkpoint["run_id"]
+                    self._results_offset = checkpoint["results_offset"]
+                    self.jobs_scraped = checkpoint["jobs_scraped"]
+                    # Jobs this run already handled are passed over even when skip_seen is off
+                    self._processed_job_ids = set(checkpoint["done_job_ids"])
+                    self.resumed = True
+                    logger.info(f"Resuming run {self.run_id} at offset {self._results_offset} "
+                                f"({self.jobs_scraped} jobs scraped, checkpoint from {checkpoint['updated_at']}).")
+                    return
+                logger.info("No checkpoint found for this search; starting a new run.")
+            with self.db.writer() as conn:
+                self.run_id = db_utils.start_run(conn, self.search_config.title,
+                                                 self.search_config.location, self.search_config.time_filter)
+            logger.info(f"Started run {self.run_id}.")
         except sqlite3.Error as e:
-            logger.error(f"Error creating table '{self.table_name}': {e}")
+            logger.error(f"Error starting run: {e}")
 
-    def save_results(self):
-        """Save the scraped results to the SQLite database in a single transaction."""
-        if not self._db_cursor:
-            logger.error("Database not connected. Cannot save results.")
+    def load_known_jobs(self):
+        """Load the IDs of jobs scraped by earlier runs (and still fresh) so they can be skipped before clicking."""
+        self._known_job_ids = set()
+        if not self.skip_seen:
             return
+        try:
+            with self.db.reader() as conn:
+                self._known_job_ids |= db_utils.load_seen_job_ids(conn, self.refetch_after_days)
+            logger.info(f"Loaded {len(self._known_job_ids)} known job IDs to skip.")
+        except sqlite3.Error as e:
+            logger.error(f"Error loading known job IDs: {e}")
 
-        scraped_date = datetime.now().strftime("%Y-%m-%d")
-        scraped_timestamp = datetime.now().strftime("%H:%M:%S")
-        
-        insert_sql = f"""INSERT OR IGNORE INTO "{self.table_name}" 
-                         (job_id, url, job_title, company_name, job_description, scraped_date, scraped_timestamp) 
-                         VALUES (?, ?, ?, ?, ?, ?, ?);"""
-        
-        jobs_to_insert = [
-            (job.job_id, job.url, job.job_title, job.company_name, job.job_description, scraped_date, scraped_timestamp)
-            for job in self.job_data
-        ]
-        
+    def finish_run(self):
         try:
-            self._db_cursor.executemany(insert_sql, jobs_to_insert)
-            self._db_conn.commit()
-            logger.info(f"✅ Saved {self._db_cursor.rowcount} new jobs to database table '{self.table_name}'.")
+            if self.run_id is not None:
+                with self.db.writer() as conn:
+                    db_utils.finish_run(conn, self.run_id)
         except sqlite3.Error as e:
-            logger.error(f"Error bulk saving jobs to database: {e}")
+            logger.error(f"Error finishing run {self.run_id}: {e}")
+
+    def save_results(self, conn: sqlite3.Connection, items: List[Union[ScrapingResult, str]]) -> int:
+        """
+        Upsert a batch of results and link them to this run. Plain job ID strings are known jobs
+        that were skipped; they only get a sighting. The latest RunCheckpoint in the batch is saved
+        with it, unless an earlier batch failed: resuming from it would skip the jobs that were lost.
+        Called on the writer's thread inside a transaction.
+        """
+        with self.metrics.span("save_results"):
+            db_utils.save_sightings(conn, self.run_id, [item for item in items if isinstance(item, str)])
+            saved = db_utils.save_jobs(conn, self.run_id, [item for item in items if isinstance(item, ScrapingResult)])
+            checkpoints = [item for item in items if isinstance(item, RunCheckpoint)]
+            if checkpoints and self._writer.failed:
+                logger.warning(f"Not saving the checkpoint: {self._writer.failed} results of this run were lost.")
+            elif checkpoints:
+                db_utils.save_checkpoint(conn, self.run_id, asdict(self.search_config),
+                                         checkpoints[-1].results_offset, checkpoints[-1].jobs_scraped)
+        logger.info(f"Saved {saved} new jobs to database for run {self.run_id}.")
+        return saved
 
     async def scrape(self):
         """Main method to perform the scraping process"""
         try:
-            await self.navigate_to_jobs_page()
-            await self.perform_search()
-            await self.apply_time_filter()
-            await self.scroll_job_list()
-            self.save_results()
+            if self.resumed and self.search_config.time_filter in TIME_FILTER_CODES:
+                with self.metrics.span("navigate_to_search_results"):
+                    await self.navigate_to_search_results()
+            else:
+                with self.metrics.span("navigate_to_jobs_page"):
+                    await self.navigate_to_jobs_page()
+                with self.metrics.span("perform_search"):
+                    await self.perform_search()
+                with self.metrics.span("apply_time_filter"):
+                    await self.apply_time_filter()
+                self._results_offset = 0  # Manual setup always lands on the first results page
+            with self.metrics.span("scrape_jobs"):
+                if self.concurrency > 1:
+                    await self.scrape_concurrently()
+                else:
+                    await self.scroll_job_list()
         except Exception as e:
             logger.error(f"An error occurred during scraping: {e}")
             raise
 
     # --- Anti-Detection Helper Methods ---
-    async def _random_sleep(self, min_ms: int = 800, max_ms: int = 2500):
-        """Sleep for a random duration to mimic human behavior."""
-        await asyncio.sleep(random.uniform(min_ms, max_ms) / 1000)
+    async def _random_sleep(self, min_ms: Optional[int] = None, max_ms: Optional[int] = None):
+        """Sleep for a random duration to mimic human behavior, scaled by the pacing controller."""
+        await self.pacing.sleep((min_ms, max_ms) if min_ms is not None else None)
 
-    async def _human_scroll(self):
+    async def _human_scroll(self, page: Optional["Page"] = None):
         """Simulate human-like scrolling on the page."""
-        for _ in range(random.randint(2, 5)):
-            await self._page.mouse.wheel(0, random.randint(200, 500))
-            await self._random_sleep(300, 800)
+        page = page or self._page
+        for _ in range(self.pacing.scroll_steps()):
+            await page.mouse.wheel(0, random.randint(200, 500))
+            await self.pacing.sleep(self.pacing.policy.scroll_pause_ms)
 
 async def main():
     # Example usage
@@ -1,14 +1,141 @@
+import asyncio
 import json
 import logging
-from playwright.async_api import async_playwright, Browser, BrowserContext, Page
-from browser_use import BrowserSession,BrowserProfile
-from browser_use import BrowserSession
+import socket
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, Iterable, Optional, Union
+from urllib.parse import urlparse
 import os
 
+if TYPE_CHECKING:  # playwright and browser_use are imported where a browser is actually started
+    from playwright.async_api import Browser, BrowserContext, Page, Playwright, Route
+
 logger = logging.getLogger(__name__)
 
-async def initialize_browser(cookie_file: str, headless: bool = False) -> tuple[Browser, BrowserContext, Page]:
+# Resource types the scraper never reads; stylesheets stay because visibility and scrolling depend on layout
+BLOCKED_RESOURCE_TYPES = ("image", "media", "font")
+# First-party hosts (and their subdomains) whose requests are let through in fast mode
+DEFAULT_ALLOWED_HOSTS = ("linkedin.com", "licdn.com")
+# First-party endpoints that are pure tracking
+BLOCKED_URL_PATTERNS = ("/li/track", "px.ads.linkedin.com", "/sensorCollect", "/realtime/")
+# Typical transfer size of a blocked request, by resource type. Blocked requests are never fetched,
+# so the bytes they save can only be estimated
+ESTIMATED_BYTES = {"image": 30_000, "media": 500_000, "font": 35_000, "script": 40_000, "stylesheet": 15_000,
+                   "xhr": 3_000, "fetch": 3_000}
+DEFAULT_ESTIMATED_BYTES = 2_000  # Beacons, pings and anything else
+
+
+@dataclass
+class ResourceStats:
+    """Request counts and transferred bytes for one page in fast mode"""
+    url: str = ""
+    allowed: int = 0
+    blocked: int = 0
+    blocked_by_type: Dict[str, int] = field(default_factory=dict)
+    bytes_loaded: int = 0           # From Content-Length of allowed responses
+    bytes_saved_estimate: int = 0   # From ESTIMATED_BYTES of blocked requests
+
+    def add(self, other: "ResourceStats"):
+        self.allowed += other.allowed
+        self.blocked += other.blocked
+        self.bytes_loaded += other.bytes_loaded
+        self.bytes_saved_estimate += other.bytes_saved_estimate
+        for kind, count in other.blocked_by_type.items():
+            self.blocked_by_type[kind] = self.blocked_by_type.get(kind, 0) + count
+
+    def summary(self) -> str:
+        by_type = ", ".join(f"{kind}={count}" for kind, count in sorted(self.blocked_by_type.items()))
+        return (f"{self.url}: {self.allowed} requests allowed ({self.bytes_loaded / 1024:.0f} KiB), "
+                f"{self.blocked} blocked (~{self.bytes_saved_estimate / 1024:.0f} KiB saved, estimated; {by_type})")
+
+
+class ResourceBlocker:
+    """
+    Lightweight mode for the browser layer: aborts requests for resource types the scraper
+    never uses and for any host outside the allowlist, and keeps per-page request stats.
+    A page's stats are logged and folded into the totals when it closes.
+    """
+
+    def __init__(self, allowed_hosts: Optional[Iterable[str]] = None,
+                 blocked_types: Iterable[str] = BLOCKED_RESOURCE_TYPES):
+        self.allowed_hosts = tuple(allowed_hosts or DEFAULT_ALLOWED_HOSTS)
+        self.blocked_types = set(blocked_types)
+        self.page_stats: Dict["Page", ResourceStats] = {}  # Open pages only
+        self._closed = ResourceStats(url="closed pages")
+
+    async def attach(self, target: Union["Page", "BrowserContext"]):
+        """Route every request of a page, or of every page in a context."""
+        from playwright.async_api import BrowserContext, Page
+        await target.route("**/*", self._handle)
+        pages = [target] if isinstance(target, Page) else target.pages
+        for page in pages:
+            self._watch(page)
+        if isinstance(target, BrowserContext):
+            target.on("page", self._watch)
+
+    def _watch(self, page: "Page"):
+        if page in self.page_stats:
+            return
+        self.page_stats[page] = ResourceStats(url=page.url)
+        page.on("response", lambda response: self._count_bytes(page, response))
+        page.on("close", self._unwatch)
+
+    def _unwatch(self, page: "Page"):
+        stats = self.page_stats.pop(page, None)
+        if stats:
+            logger.info(f"Fast mode: {stats.summary()}")
+            self._closed.add(stats)
+
+    def _stats(self, page: Optional["Page"]) -> ResourceStats:
+        if page is None:
+            return self.page_stats.setdefault(None, ResourceStats(url="(no page)"))
+        if page.is_closed():  # Late events of a closed page; don't re-add an entry nothing will remove
+            return self._closed
+        self._watch(page)
+        return self.page_stats[page]
+
+    def _count_bytes(self, page: "Page", response):
+        length = response.headers.get("content-length")
+        if length and length.isdigit():
+            self._stats(page).bytes_loaded += int(length)
+
+    def is_allowed(self, url: str, resource_type: str) -> bool:
+        if resource_type in self.blocked_types or any(pattern in url for pattern in BLOCKED_URL_PATTERNS):
+            return False
+        host = urlparse(url).hostname or ""
+        return any(host == allowed or host.endswith("." + allowed) for allowed in self.allowed_hosts)
+
+    async def _handle(self, route: "Route"):
+        request = route.request
+        try:
+            page = request.frame.page
+        except Exception:  # Service worker requests have no frame
+            page = None
+        stats = self._stats(page)
+        if page is not None and request.is_navigation_request() and request.frame == page.main_frame:
+            stats.url = request.url
+
+        if self.is_allowed(request.url, request.resource_type):
+            stats.allowed += 1
+            await route.continue_()
+        else:
+            stats.blocked += 1
+            stats.blocked_by_type[request.resource_type] = stats.blocked_by_type.get(request.resource_type, 0) + 1
+            stats.bytes_saved_estimate += ESTIMATED_BYTES.get(request.resource_type, DEFAULT_ESTIMATED_BYTES)
+            await route.abort()
+
+    def totals(self) -> ResourceStats:
+        total = ResourceStats(url="all pages")
+        total.add(self._closed)
+        for stats in self.page_stats.values():
+            total.add(stats)
+        return total
+
+
+async def initialize_browser(cookie_file: str, headless: bool = False,
+                             resource_blocker: Optional[ResourceBlocker] = None) -> tuple["Browser", "BrowserContext", "Page"]:
     """Initialize browser with cookies"""
+    from playwright.async_api import async_playwright
     playwright = await async_playwright().start()
     browser = await playwright.chromium.launch(
         headless=headless,
@@ -24,6 +151,8 @@ async def initialize_browser(cookie_file: str, headless: bool = False) -> tuple[
     except FileNotFoundError:
         logger.warning(f"Cookie file {cookie_file} not found. Proceeding without cookies.")
 
+    if resource_blocker:
+        await resource_blocker.attach(context)
     page = await context.new_page()
     return browser, context, page
 
@@ -33,6 +162,7 @@ async def manual_login_with_profile(profile_name: str, website_url: str):
     Launch a browser-use session with a given profile name and website URL,
     pause for manual login, and save credentials to the profile.
     """
+    from browser_use import BrowserSession
     user_data_dir = os.path.expanduser(f"~/.config/browseruse/profiles/{profile_name}")
     browser_session = BrowserSession(user_data_dir=user_data_dir)
     await browser_session.start()
@@ -44,14 +174,106 @@ async def manual_login_with_profile(profile_name: str, website_url: str):
     logger.info(f"Credentials for {website_url} saved to profile '{profile_name}' at {user_data_dir}")
 
 
-async def initialize_browser_with_profile(profile_name: str, headless: bool = False):
+async def initialize_browser_with_profile(profile_name: str, headless: bool = False,
+                                          resource_blocker: Optional[ResourceBlocker] = None):
     """
     Initialize a browser-use BrowserSession with a given profile.
+    Pass a ResourceBlocker to run every page of the session in fast mode.
     Returns (browser_session, page).
     """
+    from browser_use import BrowserProfile, BrowserSession
     user_data_dir = os.path.expanduser(f"~/.config/browseruse/profiles/{profile_name}")
     browser_profile = BrowserProfile(user_data_dir=user_data_dir)
     browser_session = BrowserSession(browser_profile=browser_profile, headless=headless)
     await browser_session.start()
     page = await browser_session.get_current_page()
+    if resource_blocker:
+        await resource_blocker.attach(page.context)
     return browser_session, page
+
+
+# --- Warm browser daemon (see browser_daemon.py) ---
+
+DAEMON_DIR = os.path.expanduser("~/.config/browseruse/daemon")  # One state file per profile served
+
+
+class DaemonUnavailable(RuntimeError):
+    """No warm browser is being served for the profile; callers launch their own instead."""
+
+
+def free_port() -> int:
+    """A free local TCP port, e.g. for --remote-debugging-port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def daemon_state_path(profile_name: str) -> str:
+    return os.path.join(DAEMON_DIR, f"{profile_name}.json")
+
+
+def read_daemon_state(profile_name: str) -> Optional[dict]:
+    """The daemon's published state for a profile, or None when no live daemon serves it."""
+    try:
+        with open(daemon_state_path(profile_name)) as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    try:
+        os.kill(state["pid"], 0)  # Left behind by a daemon that was killed?
+    except (KeyError, ProcessLookupError):
+        return None
+    except PermissionError:
+        pass
+    return state
+
+
+async def wait_for_daemon(profile_name: str, timeout: float = 30.0) -> dict:
+    """The daemon's state once it is ready, waiting out a context recycle; raises DaemonUnavailable."""
+    deadline = asyncio.get_running_loop().time() + timeout
+    while True:
+        state = read_daemon_state(profile_name)
+        if state is None:
+            raise DaemonUnavailable(f"No browser daemon is serving profile '{profile_name}'.")
+        if state.get("status") == "ready":
+            return state
+        if asyncio.get_running_loop().time() >= deadline:
+            raise DaemonUnavailable(f"Browser daemon for '{profile_name}' is still {state.get('status')} after {timeout:.0f}s.")
+        await asyncio.sleep(0.2)
+
+
+async def connect_to_daemon(profile_name: str, resource_blocker: Optional[ResourceBlocker] = None,
+                            timeout: float = 30.0) -> tuple["Playwright", "Browser", "BrowserContext", "Page"]:
+    """
+    Open a page in the daemon's warm, already authenticated context for a profile, over CDP.
+    The context is shared with other processes: close your pages when done, `browser.close()`
+    only disconnects, then `playwright.stop()` ends the driver started for the connection.
+    A ResourceBlocker is attached to the returned page, not the whole context.
+    Raises DaemonUnavailable when no daemon serves the profile, or when it cannot be used;
+    see `launch_instead_of_daemon` for when launching a browser on the profile is then safe.
+    """
+    from playwright.async_api import async_playwright
+    state = await wait_for_daemon(profile_name, timeout)
+    playwright = await async_playwright().start()
+    try:
+        browser = await playwright.chromium.connect_over_cdp(state["cdp_url"])
+    except Exception as e:
+        await playwright.stop()
+        raise DaemonUnavailable(f"Could not connect to the browser daemon at {state['cdp_url']}: {e}") from e
+    context = browser.contexts[0]  # The persistent profile context
+    page = await context.new_page()
+    if resource_blocker:
+        await resource_blocker.attach(page)
+    logger.info(f"Connected to the warm browser for profile '{profile_name}' at {state['cdp_url']}.")
+    return playwright, browser, context, page
+
+
+def launch_instead_of_daemon(profile_name: str, error: DaemonUnavailable):
+    """
+    After connect_to_daemon failed: re-raise while a daemon is still alive on the profile (draining,
+    recycling or unreachable), since it holds the user data dir and launching on it would fail or
+    corrupt it. Otherwise log that a browser is launched instead.
+    """
+    if read_daemon_state(profile_name) is not None:
+        raise error
+    logger.warning(f"{error} Launching a browser instead.")
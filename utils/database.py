@@ -0,0 +1,141 @@
+"""
+Shared SQLite connection layer for the scraper, the batch scheduler and the query client.
+
+Each database file gets one `Database` per process: a single writer connection guarded by
+a lock, and a small pool of read-only connections. All connections run in WAL mode with
+tuned pragmas, so queries never wait for a scrape's write transactions (and vice versa),
+and writers from other processes wait on busy_timeout instead of failing with
+"database is locked".
+"""
+import atexit
+import logging
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+DB_FILE = "linkedin_jobs.db"
+DB_PATH_ENV = "LINKEDIN_JOBS_DB"  # Overrides the default database path
+
+PRAGMAS = {
+    "journal_mode": "WAL",       # Readers and the writer do not block each other
+    "synchronous": "NORMAL",     # Safe with WAL; fsync at checkpoints instead of every commit
+    "busy_timeout": 10000,       # ms to wait for another process's write lock
+    "cache_size": -65536,        # 64 MiB page cache per connection
+    "mmap_size": 268435456,      # Read through a 256 MiB memory map instead of read() calls
+    "temp_store": "MEMORY",
+}
+CACHED_STATEMENTS = 256  # Prepared statements kept per connection, keyed by SQL text
+MAX_READERS = 4
+
+
+def resolve_path(db_file: Optional[str] = None) -> str:
+    """The explicit path, else $LINKEDIN_JOBS_DB, else linkedin_jobs.db in the working directory."""
+    return db_file or os.environ.get(DB_PATH_ENV) or DB_FILE
+
+
+def open_connection(path: str, read_only: bool = False,
+                    on_connect: Optional[Callable[[sqlite3.Connection], None]] = None) -> sqlite3.Connection:
+    """Open one tuned connection. check_same_thread is off: the pool hands connections across threads."""
+    conn = sqlite3.connect(path, cached_statements=CACHED_STATEMENTS, check_same_thread=False)
+    for pragma, value in PRAGMAS.items():
+        if read_only and pragma == "journal_mode":
+            continue  # WAL is persistent and set by the writer; changing journal mode needs a write
+        conn.execute(f"PRAGMA {pragma} = {value};")
+    if read_only:
+        conn.execute("PRAGMA query_only = ON;")
+    if on_connect:
+        on_connect(conn)
+    return conn
+
+
+class Database:
+    """One writer connection and a pool of reader connections for a database file."""
+
+    def __init__(self, path: str, on_connect: Optional[Callable[[sqlite3.Connection], None]] = None,
+                 on_create: Optional[Callable[[sqlite3.Connection], None]] = None, max_readers: int = MAX_READERS):
+        self.path = path
+        self.on_connect = on_connect  # Run on every connection (e.g. registering SQL functions)
+        self.max_readers = max_readers
+        self._write_lock = threading.RLock()
+        self._writer: Optional[sqlite3.Connection] = open_connection(path, on_connect=on_connect)
+        self._readers: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._reader_count = 0
+        self._reader_lock = threading.Lock()
+        if on_create:
+            with self.writer() as conn:
+                on_create(conn)  # Schema setup runs once, before any reader exists
+
+    @contextmanager
+    def writer(self) -> Iterator[sqlite3.Connection]:
+        """
+        The single writer connection, held exclusively until the block exits. Use `with conn:`
+        inside for a transaction; the lock is re-entrant within a thread.
+        """
+        with self._write_lock:
+            if self._writer is None:
+                raise sqlite3.ProgrammingError(f"Database {self.path} is closed.")
+            yield self._writer
+
+    @contextmanager
+    def reader(self) -> Iterator[sqlite3.Connection]:
+        """A read-only connection from the pool, opened on demand up to max_readers."""
+        conn = self._checkout()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            self._readers.put(conn)
+
+    def _checkout(self) -> sqlite3.Connection:
+        try:
+            return self._readers.get_nowait()
+        except queue.Empty:
+            pass
+        with self._reader_lock:
+            if self._reader_count < self.max_readers:
+                self._reader_count += 1
+                return open_connection(self.path, read_only=True, on_connect=self.on_connect)
+        return self._readers.get()
+
+    def close(self):
+        """Close the writer and every idle reader; readers still checked out are closed by their owners' GC."""
+        with self._write_lock:
+            while True:
+                try:
+                    self._readers.get_nowait().close()
+                except queue.Empty:
+                    break
+            self._reader_count = 0
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+
+_databases: Dict[str, Database] = {}
+_databases_lock = threading.Lock()
+
+
+def get_database(db_file: Optional[str] = None, **kwargs) -> Database:
+    """The process-wide Database for a file, created on first use; kwargs only apply then."""
+    path = os.path.abspath(resolve_path(db_file))
+    with _databases_lock:
+        if path not in _databases:
+            _databases[path] = Database(path, **kwargs)
+            logger.debug(f"Opened database {path}")
+        return _databases[path]
+
+
+def close_all():
+    with _databases_lock:
+        for database in _databases.values():
+            database.close()
+        _databases.clear()
+
+
+atexit.register(close_all)
@@ -1,39 +1,531 @@
+import json
+import re
 import sqlite3
 import logging
-from tabulate import tabulate
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Iterable, Iterator, List, Optional, Sequence, Set, TextIO
+from utils import database, description_store
 
 logger = logging.getLogger(__name__)
 
-DB_FILE = "linkedin_jobs.db"
-
-def list_tables():
-    conn = sqlite3.connect(DB_FILE)
-    cursor = conn.cursor()
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
-    tables = [row[0] for row in cursor.fetchall()]
-    conn.close()
-    return tables
-
-def query_table(table_name: str, limit: int = 5, truncate_desc: int = 80):
-    conn = sqlite3.connect(DB_FILE)
-    cursor = conn.cursor()
-    cursor.execute(f'SELECT * FROM "{table_name}" LIMIT ?;', (limit,))
-    rows = cursor.fetchall()
-    col_names = [desc[0] for desc in cursor.description]
-    # Truncate job_description if present
-    if "job_description" in col_names:
-        idx = col_names.index("job_description")
+DB_FILE = database.DB_FILE
+
+# One row per job posting, one row per scrape run, and a sighting linking each run to the jobs it saw.
+# sighting_id is AUTOINCREMENT so ids are never reused after a purge: exports use it as their cursor.
+# Descriptions live in the desc_chunks paragraph store (utils/description_store.py); a job keeps the
+# hashes of its paragraphs, and the jobs_text view reassembles the text.
+SCHEMA_SQL = description_store.CHUNKS_SCHEMA_SQL + """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY, url TEXT, job_title TEXT, company_name TEXT,
+    description_chunks BLOB, location TEXT, posted_at TEXT,
+    first_scraped TEXT, last_scraped TEXT
+);
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT, title TEXT, location TEXT, time_filter TEXT,
+    started_at TEXT, finished_at TEXT, legacy_table TEXT UNIQUE
+);
+CREATE TABLE IF NOT EXISTS sightings (
+    sighting_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id INTEGER NOT NULL REFERENCES runs(run_id), job_id TEXT NOT NULL REFERENCES jobs(job_id),
+    scraped_date TEXT, scraped_timestamp TEXT,
+    UNIQUE (run_id, job_id)
+);
+CREATE TABLE IF NOT EXISTS checkpoints (
+    run_id INTEGER PRIMARY KEY REFERENCES runs(run_id), search_config TEXT,
+    results_offset INTEGER, jobs_scraped INTEGER, updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_company ON jobs(company_name);
+CREATE INDEX IF NOT EXISTS idx_jobs_last_scraped ON jobs(last_scraped);
+CREATE INDEX IF NOT EXISTS idx_runs_search ON runs(title, location);
+CREATE INDEX IF NOT EXISTS idx_sightings_job ON sightings(job_id);
+CREATE INDEX IF NOT EXISTS idx_sightings_date ON sightings(scraped_date);
+"""
+
+# Jobs with their descriptions reassembled, for reading; needs the functions registered by connect()
+JOBS_VIEW_SQL = """
+CREATE VIEW IF NOT EXISTS jobs_text AS
+SELECT rowid AS job_rowid, job_id, url, job_title, company_name, job_description(description_chunks) AS job_description,
+       location, posted_at, first_scraped, last_scraped
+FROM jobs;
+"""
+
+JOB_COLUMNS = "job_id, url, job_title, company_name, job_description, location, posted_at, first_scraped, last_scraped"
+SIGHTING_COLUMNS = ("scraped_date", "scraped_timestamp")
+
+# A re-scrape only overwrites the fields it actually got, so a degraded page cannot blank a stored job
+UPSERT_JOB_SQL = """
+INSERT INTO jobs (job_id, url, job_title, company_name, description_chunks, location, posted_at, first_scraped, last_scraped)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(job_id) DO UPDATE SET
+    url = COALESCE(NULLIF(excluded.url, ''), jobs.url),
+    job_title = COALESCE(NULLIF(excluded.job_title, ''), jobs.job_title),
+    company_name = COALESCE(NULLIF(excluded.company_name, ''), jobs.company_name),
+    description_chunks = COALESCE(NULLIF(excluded.description_chunks, x''), jobs.description_chunks),
+    location = COALESCE(NULLIF(excluded.location, ''), jobs.location),
+    posted_at = COALESCE(NULLIF(excluded.posted_at, ''), jobs.posted_at),
+    last_scraped = excluded.last_scraped;
+"""
+
+# Full-text index over jobs, kept in sync by triggers so every writer (scraper, migration, purge) updates it.
+# External content: the index stores only the inverted lists, the text is read back through `jobs_text`.
+FTS_SCHEMA_SQL = """
+CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+    job_title, company_name, job_description,
+    content='jobs_text', content_rowid='job_rowid', tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS jobs_fts_insert AFTER INSERT ON jobs BEGIN
+    INSERT INTO jobs_fts (rowid, job_title, company_name, job_description)
+    VALUES (new.rowid, new.job_title, new.company_name, job_description(new.description_chunks));
+END;
+CREATE TRIGGER IF NOT EXISTS jobs_fts_delete AFTER DELETE ON jobs BEGIN
+    INSERT INTO jobs_fts (jobs_fts, rowid, job_title, company_name, job_description)
+    VALUES ('delete', old.rowid, old.job_title, old.company_name, job_description(old.description_chunks));
+END;
+CREATE TRIGGER IF NOT EXISTS jobs_fts_update AFTER UPDATE OF job_title, company_name, description_chunks ON jobs
+WHEN old.job_title IS NOT new.job_title OR old.company_name IS NOT new.company_name
+     OR old.description_chunks IS NOT new.description_chunks BEGIN
+    INSERT INTO jobs_fts (jobs_fts, rowid, job_title, company_name, job_description)
+    VALUES ('delete', old.rowid, old.job_title, old.company_name, job_description(old.description_chunks));
+    INSERT INTO jobs_fts (rowid, job_title, company_name, job_description)
+    VALUES (new.rowid, new.job_title, new.company_name, job_description(new.description_chunks));
+END;
+"""
+
+# bm25 column weights: a term in the title counts more than one in the company name or description
+SEARCH_WEIGHTS = (5.0, 2.0, 1.0)
+
+INSERT_SIGHTING_SQL = """INSERT OR IGNORE INTO sightings (run_id, job_id, scraped_date, scraped_timestamp)
+                         VALUES (?, ?, ?, ?);"""
+
+# Per-run tables written before the unified schema: jobs_{title}_{location}[_{YYYYmmdd}_{HHMMSS}]
+LEGACY_TABLE_PATTERN = re.compile(r"^jobs_(?P<search>.+?)(?:_(?P<date>\d{8})_(?P<time>\d{6}))?$")
+
+
+def get_database(db_file: Optional[str] = None) -> database.Database:
+    """The shared, pooled Database for db_file (default: $LINKEDIN_JOBS_DB or linkedin_jobs.db), schema ensured."""
+    return database.get_database(db_file, on_connect=description_store.register_functions, on_create=init_schema)
+
+
+def connect(db_file: Optional[str] = None) -> sqlite3.Connection:
+    """Open a standalone tuned connection with the unified schema, for one-off scripts; prefer get_database."""
+    conn = database.open_connection(database.resolve_path(db_file), on_connect=description_store.register_functions)
+    init_schema(conn)
+    return conn
+
+
+def init_schema(conn: sqlite3.Connection):
+    conn.executescript(SCHEMA_SQL)
+    if "sighting_id" not in {row[1] for row in conn.execute("PRAGMA table_info(sightings);")}:
+        _add_sighting_ids(conn)
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(jobs);")}
+    converted = "description_chunks" not in columns and _move_descriptions_to_store(conn)
+    conn.executescript(JOBS_VIEW_SQL)
+    has_index = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'jobs_fts';").fetchone()
+    try:
+        conn.executescript(FTS_SCHEMA_SQL)
+    except sqlite3.OperationalError as e:
+        logger.warning(f"Full-text search unavailable (SQLite built without FTS5?): {e}")
+    else:
+        if not has_index:
+            rebuild_search_index(conn)  # Index jobs stored before the index existed
+    if converted:
+        compact(conn)
+
+
+def _add_sighting_ids(conn: sqlite3.Connection):
+    """
+    One-time upgrade of a sightings table keyed by (run_id, job_id) to one with an AUTOINCREMENT id.
+    Plain rowids are reused once the highest ones are purged, which made exports skip new sightings.
+    Ids are the old rowids, so export positions recorded before the upgrade stay valid.
+    """
+    logger.info("Adding never-reused ids to the sightings table...")
+    with conn:
+        conn.execute("ALTER TABLE sightings RENAME TO sightings_old;")
+        conn.execute(SCHEMA_SQL[SCHEMA_SQL.index("CREATE TABLE IF NOT EXISTS sightings"):
+                                SCHEMA_SQL.index("CREATE TABLE IF NOT EXISTS checkpoints")])
+        conn.execute("""
+            INSERT INTO sightings (sighting_id, run_id, job_id, scraped_date, scraped_timestamp)
+            SELECT rowid, run_id, job_id, scraped_date, scraped_timestamp FROM sightings_old ORDER BY rowid;
+        """)
+        conn.execute("DROP TABLE sightings_old;")
+    conn.executescript(SCHEMA_SQL)  # Indexes on sightings went with the old table
+
+
+def _move_descriptions_to_store(conn: sqlite3.Connection, batch_size: int = 1000) -> bool:
+    """One-time upgrade of a jobs table with a raw job_description column to the paragraph store."""
+    logger.info("Moving job descriptions into the deduplicated paragraph store...")
+    with conn:
+        # The old index and triggers read jobs.job_description; they are recreated over jobs_text
+        for trigger in ("jobs_fts_insert", "jobs_fts_delete", "jobs_fts_update"):
+            conn.execute(f"DROP TRIGGER IF EXISTS {trigger};")
+        conn.execute("DROP TABLE IF EXISTS jobs_fts;")
+        conn.execute("ALTER TABLE jobs ADD COLUMN description_chunks BLOB;")
+        last_rowid = 0
+        while True:
+            rows = conn.execute("SELECT rowid, job_description FROM jobs WHERE rowid > ? ORDER BY rowid LIMIT ?;",
+                                (last_rowid, batch_size)).fetchall()
+            if not rows:
+                break
+            hash_lists = description_store.store_descriptions(conn, [description for _, description in rows])
+            conn.executemany("UPDATE jobs SET description_chunks = ? WHERE rowid = ?;",
+                             [(hash_list, rowid) for (rowid, _), hash_list in zip(rows, hash_lists)])
+            last_rowid = rows[-1][0]
+        try:
+            conn.execute("ALTER TABLE jobs DROP COLUMN job_description;")
+        except sqlite3.OperationalError:  # SQLite < 3.35: leave the column, emptied
+            conn.execute("UPDATE jobs SET job_description = NULL;")
+    return True
+
+
+def compact(conn: sqlite3.Connection):
+    """Drop paragraphs no job uses any more and give the freed pages back to the filesystem."""
+    with conn:
+        removed = description_store.delete_unreferenced_chunks(conn)
+    conn.execute("VACUUM;")
+    logger.info(f"Compacted database ({removed} unused description paragraphs removed).")
+
+
+def rebuild_search_index(conn: sqlite3.Connection):
+    """Re-index every job from the jobs table."""
+    with conn:
+        conn.execute("INSERT INTO jobs_fts (jobs_fts) VALUES ('rebuild');")
+
+
+def start_run(conn: sqlite3.Connection, title: str, location: str, time_filter: str) -> int:
+    """Record a new scrape run and return its run_id."""
+    with conn:
+        cursor = conn.execute(
+            "INSERT INTO runs (title, location, time_filter, started_at) VALUES (?, ?, ?, ?);",
+            (title, location, time_filter, datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+        )
+    return cursor.lastrowid
+
+
+def finish_run(conn: sqlite3.Connection, run_id: int):
+    """Mark the run finished; its checkpoint is no longer needed."""
+    with conn:
+        conn.execute("UPDATE runs SET finished_at = ? WHERE run_id = ?;",
+                     (datetime.now().strftime("%Y-%m-%d %H:%M:%S"), run_id))
+        conn.execute("DELETE FROM checkpoints WHERE run_id = ?;", (run_id,))
+
+
+def save_checkpoint(conn: sqlite3.Connection, run_id: int, search_config: dict,
+                    results_offset: int, jobs_scraped: int):
+    """Record how far a run got. Does not commit."""
+    conn.execute("""
+        INSERT INTO checkpoints (run_id, search_config, results_offset, jobs_scraped, updated_at)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(run_id) DO UPDATE SET
+            search_config = excluded.search_config, results_offset = excluded.results_offset,
+            jobs_scraped = excluded.jobs_scraped, updated_at = excluded.updated_at;
+    """, (run_id, json.dumps(search_config, sort_keys=True), results_offset, jobs_scraped,
+          datetime.now().strftime("%Y-%m-%d %H:%M:%S")))
+
+
+def load_checkpoint(conn: sqlite3.Connection, title: str, location: str, time_filter: str) -> Optional[dict]:
+    """
+    Find the latest unfinished run of the same search. The job IDs it already handled are
+    its sightings, which are written in the same transactions as the checkpoint.
+    """
+    row = conn.execute("""
+        SELECT c.run_id, c.results_offset, c.jobs_scraped, c.updated_at
+        FROM checkpoints c JOIN runs r ON r.run_id = c.run_id
+        WHERE r.finished_at IS NULL AND r.title = ? AND r.location = ? AND r.time_filter = ?
+        ORDER BY c.updated_at DESC LIMIT 1;
+    """, (title, location, time_filter)).fetchone()
+    if not row:
+        return None
+    run_id, results_offset, jobs_scraped, updated_at = row
+    done_job_ids = {job_id for (job_id,) in conn.execute("SELECT job_id FROM sightings WHERE run_id = ?;", (run_id,))}
+    return {"run_id": run_id, "results_offset": results_offset, "jobs_scraped": jobs_scraped,
+            "done_job_ids": done_job_ids, "updated_at": updated_at}
+
+
+def save_jobs(conn: sqlite3.Connection, run_id: int, jobs: Iterable) -> int:
+    """
+    Upsert scraped jobs (objects with ScrapingResult's attributes) and link them to the run.
+    Does not commit. Returns the number of jobs that were new to this run.
+    """
+    now = datetime.now()
+    scraped_date = now.strftime("%Y-%m-%d")
+    scraped_timestamp = now.strftime("%H:%M:%S")
+    scraped_at = f"{scraped_date} {scraped_timestamp}"
+
+    jobs = [job for job in jobs if job.job_id]
+    hash_lists = description_store.store_descriptions(conn, [job.job_description for job in jobs])
+    conn.executemany(UPSERT_JOB_SQL, [
+        (job.job_id, job.url, job.job_title, job.company_name, hash_list,
+         job.location, job.posted_at, scraped_at, scraped_at)
+        for job, hash_list in zip(jobs, hash_lists)
+    ])
+    cursor = conn.executemany(INSERT_SIGHTING_SQL, [
+        (run_id, job.job_id, scraped_date, scraped_timestamp) for job in jobs
+    ])
+    return cursor.rowcount
+
+
+def save_sightings(conn: sqlite3.Connection, run_id: int, job_ids: Iterable[str]):
+    """Link already-stored jobs to the run without touching their rows. Does not commit."""
+    now = datetime.now()
+    conn.executemany(INSERT_SIGHTING_SQL, [
+        (run_id, job_id, now.strftime("%Y-%m-%d"), now.strftime("%H:%M:%S")) for job_id in job_ids
+    ])
+
+
+def load_seen_job_ids(conn: sqlite3.Connection, refetch_after_days: Optional[float] = None) -> Set[str]:
+    """
+    Return the IDs of jobs already stored. With refetch_after_days, jobs last scraped
+    longer ago than that are left out so they get scraped again.
+    """
+    if refetch_after_days is None:
+        rows = conn.execute("SELECT job_id FROM jobs;")
+    else:
+        cutoff = (datetime.now() - timedelta(days=refetch_after_days)).strftime("%Y-%m-%d %H:%M:%S")
+        rows = conn.execute("SELECT job_id FROM jobs WHERE last_scraped >= ?;", (cutoff,))
+    return {row[0] for row in rows}
+
+
+def migrate_legacy_tables(conn: sqlite3.Connection, drop: bool = False) -> int:
+    """
+    One-shot import of the old per-run jobs_* tables into jobs/runs/sightings.
+    Each legacy table becomes one run; tables already imported are skipped.
+    Returns the number of tables imported.
+    """
+    init_schema(conn)
+    legacy_tables = [
+        row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type='table' AND name LIKE 'jobs\\_%' ESCAPE '\\' ORDER BY name;"
+        )
+    ]
+    imported = 0
+    for table in legacy_tables:
+        match = LEGACY_TABLE_PATTERN.match(table)
+        columns = {row[1] for row in conn.execute(f'PRAGMA table_info("{table}");')}
+        if not match or "job_id" not in columns:
+            continue
+        if conn.execute("SELECT 1 FROM runs WHERE legacy_table = ?;", (table,)).fetchone():
+            logger.info(f"Table '{table}' was already migrated, skipping.")
+            continue
+
+        # Title and location were both joined with underscores, so the split between them is not recoverable
+        search = match.group("search").replace("_", " ")
+        select = lambda column: f'"{column}"' if column in columns else "''"
+
+        if match.group("date"):
+            started_at = datetime.strptime(match.group("date") + match.group("time"), "%Y%m%d%H%M%S").strftime("%Y-%m-%d %H:%M:%S")
+        else:
+            started_at = conn.execute(
+                f"""SELECT MIN({select('scraped_date')} || ' ' || {select('scraped_timestamp')}) FROM "{table}";"""
+            ).fetchone()[0]
+
+        with conn:
+            run_id = conn.execute(
+                "INSERT INTO runs (title, location, time_filter, started_at, finished_at, legacy_table) VALUES (?, '', '', ?, ?, ?);",
+                (search, started_at, started_at, table)
+            ).lastrowid
+            # Store the paragraphs first; the insert below then only needs each description's hash list
+            description_store.store_descriptions(conn, (
+                description for (description,) in conn.execute(f'SELECT {select("job_description")} FROM "{table}";')
+            ))
+            conn.execute(f"""
+                INSERT INTO jobs (job_id, url, job_title, company_name, description_chunks, location, posted_at, first_scraped, last_scraped)
+                SELECT job_id, {select('url')}, {select('job_title')}, {select('company_name')}, description_hashes({select('job_description')}),
+                       {select('location')}, {select('posted_at')},
+                       {select('scraped_date')} || ' ' || {select('scraped_timestamp')},
+                       {select('scraped_date')} || ' ' || {select('scraped_timestamp')}
+                FROM "{table}" WHERE job_id IS NOT NULL AND job_id != ''
+                ON CONFLICT(job_id) DO UPDATE SET
+                    first_scraped = MIN(jobs.first_scraped, excluded.first_scraped),
+                    last_scraped = MAX(jobs.last_scraped, excluded.last_scraped);
+            """)
+            conn.execute(f"""
+                INSERT OR IGNORE INTO sightings (run_id, job_id, scraped_date, scraped_timestamp)
+                SELECT ?, job_id, {select('scraped_date')}, {select('scraped_timestamp')}
+                FROM "{table}" WHERE job_id IS NOT NULL AND job_id != '';
+            """, (run_id,))
+            if drop:
+                conn.execute(f'DROP TABLE "{table}";')
+        imported += 1
+        logger.info(f"Migrated table '{table}' into run {run_id}.")
+    return imported
+
+
+def _quote_terms(query: str) -> str:
+    """Turn free text into an FTS5 query of quoted terms, so punctuation like 'C++' or 'full-time' is not syntax."""
+    return " ".join('"{}"'.format(term.replace('"', '""')) for term in query.split())
+
+
+def search_jobs(conn: sqlite3.Connection, query: str, company: Optional[str] = None, since: Optional[str] = None,
+                until: Optional[str] = None, run_id: Optional[int] = None, limit: int = 20,
+                highlight: tuple = ("[", "]"), snippet_tokens: int = 16) -> List[dict]:
+    """
+    Rank jobs matching an FTS5 query (e.g. `kubernetes remote`, `"product manager" NOT senior`) by bm25.
+    Filters: company name substring, scrape date range (YYYY-MM-DD, inclusive) and run.
+    Free text that is not valid FTS5 syntax is searched as plain terms.
+    """
+    conditions, params = [], []
+    if company:
+        conditions.append("j.company_name LIKE ?")
+        params.append(f"%{company}%")
+    sighting_conditions = []
+    if run_id is not None:
+        sighting_conditions.append("s.run_id = ?")
+        params.append(run_id)
+    if since:
+        sighting_conditions.append("s.scraped_date >= ?")
+        params.append(since)
+    if until:
+        sighting_conditions.append("s.scraped_date <= ?")
+        params.append(until)
+    if sighting_conditions:
+        conditions.append("EXISTS (SELECT 1 FROM sightings s WHERE s.job_id = j.job_id AND "
+                          + " AND ".join(sighting_conditions) + ")")
+
+    sql = f"""
+        SELECT j.job_id, j.job_title, j.company_name, j.location, j.last_scraped,
+               bm25(jobs_fts, {', '.join(str(weight) for weight in SEARCH_WEIGHTS)}) AS score,
+               snippet(jobs_fts, 2, ?, ?, '…', ?) AS snippet
+        FROM jobs_fts JOIN jobs j ON j.rowid = jobs_fts.rowid
+        WHERE jobs_fts MATCH ? {''.join(' AND ' + condition for condition in conditions)}
+        ORDER BY score LIMIT ?;
+    """
+    try:
+        cursor = conn.execute(sql, (*highlight, snippet_tokens, query, *params, limit))
+    except sqlite3.OperationalError:
+        if _quote_terms(query) == query:
+            raise
+        cursor = conn.execute(sql, (*highlight, snippet_tokens, _quote_terms(query), *params, limit))
+    columns = [desc[0] for desc in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def list_runs(db_file: Optional[str] = None) -> List[tuple]:
+    with get_database(db_file).reader() as conn:
+        return conn.execute("""
+            SELECT r.run_id, r.title, r.location, r.time_filter, r.started_at, COUNT(s.job_id)
+            FROM runs r LEFT JOIN sightings s ON s.run_id = r.run_id
+            GROUP BY r.run_id ORDER BY r.run_id;
+        """).fetchall()
+
+
+def query_columns(run_id: Optional[int] = None, columns: Optional[Sequence[str]] = None) -> List[str]:
+    """Validate a column projection for iter_jobs; all columns when none are given."""
+    available = JOB_COLUMNS.split(", ") + (list(SIGHTING_COLUMNS) if run_id is not None else [])
+    columns = list(columns or available)
+    unknown = [column for column in columns if column not in available]
+    if unknown:
+        raise ValueError(f"Unknown column(s) {', '.join(unknown)}; choose from {', '.join(available)}")
+    return columns
+
+
+def iter_jobs(conn: sqlite3.Connection, run_id: Optional[int] = None, columns: Optional[Sequence[str]] = None,
+              after: Optional[str] = None, limit: Optional[int] = None, chunk_size: int = 500) -> Iterator[tuple]:
+    """
+    Stream the jobs seen by a run (ordered by job_id) or all jobs (most recently scraped first),
+    `chunk_size` rows at a time. Only the projected columns are read, so leaving out
+    job_description skips reassembling descriptions entirely. `after` is the last job_id of
+    the previous page (keyset pagination: no OFFSET scan, stable while new jobs arrive).
+    """
+    columns = query_columns(run_id, columns)
+    select = ", ".join(f"s.{column}" if column in SIGHTING_COLUMNS else f"j.{column}" for column in columns)
+    if run_id is None:
+        sql, params = f"SELECT {select} FROM jobs_text j", []
+        if after:
+            sql += " WHERE (j.last_scraped, j.job_id) < (SELECT last_scraped, job_id FROM jobs WHERE job_id = ?)"
+            params.append(after)
+        sql += " ORDER BY j.last_scraped DESC, j.job_id DESC"
+    else:
+        sql = f"SELECT {select} FROM sightings s JOIN jobs_text j ON j.job_id = s.job_id WHERE s.run_id = ?"
+        params = [run_id]
+        if after:
+            sql += " AND s.job_id > ?"
+            params.append(after)
+        sql += " ORDER BY s.job_id"
+    if limit:
+        sql += " LIMIT ?"
+        params.append(limit)
+
+    cursor = conn.execute(sql + ";", params)
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            break
+        yield from rows
+
+
+def _tsv_field(value) -> str:
+    if value is None:
+        return ""
+    return str(value).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+
+def write_rows(rows: Iterable[tuple], columns: List[str], fmt: str = "table", out: TextIO = sys.stdout,
+               truncate_desc: Optional[int] = 80, flush_every: int = 500):
+    """
+    Write rows as a table (buffered, for small results), or as TSV / NDJSON one line per row,
+    flushed every `flush_every` rows so output starts immediately and memory stays flat.
+    """
+    if fmt == "table":
+        from tabulate import tabulate  # Only table output needs it; keeps CLI startup fast
         rows = [list(row) for row in rows]
-        for row in rows:
-            if row[idx] and len(row[idx]) > truncate_desc:
-                row[idx] = row[idx][:truncate_desc] + "..."
-    print(tabulate(rows, headers=col_names, tablefmt="fancy_grid"))
-    conn.close()
-
-def purge_table(table_name: str):
-    conn = sqlite3.connect(DB_FILE)
-    cursor = conn.cursor()
-    cursor.execute(f'DROP TABLE IF EXISTS "{table_name}";')
-    conn.commit()
-    conn.close()
-    logger.info(f"Table '{table_name}' has been purged (dropped).") 
\ No newline at end of file
+        if "job_description" in columns and truncate_desc:
+            idx = columns.index("job_description")
+            for row in rows:
+                if row[idx] and len(row[idx]) > truncate_desc:
+                    row[idx] = row[idx][:truncate_desc] + "..."
+        print(tabulate(rows, headers=columns, tablefmt="fancy_grid"), file=out)
+        return
+
+    if fmt == "tsv":
+        out.write("\t".join(columns) + "\n")
+        format_row = lambda row: "\t".join(_tsv_field(value) for value in row)
+    elif fmt == "ndjson":
+        format_row = lambda row: json.dumps(dict(zip(columns, row)), ensure_ascii=False)
+    else:
+        raise ValueError(f"Unknown output format '{fmt}'")
+    for count, row in enumerate(rows, 1):
+        out.write(format_row(row) + "\n")
+        if count % flush_every == 0:
+            out.flush()
+    out.flush()
+
+
+def query_run(run_id: Optional[int] = None, limit: Optional[int] = 5, truncate_desc: Optional[int] = 80,
+              db_file: Optional[str] = None, columns: Optional[Sequence[str]] = None, after: Optional[str] = None,
+              fmt: str = "table", out: TextIO = sys.stdout):
+    """Print the jobs seen by a run (or the most recently scraped jobs overall when run_id is None)."""
+    columns = query_columns(run_id, columns)
+    with get_database(db_file).reader() as conn:
+        write_rows(iter_jobs(conn, run_id, columns, after=after, limit=limit), columns, fmt, out, truncate_desc)
+
+
+def search(query: str, limit: int = 20, db_file: Optional[str] = None, **filters):
+    """Print ranked search results with the matching part of each description highlighted."""
+    from tabulate import tabulate
+    with get_database(db_file).reader() as conn:
+        started = time.perf_counter()
+        results = search_jobs(conn, query, limit=limit, **filters)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+    rows = [(f"{-r['score']:.3g}", r["job_id"], r["job_title"], r["company_name"], r["location"],
+             r["last_scraped"], r["snippet"]) for r in results]
+    print(tabulate(rows, headers=["score", "job_id", "job_title", "company_name", "location", "last_scraped", "snippet"],
+                   tablefmt="fancy_grid"))
+    print(f"{len(results)} results in {elapsed_ms:.1f} ms")
+
+
+def purge_run(run_id: int, db_file: Optional[str] = None):
+    """Delete a run and its sightings, plus any jobs no other run has seen."""
+    with get_database(db_file).writer() as conn, conn:
+        conn.execute("DELETE FROM sightings WHERE run_id = ?;", (run_id,))
+        conn.execute("DELETE FROM checkpoints WHERE run_id = ?;", (run_id,))
+        conn.execute("DELETE FROM runs WHERE run_id = ?;", (run_id,))
+        conn.execute("DELETE FROM jobs WHERE job_id NOT IN (SELECT job_id FROM sightings);")
+        description_store.delete_unreferenced_chunks(conn)
+    logger.info(f"Run {run_id} has been purged.")
+
+
+def migrate(drop: bool = False, db_file: Optional[str] = None) -> int:
+    with get_database(db_file).writer() as conn:
+        return migrate_legacy_tables(conn, drop=drop)
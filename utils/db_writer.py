@@ -0,0 +1,142 @@
+import asyncio
+import logging
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional
+
+from utils.database import Database
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()  # Queue sentinel telling the writer task to flush and exit
+
+
+class JobWriter:
+    """
+    Streams scraped results to SQLite from a dedicated writer task.
+
+    Results are queued with `put` and written by `write_batch(conn, batch)` in one
+    transaction whenever `batch_size` results are pending or `flush_interval` seconds
+    have passed since the oldest pending result. Only items for which `is_result` is true
+    count as results; others (e.g. progress markers) ride along in the next batch. All SQLite calls run on a single
+    worker thread, so the event loop never blocks on executemany/commit. Batches go
+    through the database's single writer connection, held only for the transaction.
+
+    A batch that fails to write is logged and dropped; the task keeps going, and `failed`
+    tells write_batch that later progress markers would cover lost results. At most
+    `max_queued` results wait in the queue, so `put` applies backpressure when writes
+    fall behind. If the task itself dies, `put` and `close` raise its error.
+    """
+
+    def __init__(self, database: Database, write_batch: Callable[[sqlite3.Connection, List[Any]], int],
+                 batch_size: int = 25, flush_interval: float = 2.0, max_queued: int = 1000,
+                 is_result: Callable[[Any], bool] = lambda item: True):
+        self.database = database
+        self.write_batch = write_batch
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.is_result = is_result
+        self.saved = 0            # Rows reported as written by write_batch
+        self.write_seconds = 0.0  # Time spent inside write transactions, on the writer thread
+        self.batches = 0
+        self.failed = 0           # Results in batches that could not be written
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queued)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="job-writer")
+        self._task: Optional[asyncio.Task] = None
+
+    async def _call(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    async def start(self):
+        """Start the background task."""
+        self._task = asyncio.create_task(self._run())
+
+    async def put(self, item: Any):
+        """Queue a result for writing. The caller should drop its own reference afterwards."""
+        await self._enqueue(item, self._task)
+
+    async def _enqueue(self, item: Any, task: Optional[asyncio.Task]):
+        if task is None:  # Not started yet
+            await self._queue.put(item)
+            return
+        if task.done():
+            self._raise_if_dead(task)
+        if not self._queue.full():
+            self._queue.put_nowait(item)
+            return
+        # Wait for room, but not on a queue that a dead task will never drain
+        put = asyncio.ensure_future(self._queue.put(item))
+        await asyncio.wait({put, task}, return_when=asyncio.FIRST_COMPLETED)
+        if not put.done():
+            put.cancel()
+            self._raise_if_dead(task)
+
+    @staticmethod
+    def _raise_if_dead(task: asyncio.Task):
+        if task.cancelled():
+            raise RuntimeError("The database writer task was cancelled")
+        if not task.exception():
+            raise RuntimeError("The database writer has been closed")
+        raise RuntimeError("The database writer task died") from task.exception()
+
+    async def close(self):
+        """Flush everything still queued, then stop the task. Raises if the task died."""
+        if not self._task:
+            return
+        task, self._task = self._task, None
+        try:
+            await self._enqueue(_STOP, task)
+            await task
+        finally:
+            self._executor.shutdown(wait=True)
+        if self.failed:
+            logger.error(f"Writer could not save {self.failed} results; see the errors above.")
+        logger.info(f"✅ Writer saved {self.saved} new jobs to database.")
+
+    async def _flush(self, batch: List[Any]):
+        try:
+            self.saved += await self._call(self._write, batch)
+        except Exception as e:  # Keep writing later batches whatever went wrong with this one
+            results = sum(map(self.is_result, batch))
+            self.failed += results
+            logger.error(f"Error saving batch of {results} jobs to database: {e!r}")
+
+    def _write(self, batch: List[Any]) -> int:
+        with self.database.writer() as conn:
+            started = time.perf_counter()
+            try:
+                with conn:  # Commits the batch as one transaction, rolls back on error
+                    return self.write_batch(conn, batch)
+            finally:
+                self.write_seconds += time.perf_counter() - started
+                self.batches += 1
+
+    async def _run(self):
+        batch: List[Any] = []
+        batch_started = 0.0
+        pending = 0  # Results in batch
+
+        while True:
+            timeout = None
+            if batch:
+                timeout = max(0.0, batch_started + self.flush_interval - time.monotonic())
+            try:
+                item = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                item = None
+
+            if item is _STOP:
+                break
+            if item is not None:
+                if not batch:
+                    batch_started = time.monotonic()
+                batch.append(item)
+                pending += self.is_result(item)
+
+            if batch and (pending >= self.batch_size or time.monotonic() - batch_started >= self.flush_interval):
+                await self._flush(batch)
+                batch, pending = [], 0
+
+        if batch:
+            await self._flush(batch)
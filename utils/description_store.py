@@ -0,0 +1,153 @@
+"""
+Content-addressed storage for job descriptions.
+
+A description is split into its paragraphs (the scraper joins `<p>` texts with newlines),
+each paragraph is stored once in `desc_chunks` keyed by its hash and compressed, and a job
+keeps only the concatenated hashes of its paragraphs. Boilerplate shared by thousands of
+postings (EEO statements, benefits) is therefore stored a single time.
+"""
+import hashlib
+import logging
+import sqlite3
+import zlib
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+
+try:
+    import zstandard
+except ImportError:  # zlib is always available; zstd is used when installed
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+HASH_SIZE = 16  # bytes of blake2b digest per paragraph
+ZSTD_LEVEL = 3
+ZLIB_LEVEL = 9
+CACHE_SIZE = 4096  # Decoded paragraphs kept per connection; boilerplate paragraphs stay hot
+
+CHUNKS_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS desc_chunks (
+    hash BLOB PRIMARY KEY, codec TEXT NOT NULL, data BLOB NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+def split_description(description: str) -> List[str]:
+    """Paragraphs of a description; joining them with newlines gives the description back exactly."""
+    return description.split("\n")
+
+
+def chunk_hash(text: str) -> bytes:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=HASH_SIZE).digest()
+
+
+def description_hashes(description: Optional[str]) -> Optional[bytes]:
+    """The value stored in jobs.description_chunks: the paragraph hashes, concatenated."""
+    if description is None:
+        return None
+    if description == "":
+        return b""
+    return b"".join(chunk_hash(paragraph) for paragraph in split_description(description))
+
+
+def compress(text: str) -> tuple:
+    """Return (codec, data), keeping the raw bytes when compression would not make them smaller."""
+    raw = text.encode("utf-8")
+    if zstandard is not None:
+        codec, data = "zstd", zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(raw)
+    else:
+        codec, data = "zlib", zlib.compress(raw, ZLIB_LEVEL)
+    return (codec, data) if len(data) < len(raw) else ("raw", raw)
+
+
+def decompress(codec: str, data: bytes) -> str:
+    if codec == "raw":
+        return bytes(data).decode("utf-8")
+    if codec == "zlib":
+        return zlib.decompress(data).decode("utf-8")
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("This database has zstd-compressed descriptions; install the 'zstandard' package to read them.")
+        return zstandard.ZstdDecompressor().decompress(data).decode("utf-8")
+    raise ValueError(f"Unknown description codec '{codec}'")
+
+
+def store_descriptions(conn: sqlite3.Connection, descriptions: Iterable[Optional[str]]) -> List[Optional[bytes]]:
+    """
+    Store the paragraphs of each description that are not stored yet and return each
+    description's hash list, in order. Does not commit.
+    """
+    hash_lists: List[Optional[bytes]] = []
+    pending: Dict[bytes, str] = {}
+    for description in descriptions:
+        hash_lists.append(description_hashes(description))
+        if description:
+            for paragraph in split_description(description):
+                pending.setdefault(chunk_hash(paragraph), paragraph)
+
+    # Only compress paragraphs the store has not seen; most boilerplate is already there
+    hashes = list(pending)
+    for start in range(0, len(hashes), 500):
+        batch = hashes[start:start + 500]
+        placeholders = ", ".join("?" * len(batch))
+        for (known,) in conn.execute(f"SELECT hash FROM desc_chunks WHERE hash IN ({placeholders});", batch):
+            pending.pop(bytes(known), None)
+    conn.executemany("INSERT OR IGNORE INTO desc_chunks (hash, codec, data) VALUES (?, ?, ?);",
+                     [(digest, *compress(text)) for digest, text in pending.items()])
+    return hash_lists
+
+
+class DescriptionReader:
+    """Reassembles descriptions from hash lists, with an LRU cache of decoded paragraphs."""
+
+    def __init__(self, conn: sqlite3.Connection, cache_size: int = CACHE_SIZE):
+        self.conn = conn
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[bytes, str]" = OrderedDict()
+
+    def paragraph(self, digest: bytes) -> str:
+        text = self._cache.get(digest)
+        if text is not None:
+            self._cache.move_to_end(digest)
+            return text
+        row = self.conn.execute("SELECT codec, data FROM desc_chunks WHERE hash = ?;", (digest,)).fetchone()
+        if row is None:
+            logger.warning(f"Description chunk {digest.hex()} is missing from desc_chunks.")
+            return ""
+        text = decompress(*row)
+        self._cache[digest] = text
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return text
+
+    def description(self, hash_list: Optional[bytes]) -> Optional[str]:
+        if hash_list is None:
+            return None
+        hash_list = bytes(hash_list)
+        return "\n".join(self.paragraph(hash_list[i:i + HASH_SIZE]) for i in range(0, len(hash_list), HASH_SIZE))
+
+
+def register_functions(conn: sqlite3.Connection):
+    """
+    Register job_description(description_chunks) on the connection. The jobs_text view and the
+    full-text index triggers call it, so every connection writing jobs must be opened via db_utils.connect.
+    """
+    reader = DescriptionReader(conn)
+    conn.create_function("job_description", 1, reader.description, deterministic=True)
+    conn.create_function("description_hashes", 1, description_hashes, deterministic=True)
+
+
+def referenced_hashes(conn: sqlite3.Connection) -> set:
+    referenced = set()
+    for (hash_list,) in conn.execute("SELECT description_chunks FROM jobs WHERE description_chunks IS NOT NULL;"):
+        hash_list = bytes(hash_list)
+        referenced.update(hash_list[i:i + HASH_SIZE] for i in range(0, len(hash_list), HASH_SIZE))
+    return referenced
+
+
+def delete_unreferenced_chunks(conn: sqlite3.Connection) -> int:
+    """Drop paragraphs no job refers to any more (e.g. after a purge). Does not commit."""
+    referenced = referenced_hashes(conn)
+    orphans = [(digest,) for (digest,) in conn.execute("SELECT hash FROM desc_chunks;") if bytes(digest) not in referenced]
+    conn.executemany("DELETE FROM desc_chunks WHERE hash = ?;", orphans)
+    return len(orphans)
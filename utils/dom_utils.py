@@ -0,0 +1,120 @@
+import logging
+from typing import TYPE_CHECKING, Dict, List
+
+if TYPE_CHECKING:
+    from playwright.async_api import Page
+
+logger = logging.getLogger(__name__)
+
+# Reads the whole job details pane (search results detail pane or /jobs/view/ page) in one round-trip.
+JOB_DETAILS_SCRIPT = """
+() => {
+    const text = (el) => (el && el.textContent || '').replace(/\\s+/g, ' ').trim();
+
+    const url = window.location.href;
+    const idMatch = url.match(/currentJobId=(\\d+)/) || url.match(/\\/jobs\\/view\\/(\\d+)/);
+
+    const titleContainer = document.querySelector("div[class*='job-details-jobs-unified-top-card__job-title']");
+    const titleNode = titleContainer && (titleContainer.querySelector('a') || titleContainer.querySelector('h1'));
+    const paneLink = titleContainer && titleContainer.querySelector("a[href*='/jobs/view/']");
+    const paneMatch = paneLink && paneLink.href.match(/\/jobs\/view\/(\d+)/);
+    const companyNode = document.querySelector("div[class*='p-card__company-name'] a");
+
+    const heading = Array.from(document.querySelectorAll('h2')).find(h => text(h) === 'About the job');
+    let container = heading ? heading.nextElementSibling : null;
+    while (container && container.tagName !== 'DIV') {
+        container = container.nextElementSibling;
+    }
+    const paragraphs = container
+        ? Array.from(container.querySelectorAll('p')).map(p => p.textContent).filter(t => t)
+        : [];
+
+    const metadata = [];
+    document.querySelectorAll(
+        "div[class*='job-details-jobs-unified-top-card__primary-description'], " +
+        "div[class*='job-details-jobs-unified-top-card__tertiary-description']"
+    ).forEach(el => {
+        text(el).split('·').map(t => t.trim()).filter(t => t).forEach(t => metadata.push(t));
+    });
+
+    return {
+        job_id: idMatch ? idMatch[1] : '',
+        pane_job_id: paneMatch ? paneMatch[1] : '',  // The job the pane actually shows, when its title links to it
+        url: url,
+        job_title: text(titleNode),
+        company_name: text(companyNode),
+        paragraphs: paragraphs,
+        metadata: metadata,
+        found: {
+            title_container: !!titleContainer,
+            heading: !!heading,
+            description_container: !!container,
+        },
+    };
+}
+"""
+
+# Indexes every card currently rendered in the results list pane in one round-trip.
+JOB_CARDS_SCRIPT = """
+() => {
+    const text = (el) => (el && el.textContent || '').replace(/\\s+/g, ' ').trim();
+    return Array.from(document.querySelectorAll('li.scaffold-layout__list-item')).map(card => {
+        const idNode = card.matches('[data-occludable-job-id]') ? card : card.querySelector('[data-job-id]');
+        const titleNode = card.querySelector("a[class*='job-card-container__link'] strong, a[class*='job-card-list__title'], a[class*='job-card-container__link']");
+        const companyNode = card.querySelector("[class*='artdeco-entity-lockup__subtitle'], [class*='job-card-container__primary-description']");
+        return {
+            job_id: idNode ? (idNode.getAttribute('data-occludable-job-id') || idNode.getAttribute('data-job-id') || '') : '',
+            job_title: text(titleNode),
+            company_name: text(companyNode),
+        };
+    });
+}
+"""
+
+
+# True once the details pane shows the given job (or any job when no ID is given) with its description heading.
+# The URL changes on click before the pane re-renders, so the pane itself must show the job: its title links
+# to /jobs/view/<jobId>, or, when the title has no link, a description heading rendered after the click.
+JOB_READY_SCRIPT = """
+(jobId) => {
+    if (jobId && !window.location.href.includes(jobId)) return false;
+    const headings = Array.from(document.querySelectorAll('h2')).filter(h => h.textContent.trim() === 'About the job');
+    if (!headings.length) return false;
+    const link = document.querySelector("div[class*='job-details-jobs-unified-top-card__job-title'] a[href*='/jobs/view/']");
+    if (link) return !jobId || link.href.includes('/jobs/view/' + jobId + '/') || link.href.endsWith('/jobs/view/' + jobId);
+    return headings.some(h => !h.hasAttribute('data-scraper-stale'));
+}
+"""
+
+# Tags the description heading currently shown, so readiness can tell it from the next job's.
+MARK_STALE_SCRIPT = """
+() => document.querySelectorAll('h2').forEach(h => h.setAttribute('data-scraper-stale', ''))
+"""
+
+
+async def mark_job_details_stale(page: "Page"):
+    """Call before switching jobs in the details pane; see JOB_READY_SCRIPT."""
+    await page.evaluate(MARK_STALE_SCRIPT)
+
+
+async def wait_for_job_details(page: "Page", job_id: str = "", timeout_ms: int = 8000) -> bool:
+    """Wait until the job's details have rendered instead of sleeping a fixed time. Returns False on timeout."""
+    try:
+        await page.wait_for_function(JOB_READY_SCRIPT, arg=job_id or "", timeout=timeout_ms)
+        return True
+    except Exception as e:
+        logger.debug(f"Job details for '{job_id}' not ready after {timeout_ms} ms: {e}")
+        return False
+
+
+async def extract_job_record(page: "Page") -> Dict:
+    """
+    Read the job currently shown on the page as a single JSON object:
+    job_id, url, job_title, company_name, paragraphs, metadata and which containers were found.
+    """
+    return await page.evaluate(JOB_DETAILS_SCRIPT)
+
+
+async def index_job_cards(page: "Page") -> List[Dict[str, str]]:
+    """Return job_id, job_title and company_name for every rendered list card, in list order."""
+    return await page.evaluate(JOB_CARDS_SCRIPT)
@@ -0,0 +1,151 @@
+"""
+Incremental columnar export of scraped jobs to Parquet or Arrow IPC files.
+
+Each export writes only the sightings added since the previous export to the same target,
+as hive-partitioned files: <out_dir>/scraped_date=YYYY-MM-DD/search=<title | location>/part-*.parquet.
+Company, title and location columns are dictionary-encoded, and analytics can
+memory-map the files (Arrow IPC is written uncompressed for exactly that) and scan them
+with pyarrow.dataset, DuckDB or pandas instead of going through sqlite3 cursors.
+
+    import pyarrow.dataset as ds
+    jobs = ds.dataset("exports/jobs", format="parquet", partitioning="hive").to_table()
+"""
+import logging
+import os
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Tuple
+from urllib.parse import quote
+
+from utils.database import Database
+
+logger = logging.getLogger(__name__)
+
+FORMATS = {"parquet": ".parquet", "arrow": ".arrow"}
+ROWS_PER_FILE = 100000  # Per partition; bounds memory on a first full export
+FETCH_SIZE = 5000
+
+# last_sighting_rowid holds a sightings.sighting_id (the name predates that column; the values carried over)
+EXPORTS_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS exports (
+    target TEXT PRIMARY KEY, format TEXT, last_sighting_rowid INTEGER NOT NULL DEFAULT 0,
+    rows_exported INTEGER NOT NULL DEFAULT 0, exported_at TEXT
+);
+"""
+
+# Sightings are the unit of export: one row per job per run that saw it, with the job's current fields
+EXPORT_SQL = """
+SELECT s.sighting_id, s.scraped_date, r.title || ' | ' || r.location AS search,
+       s.job_id, s.run_id, s.scraped_timestamp, j.url, j.job_title, j.company_name, j.location,
+       j.posted_at, j.first_scraped, j.last_scraped, j.job_description
+FROM sightings s
+JOIN jobs_text j ON j.job_id = s.job_id
+JOIN runs r ON r.run_id = s.run_id
+WHERE s.sighting_id > ?
+ORDER BY s.sighting_id;
+"""
+FILE_COLUMNS = ("job_id", "run_id", "scraped_timestamp", "url", "job_title", "company_name", "location",
+                "posted_at", "first_scraped", "last_scraped", "job_description")
+DICTIONARY_COLUMNS = ("job_title", "company_name", "location")
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.feather
+        import pyarrow.parquet
+    except ImportError as e:
+        raise RuntimeError("Columnar export needs pyarrow: pip install pyarrow") from e
+    return pyarrow
+
+
+def _file_schema(pa):
+    dictionary_string = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema([
+        (column, dictionary_string if column in DICTIONARY_COLUMNS else pa.int64() if column == "run_id" else pa.string())
+        for column in FILE_COLUMNS
+    ])
+
+
+def _write_partition(pa, out_dir: str, fmt: str, partition: Tuple[str, str], rows: List[tuple], part_name: str) -> str:
+    """Write one partition's buffered rows to a new file; returns its path."""
+    scraped_date, search = partition
+    directory = os.path.join(out_dir, f"scraped_date={scraped_date or 'unknown'}", f"search={quote(search or '', safe='')}")
+    os.makedirs(directory, exist_ok=True)
+
+    schema = _file_schema(pa)
+    arrays = []
+    for index, field in enumerate(schema):
+        values = [row[index] for row in rows]
+        if pa.types.is_dictionary(field.type):
+            arrays.append(pa.array(values, pa.string()).dictionary_encode())
+        else:
+            arrays.append(pa.array(values, field.type))
+    table = pa.Table.from_arrays(arrays, schema=schema)
+
+    path = os.path.join(directory, part_name + FORMATS[fmt])
+    tmp_path = path + ".tmp"
+    if fmt == "parquet":
+        pa.parquet.write_table(table, tmp_path, compression="zstd", use_dictionary=list(DICTIONARY_COLUMNS))
+    else:
+        # Uncompressed IPC so readers can memory-map it with zero copies
+        pa.feather.write_feather(table, tmp_path, compression="uncompressed")
+    os.replace(tmp_path, path)
+    return path
+
+
+def export_jobs(db: Database, out_dir: str, fmt: str = "parquet", rows_per_file: int = ROWS_PER_FILE) -> Dict:
+    """
+    Export the sightings added since the last export to out_dir; the first export to a directory
+    writes everything. Rows are scanned on a pooled reader, so scrapes keep writing meanwhile.
+    The export position, a sighting_id (never reused, even after a purge), is recorded in the
+    `exports` table only after every file is written, so an interrupted export is redone, over the
+    same file names, next time.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format '{fmt}'; choose from {', '.join(FORMATS)}")
+    pa = _import_pyarrow()
+    target = os.path.abspath(out_dir)
+    with db.writer() as conn, conn:
+        conn.executescript(EXPORTS_SCHEMA_SQL)
+        row = conn.execute("SELECT last_sighting_rowid, format FROM exports WHERE target = ?;", (target,)).fetchone()
+    if row and row[1] != fmt:
+        raise ValueError(f"{target} already holds {row[1]} files; export {fmt} to another directory")
+    since_rowid = row[0] if row else 0
+
+    buffers: Dict[Tuple[str, str], List[tuple]] = defaultdict(list)
+    part_counts: Dict[Tuple[str, str], int] = defaultdict(int)
+    files: List[str] = []
+    exported, last_rowid = 0, since_rowid
+
+    def flush(partition):
+        # Named after the export's starting position, so redoing an interrupted export overwrites its files
+        part_counts[partition] += 1
+        part_name = f"part-{since_rowid + 1:012d}-{part_counts[partition]:04d}"
+        files.append(_write_partition(pa, out_dir, fmt, partition, buffers.pop(partition), part_name))
+
+    with db.reader() as conn:
+        cursor = conn.execute(EXPORT_SQL, (since_rowid,))
+        while True:
+            rows = cursor.fetchmany(FETCH_SIZE)
+            if not rows:
+                break
+            for rowid, scraped_date, search, *fields in rows:
+                partition = (scraped_date, search)
+                buffers[partition].append(tuple(fields))
+                if len(buffers[partition]) >= rows_per_file:
+                    flush(partition)
+            exported += len(rows)
+            last_rowid = rows[-1][0]
+    for partition in list(buffers):
+        flush(partition)
+
+    with db.writer() as conn, conn:
+        conn.execute("""
+            INSERT INTO exports (target, format, last_sighting_rowid, rows_exported, exported_at) VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(target) DO UPDATE SET
+                format = excluded.format, last_sighting_rowid = excluded.last_sighting_rowid,
+                rows_exported = exports.rows_exported + excluded.rows_exported, exported_at = excluded.exported_at;
+        """, (target, fmt, last_rowid, exported, datetime.now().strftime("%Y-%m-%d %H:%M:%S")))
+    logger.info(f"Exported {exported} new sightings to {len(files)} {fmt} files under {target}.")
+    return {"rows": exported, "files": files, "last_sighting_rowid": last_rowid}
@@ -0,0 +1,171 @@
+import json
+import logging
+import os
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+METRIC_PREFIX = "linkedin_scraper"
+
+
+@dataclass
+class SpanStats:
+    """Aggregate of every timed occurrence of one phase"""
+    count: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    def add(self, seconds: float):
+        self.count += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+
+
+@dataclass
+class JobTiming:
+    """Step-by-step timing of a single job, from card click (or page load) to extracted record"""
+    job_id: str
+    mode: str                       # "card" (search results pane) or "view" (/jobs/view/ page)
+    steps: Dict[str, float] = field(default_factory=dict)
+    seconds: float = 0.0
+    ok: bool = True
+    _metrics: Optional["RunMetrics"] = field(default=None, repr=False)
+
+    @contextmanager
+    def step(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self.steps[name] = self.steps.get(name, 0.0) + elapsed
+            self._metrics.record_span(f"job.{name}", elapsed)
+
+    def as_dict(self) -> Dict:
+        return {"job_id": self.job_id, "mode": self.mode, "ok": self.ok, "seconds": round(self.seconds, 4),
+                "steps": {name: round(seconds, 4) for name, seconds in self.steps.items()}}
+
+
+class RunMetrics:
+    """
+    Lightweight per-run instrumentation: timing spans per phase, event counters and
+    per-job step timings. Everything is plain perf_counter arithmetic, so it stays on
+    in production; export with `write_json` and `write_prometheus` when the run ends.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+        self.spans: Dict[str, SpanStats] = {}
+        self.counters: Counter = Counter()
+        self.jobs: List[JobTiming] = []
+        self.sleep_seconds = 0.0  # Deliberate pacing pauses, filled in from the pacing controller
+        self.labels: Dict[str, str] = {}
+
+    def record_span(self, name: str, seconds: float):
+        self.spans.setdefault(name, SpanStats()).add(seconds)
+
+    @contextmanager
+    def span(self, name: str):
+        """Time a phase; repeated phases accumulate into the same SpanStats."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_span(name, time.perf_counter() - started)
+
+    def count(self, event: str, amount: int = 1):
+        self.counters[event] += amount
+
+    @contextmanager
+    def job(self, job_id: Optional[str], mode: str):
+        """Time one job; the yielded JobTiming times its steps and can be relabelled once the ID is known."""
+        timing = JobTiming(job_id=job_id or "", mode=mode, _metrics=self)
+        started = time.perf_counter()
+        try:
+            yield timing
+        except Exception:
+            timing.ok = False
+            raise
+        finally:
+            timing.seconds = time.perf_counter() - started
+            self.record_span(f"job.{mode}", timing.seconds)
+            self.jobs.append(timing)
+
+    def finish(self, sleep_seconds: float = 0.0):
+        self.finished = time.perf_counter()
+        self.sleep_seconds = sleep_seconds
+
+    @property
+    def wall_seconds(self) -> float:
+        return (self.finished or time.perf_counter()) - self.started
+
+    def job_seconds(self, percentile: float) -> float:
+        """Nearest-rank percentile of per-job durations, in seconds."""
+        durations = sorted(job.seconds for job in self.jobs)
+        if not durations:
+            return 0.0
+        return durations[min(len(durations) - 1, int(round(percentile / 100 * (len(durations) - 1))))]
+
+    def summary(self) -> Dict:
+        return {
+            "labels": self.labels,
+            "wall_seconds": round(self.wall_seconds, 3),
+            # Summed over all worker pages, so it can exceed wall time in concurrent mode
+            "sleep_seconds": round(self.sleep_seconds, 3),
+            "phases": {name: {"count": stats.count, "total_seconds": round(stats.total_seconds, 4),
+                              "max_seconds": round(stats.max_seconds, 4)}
+                       for name, stats in sorted(self.spans.items())},
+            "counters": dict(sorted(self.counters.items())),
+            "job_seconds_p50": round(self.job_seconds(50), 4),
+            "job_seconds_p95": round(self.job_seconds(95), 4),
+            "jobs": [job.as_dict() for job in self.jobs],
+        }
+
+    def write_json(self, path: str):
+        with open(path, "w") as f:
+            json.dump(self.summary(), f, indent=2)
+
+    def prometheus_text(self) -> str:
+        """Render the run in the Prometheus text exposition format (for the node_exporter textfile collector)."""
+        base_labels = "".join(f',{key}="{_escape(value)}"' for key, value in sorted(self.labels.items()))
+        lines = [
+            f"# HELP {METRIC_PREFIX}_phase_seconds_total Time spent in each scraper phase.",
+            f"# TYPE {METRIC_PREFIX}_phase_seconds_total counter",
+        ]
+        lines += [f'{METRIC_PREFIX}_phase_seconds_total{{phase="{name}"{base_labels}}} {stats.total_seconds:.6f}'
+                  for name, stats in sorted(self.spans.items())]
+        lines += [f"# HELP {METRIC_PREFIX}_phase_count_total Times each scraper phase ran.",
+                  f"# TYPE {METRIC_PREFIX}_phase_count_total counter"]
+        lines += [f'{METRIC_PREFIX}_phase_count_total{{phase="{name}"{base_labels}}} {stats.count}'
+                  for name, stats in sorted(self.spans.items())]
+        lines += [f"# HELP {METRIC_PREFIX}_events_total Failures, missing fields and other notable events.",
+                  f"# TYPE {METRIC_PREFIX}_events_total counter"]
+        lines += [f'{METRIC_PREFIX}_events_total{{event="{event}"{base_labels}}} {amount}'
+                  for event, amount in sorted(self.counters.items())]
+        lines += [f"# HELP {METRIC_PREFIX}_job_seconds Per-job scrape duration.",
+                  f"# TYPE {METRIC_PREFIX}_job_seconds summary"]
+        for quantile in (0.5, 0.95):
+            lines.append(f'{METRIC_PREFIX}_job_seconds{{quantile="{quantile}"{base_labels}}} {self.job_seconds(quantile * 100):.6f}')
+        lines.append(f"{METRIC_PREFIX}_job_seconds_sum{{{base_labels[1:]}}} {sum(job.seconds for job in self.jobs):.6f}")
+        lines.append(f"{METRIC_PREFIX}_job_seconds_count{{{base_labels[1:]}}} {len(self.jobs)}")
+        for name, value, help_text in (("wall_seconds", self.wall_seconds, "Wall-clock duration of the run."),
+                                       ("sleep_seconds", self.sleep_seconds, "Time spent in deliberate pacing pauses.")):
+            lines += [f"# HELP {METRIC_PREFIX}_{name} {help_text}", f"# TYPE {METRIC_PREFIX}_{name} gauge",
+                      f"{METRIC_PREFIX}_{name}{{{base_labels[1:]}}} {value:.6f}"]
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str):
+        # Write then rename, so a collector never reads a half-written file
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(self.prometheus_text())
+        os.replace(tmp_path, path)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -0,0 +1,174 @@
+import asyncio
+import logging
+import re
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Dict, Set
+
+if TYPE_CHECKING:
+    from playwright.async_api import Page, Request, Response
+
+logger = logging.getLogger(__name__)
+
+# Job posting URNs as they appear in Voyager payloads, e.g. "urn:li:fsd_jobPosting:4254612043"
+JOB_POSTING_URN = re.compile(r"urn:li:(?:fsd_jobPosting|fs_normalized_jobPosting|fs_jobPosting|jobPosting):(\d+)")
+COMPANY_URN = re.compile(r"urn:li:(?:fsd_company|fs_normalized_company|fs_miniCompany|company):\d+")
+MAX_RECORDS = 500  # Captured jobs kept at once; results pages list 25, so a few pages' worth
+
+
+def _walk(node: Any):
+    """Yield every dict nested anywhere inside a JSON payload."""
+    if isinstance(node, dict):
+        yield node
+        for value in node.values():
+            yield from _walk(value)
+    elif isinstance(node, list):
+        for item in node:
+            yield from _walk(item)
+
+
+def _text(value: Any) -> str:
+    """Voyager stores rich text either as a plain string or as {"text": ...}."""
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, dict) and isinstance(value.get("text"), str):
+        return value["text"].strip()
+    return ""
+
+
+def _company_name(posting: dict, entities: Dict[str, dict]) -> str:
+    """Resolve the company name from inline company details or a referenced company entity."""
+    if isinstance(posting.get("companyName"), str):
+        return posting["companyName"].strip()
+
+    for node in _walk(posting.get("companyDetails") or posting.get("company") or {}):
+        if isinstance(node.get("name"), str) and node.get("name"):
+            return node["name"].strip()
+        for key, value in node.items():
+            if key.startswith("*") and isinstance(value, str) and COMPANY_URN.match(value):
+                name = entities.get(value, {}).get("name")
+                if isinstance(name, str) and name:
+                    return name.strip()
+    return ""
+
+
+def parse_job_postings(payload: Any) -> Dict[str, Dict[str, str]]:
+    """
+    Extract job posting records from a Voyager API JSON payload.
+    Returns {job_id: {field: value}} with only the fields that were present in the payload.
+    """
+    entities: Dict[str, dict] = {}
+    for node in _walk(payload):
+        urn = node.get("entityUrn")
+        if isinstance(urn, str):
+            entities.setdefault(urn, {}).update(node)
+
+    records: Dict[str, Dict[str, str]] = {}
+    for urn, entity in entities.items():
+        match = JOB_POSTING_URN.fullmatch(urn)
+        if not match:
+            continue
+
+        record: Dict[str, str] = {}
+        title = _text(entity.get("title"))
+        if title:
+            record["job_title"] = title
+        company_name = _company_name(entity, entities)
+        if company_name:
+            record["company_name"] = company_name
+        description = _text(entity.get("description")) or _text(entity.get("descriptionText"))
+        if description:
+            record["job_description"] = description
+        location = _text(entity.get("formattedLocation"))
+        if location:
+            record["location"] = location
+        listed_at = entity.get("listedAt") or entity.get("originalListedAt")
+        if isinstance(listed_at, (int, float)):
+            record["posted_at"] = datetime.fromtimestamp(listed_at / 1000, tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+        if record:
+            records.setdefault(match.group(1), {}).update(record)
+    return records
+
+
+class JobPayloadCapture:
+    """
+    Listens to a page's network responses and keeps the job posting records
+    found in LinkedIn's Voyager API payloads, keyed by job ID. Records are dropped when
+    handed over or discarded, and the least recently updated ones once max_records are kept,
+    since payloads also carry jobs the scraper never opens. Job API requests still in flight
+    are tracked, so a wait for a record ends as soon as none is left that could bring it.
+    """
+
+    def __init__(self, max_records: int = MAX_RECORDS):
+        self.max_records = max_records
+        self._records: "OrderedDict[str, Dict[str, str]]" = OrderedDict()
+        self._ready: Dict[str, asyncio.Event] = {}
+        self._in_flight: Set["Request"] = set()  # Job API requests not yet answered and parsed
+
+    def attach(self, page: "Page"):
+        """Start capturing job payloads from the given page's responses."""
+        page.on("request", self._on_request)
+        page.on("requestfailed", self._request_done)
+        page.on("response", self._on_response)
+
+    @staticmethod
+    def _is_job_api(url: str) -> bool:
+        return "/voyager/api/" in url and "job" in url.lower()
+
+    def _on_request(self, request: "Request"):
+        if self._is_job_api(request.url):
+            self._in_flight.add(request)
+
+    def _request_done(self, request: "Request"):
+        self._in_flight.discard(request)
+        if not self._in_flight:
+            for event in self._ready.values():  # Nothing left could complete a waited-for record
+                event.set()
+
+    async def _on_response(self, response: "Response"):
+        url = response.url
+        if not self._is_job_api(url):
+            return
+        try:
+            if "json" in response.headers.get("content-type", ""):
+                self._add_payload(await response.json())
+        except Exception as e:
+            logger.debug(f"Could not decode job payload from {url}: {e}")
+        finally:
+            self._request_done(response.request)
+
+    def _add_payload(self, payload: Any):
+        for job_id, record in parse_job_postings(payload).items():
+            self._records.setdefault(job_id, {}).update(record)
+            self._records.move_to_end(job_id)
+            if job_id in self._ready and self.is_complete(job_id):  # Events exist only for jobs being waited for
+                self._ready[job_id].set()
+        while len(self._records) > self.max_records:
+            self._records.popitem(last=False)
+
+    def _event(self, job_id: str) -> asyncio.Event:
+        return self._ready.setdefault(job_id, asyncio.Event())
+
+    def is_complete(self, job_id: str) -> bool:
+        record = self._records.get(job_id, {})
+        return bool(record.get("job_title") and record.get("job_description"))
+
+    async def wait_for(self, job_id: str, timeout_ms: int = 1000) -> Dict[str, str]:
+        """
+        Wait up to timeout_ms for a complete record (title + description) for job_id, then
+        hand it over and forget it. Returns at once, with whatever partial record was captured,
+        when no job API request is in flight, and likewise when one is still missing at timeout.
+        """
+        if not self.is_complete(job_id) and self._in_flight:
+            try:
+                await asyncio.wait_for(self._event(job_id).wait(), timeout_ms / 1000)
+            except asyncio.TimeoutError:
+                pass
+        self._ready.pop(job_id, None)
+        return self._records.pop(job_id, {})
+
+    def discard(self, job_id: str):
+        """Forget a job that will not be waited for, e.g. one skipped as already scraped."""
+        self._ready.pop(job_id, None)
+        self._records.pop(job_id, None)
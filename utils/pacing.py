@@ -0,0 +1,96 @@
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Tuple
+
+if TYPE_CHECKING:
+    from playwright.async_api import Page
+
+logger = logging.getLogger(__name__)
+
+# URL fragments LinkedIn redirects to when it wants to verify or log out a session
+BLOCK_URL_MARKERS = ("/checkpoint/", "/authwall", "/uas/login", "/login", "captcha")
+
+
+@dataclass
+class PacingPolicy:
+    """Jitter distributions (ms, uniform) for each kind of pause, and how far adaptation may stretch them"""
+    default_ms: Tuple[int, int] = (800, 2500)
+    before_click_ms: Tuple[int, int] = (500, 1200)
+    after_ready_ms: Tuple[int, int] = (300, 900)    # Once the job details are on screen
+    scroll_steps: Tuple[int, int] = (2, 5)
+    scroll_pause_ms: Tuple[int, int] = (300, 800)
+    results_page_ms: Tuple[int, int] = (2000, 4000)
+    block_cooldown_ms: Tuple[int, int] = (30000, 60000)
+    ready_timeout_ms: int = 8000
+    payload_timeout_ms: int = 1000  # Longest wait for a job's API payload while a job request is in flight
+    min_scale: float = 0.5
+    max_scale: float = 4.0
+    window: int = 20              # Outcomes considered when computing the error rate
+    max_error_rate: float = 0.15  # Above this, slow down
+
+
+class PacingController:
+    """
+    Scales every pause of a PacingPolicy by a factor that adapts to observed outcomes:
+    it grows when errors, captchas or login redirects show up and shrinks slowly
+    while jobs keep succeeding.
+    """
+
+    def __init__(self, policy: PacingPolicy = None):
+        self.policy = policy or PacingPolicy()
+        self.scale = 1.0
+        self.slept_seconds = 0.0  # Total time spent in deliberate pauses
+        self._outcomes = deque(maxlen=self.policy.window)
+
+    async def sleep(self, bounds_ms: Tuple[int, int] = None):
+        """Sleep for a jittered duration drawn from bounds_ms and scaled by the current factor."""
+        min_ms, max_ms = bounds_ms or self.policy.default_ms
+        seconds = random.uniform(min_ms, max_ms) * self.scale / 1000
+        self.slept_seconds += seconds
+        await asyncio.sleep(seconds)
+
+    async def wait(self, page: "Page", ms: int):
+        """A fixed page.wait_for_timeout (e.g. letting a page settle), counted with the pauses above."""
+        started = time.perf_counter()
+        try:
+            await page.wait_for_timeout(ms)
+        finally:
+            self.slept_seconds += time.perf_counter() - started
+
+    def scroll_steps(self) -> int:
+        return random.randint(*self.policy.scroll_steps)
+
+    @property
+    def error_rate(self) -> float:
+        return self._outcomes.count(False) / len(self._outcomes) if self._outcomes else 0.0
+
+    def _set_scale(self, scale: float, reason: str):
+        scale = min(self.policy.max_scale, max(self.policy.min_scale, scale))
+        if abs(scale - self.scale) >= 0.05:
+            logger.info(f"Pacing scale {self.scale:.2f} -> {scale:.2f} ({reason})")
+        self.scale = scale
+
+    def record_success(self):
+        self._outcomes.append(True)
+        # Tighten slowly, and only after a full clean window
+        if len(self._outcomes) == self._outcomes.maxlen and self.error_rate == 0:
+            self._set_scale(self.scale * 0.95, "no errors in window")
+
+    def record_error(self):
+        self._outcomes.append(False)
+        if self.error_rate > self.policy.max_error_rate:
+            self._set_scale(self.scale * 1.25, f"error rate {self.error_rate:.0%}")
+
+    def is_blocked(self, url: str) -> bool:
+        return any(marker in url for marker in BLOCK_URL_MARKERS)
+
+    async def record_block(self, url: str):
+        """A captcha or login redirect: back off hard and cool down before continuing."""
+        self._outcomes.append(False)
+        self._set_scale(self.scale * 2, f"blocked at {url}")
+        logger.warning(f"⚠️ LinkedIn challenge detected at {url}; cooling down.")
+        await self.sleep(self.policy.block_cooldown_ms)
@@ -0,0 +1,245 @@
+"""
+Offline relevance scoring of scraped jobs against the resume, and the application queue it feeds.
+
+Jobs are tokenized once, into a sparse job x term count matrix (titles counted TITLE_WEIGHT times),
+and scored against the parsed resume with BM25 in a single sparse matrix-vector product. The resume
+plays the query: each of its terms is weighted by 1 + log(tf) and the term's IDF over the scraped
+corpus. Scores go to the `job_scores` table together with the resume terms that contributed most.
+
+Scoring is incremental. Document frequencies are kept in `score_terms`, and each run tokenizes only
+jobs that were never scored or were re-scraped since. Everything is rescored when the resume changes,
+or when the corpus has grown by RESCORE_GROWTH since the last full pass, so scores stay comparable.
+
+    python query_client.py score resumes/my_resume.pdf
+    python query_client.py queue --limit 20 --format urls
+"""
+import json
+import logging
+import math
+import re
+from collections import Counter
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+
+from utils.database import Database
+
+if TYPE_CHECKING:
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+K1 = 1.2
+B = 0.75
+TITLE_WEIGHT = 3       # A term in the job title counts as this many occurrences in the description
+RESCORE_GROWTH = 0.2   # Rescore everything once the corpus is this much larger than at the last full pass
+TOP_TERMS = 6          # Contributing resume terms kept per job, to show why it ranks where it does
+FETCH_SIZE = 2000
+
+SCORES_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS job_scores (
+    job_id TEXT PRIMARY KEY, score REAL NOT NULL, terms TEXT, scored_at TEXT,
+    status TEXT, applied_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_job_scores_score ON job_scores(score);
+CREATE TABLE IF NOT EXISTS score_terms (term TEXT PRIMARY KEY, df INTEGER NOT NULL) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS score_state (name TEXT PRIMARY KEY, value TEXT);
+"""
+
+# Jobs to (re)score: never scored, or re-scraped since they were scored
+PENDING_SQL = """
+SELECT j.job_id, j.job_title, j.job_description, s.job_id IS NOT NULL AS scored
+FROM jobs_text j LEFT JOIN job_scores s ON s.job_id = j.job_id
+WHERE s.job_id IS NULL OR j.last_scraped > s.scored_at;
+"""
+ALL_SQL = "SELECT job_id, job_title, job_description, 0 AS scored FROM jobs_text;"
+
+QUEUE_SQL = """
+SELECT s.job_id, j.url, j.job_title, j.company_name, j.location, s.score, s.terms
+FROM job_scores s JOIN jobs j ON j.job_id = s.job_id
+WHERE s.status IS NULL AND s.score >= ? {filters}
+ORDER BY s.score DESC
+LIMIT ?;
+"""
+
+TOKEN = re.compile(r"[a-z][a-z0-9+#]+(?:\.[a-z0-9]+)*")  # Two characters or more; keeps c++, c#, node.js, asp.net
+STOPWORDS = frozenset("""
+a about above after all also an and any are as at be been being both but by can could did do does doing during each
+etc few for from further had has have having he her here hers him his how i if in into is it its itself just may
+me more most must my no nor not of off on once only or other our ours out over own per same she should so some such
+than that the their theirs them then there these they this those through to too under until up us very via was we
+were what when where which while who whom why will with within without would you your yours
+jan feb mar apr jun jul aug sep sept oct nov dec january february march april june july august september october
+november december present current
+""".split())
+
+
+def term_counts(text: Optional[str]) -> Counter:
+    counts = Counter(TOKEN.findall((text or "").lower()))
+    for stopword in STOPWORDS & counts.keys():
+        del counts[stopword]
+    return counts
+
+
+def _import_numeric():
+    try:
+        import numpy
+        import scipy.sparse
+    except ImportError as e:
+        raise RuntimeError("Job scoring needs numpy and scipy: pip install numpy scipy") from e
+    return numpy, scipy.sparse
+
+
+def _load_state(conn) -> Dict[str, str]:
+    return dict(conn.execute("SELECT name, value FROM score_state;").fetchall())
+
+
+def _resume_query(text: str, vocabulary: Dict[str, int], np) -> "np.ndarray":
+    """Resume term weights over the vocabulary: 1 + log(tf), for terms some job contains."""
+    weights = np.zeros(len(vocabulary), dtype=np.float64)
+    for term, tf in term_counts(text).items():
+        column = vocabulary.get(term)
+        if column is not None:
+            weights[column] = 1.0 + math.log(tf)
+    return weights
+
+
+def _bm25_weights(counts, doc_lengths, avg_length: float, np):
+    """BM25 term-frequency saturation of a CSR count matrix, as a new matrix."""
+    weights = counts.astype(np.float64, copy=True)
+    row_lengths = np.repeat(doc_lengths, np.diff(weights.indptr))
+    tf = weights.data
+    weights.data = tf * (K1 + 1) / (tf + K1 * (1 - B + B * row_lengths / max(avg_length, 1e-9)))
+    return weights
+
+
+def _top_terms(contributions, terms: List[str], np) -> List[str]:
+    """JSON list of the highest-contributing terms of each row of a CSR matrix."""
+    top = []
+    for row in range(contributions.shape[0]):
+        start, end = contributions.indptr[row], contributions.indptr[row + 1]
+        data, columns = contributions.data[start:end], contributions.indices[start:end]
+        order = np.argsort(-data)[:TOP_TERMS]
+        top.append(json.dumps([terms[columns[i]] for i in order if data[i] > 0]))
+    return top
+
+
+def score_jobs(db: Database, resume_path: str, rescore: bool = False) -> Dict:
+    """
+    Score jobs not scored yet (or re-scraped since) against the resume at resume_path, and store
+    the scores. Tokenizing happens on a pooled reader; the scores, document frequencies and
+    corpus totals are written in one transaction at the end.
+    """
+    np, sparse = _import_numeric()
+    from auto_job_application.resume_cache import load_resume  # Parses the PDF only when not cached
+    resume = load_resume(resume_path)
+
+    with db.writer() as conn, conn:
+        conn.executescript(SCORES_SCHEMA_SQL)
+        conn.execute("DELETE FROM job_scores WHERE job_id NOT IN (SELECT job_id FROM jobs);")  # Purged runs
+    with db.reader() as conn:
+        state = _load_state(conn)
+        total_jobs = conn.execute("SELECT COUNT(*) FROM jobs;").fetchone()[0]
+        full = (rescore or state.get("resume_sha256") != resume.sha256
+                or total_jobs > int(state.get("full_pass_docs", 0)) * (1 + RESCORE_GROWTH))
+        if full:
+            vocabulary, df, n_docs, total_length = {}, [], 0, 0
+        else:
+            rows = conn.execute("SELECT term, df FROM score_terms;").fetchall()
+            vocabulary = {term: column for column, (term, _) in enumerate(rows)}
+            df = [count for _, count in rows]
+            n_docs, total_length = int(state.get("docs", 0)), int(state.get("total_length", 0))
+        known_terms = len(vocabulary)
+
+        # Tokenize pending jobs into CSR pieces over a growing vocabulary
+        job_ids: List[str] = []
+        indptr, indices, data, doc_lengths = [0], [], [], []
+        df_added: Counter = Counter()  # Documents per term among jobs counted for the first time
+        cursor = conn.execute(ALL_SQL if full else PENDING_SQL)
+        while True:
+            rows = cursor.fetchmany(FETCH_SIZE)
+            if not rows:
+                break
+            for job_id, title, description, scored in rows:
+                counts = term_counts(description)
+                for term, tf in term_counts(title).items():
+                    counts[term] += tf * TITLE_WEIGHT
+                for term in counts.keys() - vocabulary.keys():
+                    vocabulary[term] = len(vocabulary)
+                indices.extend(map(vocabulary.__getitem__, counts))
+                data.extend(counts.values())
+                length = sum(counts.values())
+                if not scored:  # A re-scraped job was counted when first scored
+                    df_added.update(counts.keys())
+                    n_docs += 1
+                    total_length += length
+                job_ids.append(job_id)
+                doc_lengths.append(length)
+                indptr.append(len(indices))
+
+    df.extend([0] * (len(vocabulary) - len(df)))
+    for term, count in df_added.items():
+        df[vocabulary[term]] += count
+    scored_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    terms = list(vocabulary)  # Columns were assigned in insertion order
+    if job_ids:
+        counts = sparse.csr_matrix((np.asarray(data, dtype=np.float64), np.asarray(indices, dtype=np.int32),
+                                    np.asarray(indptr, dtype=np.int64)), shape=(len(job_ids), len(vocabulary)))
+        df_array = np.asarray(df, dtype=np.float64)
+        idf = np.log(1.0 + (n_docs - df_array + 0.5) / (df_array + 0.5))
+        # Section bodies only, so headings like "Experience" and "Skills" do not count as resume terms
+        query = _resume_query("\n".join(resume.sections.values()) or resume.text, vocabulary, np) * idf
+        weights = _bm25_weights(counts, np.asarray(doc_lengths, dtype=np.float64), total_length / max(n_docs, 1), np)
+        scores = weights @ query  # Every pending job in one sparse matrix-vector product
+        top = _top_terms(weights.multiply(query).tocsr(), terms, np)
+        score_rows = [(job_id, round(float(score), 4), top_terms, scored_at)
+                      for job_id, score, top_terms in zip(job_ids, scores, top)]
+    else:
+        score_rows = []
+
+    new_state = {"docs": n_docs, "total_length": total_length, "resume_sha256": resume.sha256}
+    if full:
+        new_state["full_pass_docs"] = n_docs
+    with db.writer() as conn, conn:
+        if full:
+            conn.execute("DELETE FROM score_terms;")
+        # Only changed frequencies are written: the terms of newly counted jobs
+        changed = range(len(df)) if full else sorted(vocabulary[term] for term in df_added)
+        conn.executemany("""
+            INSERT INTO score_terms (term, df) VALUES (?, ?) ON CONFLICT(term) DO UPDATE SET df = excluded.df;
+        """, ((terms[column], df[column]) for column in changed if df[column]))
+        conn.executemany("""
+            INSERT INTO job_scores (job_id, score, terms, scored_at) VALUES (?, ?, ?, ?)
+            ON CONFLICT(job_id) DO UPDATE SET score = excluded.score, terms = excluded.terms, scored_at = excluded.scored_at;
+        """, score_rows)
+        conn.executemany("INSERT OR REPLACE INTO score_state (name, value) VALUES (?, ?);",
+                         ((name, str(value)) for name, value in new_state.items()))
+    logger.info(f"Scored {len(score_rows)} jobs{' (full pass)' if full else ''} against {resume.path}; "
+                f"{len(vocabulary) - known_terms} new terms, {len(vocabulary)} in all.")
+    return {"scored": len(score_rows), "full": full, "terms": len(vocabulary), "docs": n_docs}
+
+
+def application_queue(db: Database, limit: int = 20, min_score: float = 0.0, company: Optional[str] = None,
+                      since: Optional[str] = None) -> List[tuple]:
+    """Best-scoring jobs not applied to yet: (job_id, url, job_title, company_name, location, score, terms)."""
+    filters, params = [], []
+    if company:
+        filters.append("AND j.company_name LIKE ?")
+        params.append(f"%{company}%")
+    if since:
+        filters.append("AND j.last_scraped >= ?")
+        params.append(since)
+    with db.writer() as conn, conn:
+        conn.executescript(SCORES_SCHEMA_SQL)
+    with db.reader() as conn:
+        return conn.execute(QUEUE_SQL.format(filters=" ".join(filters)), (min_score, *params, limit)).fetchall()
+
+
+def record_applications(db: Database, outcomes: Iterable[Tuple[str, str]]):
+    """Mark queued jobs with the agent's outcome, by job URL, so the queue moves past them."""
+    applied_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    with db.writer() as conn, conn:
+        conn.executescript(SCORES_SCHEMA_SQL)
+        conn.executemany("""
+            UPDATE job_scores SET status = ?, applied_at = ?
+            WHERE job_id IN (SELECT job_id FROM jobs WHERE url = ?);
+        """, ((status, applied_at, url) for url, status in outcomes))